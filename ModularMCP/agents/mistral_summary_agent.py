@@ -5,31 +5,35 @@
 from fastapi import FastAPI, Request
  # Removed MCPMessage, MCPResponse import; using plain JSON
 import os
-import json
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
-
+from mcp.core.model_registry import model_registry, load_causal_lm
+from mcp.core.inference_executor import inference_executor
+from mcp.core.prefix_cache import generate_with_prefix
+from mcp.core.json_stream import IncrementalJSONScanner, JSONObjectStoppingCriteria
+from mcp.core.constrained_decoding import JSONSchemaLogitsProcessor, SUMMARY_SCHEMA
+from mcp.core.chunking import TranscriptChunker
 
+app = FastAPI()
 
 # Load Mistral model path from config or environment variable
 MODEL_PATH = os.environ.get("MISTRAL_MODEL_PATH") or os.path.join(os.path.dirname(__file__), '..', 'models', 'mistral')
-if not os.path.exists(MODEL_PATH):
-    print(f"[MistralSummaryAgent] Mistral model path not found: {MODEL_PATH}")
-    tokenizer = None
-    model = None
-else:
+
+
+def get_model():
+    """Shared Mistral (tokenizer, model) from the process-wide registry, loaded on first use."""
+    if not os.path.exists(MODEL_PATH):
+        print(f"[MistralSummaryAgent] Mistral model path not found: {MODEL_PATH}")
+        return None, None
     try:
-        tokenizer = AutoTokenizer.from_pretrained(MODEL_PATH)
-        model = AutoModelForSeq2SeqLM.from_pretrained(MODEL_PATH)
+        return model_registry.get(MODEL_PATH, lambda: load_causal_lm(MODEL_PATH, quantization="4bit"), quantization="4bit")
     except Exception as e:
         print(f"[MistralSummaryAgent] Failed to load model: {e}")
-        tokenizer = None
-        model = None
+        return None, None
 
 PROMPT_TEMPLATE = (
     "You are an AI specialized in analyzing meeting transcripts.\n"
     "Your task is to produce:\n"
     "1. A clear and concise SUMMARY of the meeting as a numbered or bulleted list (do not use 'point 1', 'point 2', use real content).\n"
-    "2. A list of ACTION ITEMS with owners and deadlines if mentioned.\n"
+    "2. A list of ACTION ITEMS ready to file as Jira issues: a short task title, a description, and the owner and deadline if mentioned.\n"
     "3. A list of DECISIONS made during the meeting.\n"
     "4. A list of RISKS, blockers, or concerns raised.\n"
     "5. A list of FOLLOW-UP QUESTIONS that attendees should clarify.\n"
@@ -47,7 +51,9 @@ PROMPT_TEMPLATE = (
     "```json\n"
     "{\n"
     "  \"summary\": [\"<summary bullet 1>\", \"<summary bullet 2>\"],\n"
-    "  \"action_items\": [ {\"task\": \"<task>\", \"owner\": \"<owner>\", \"deadline\": \"<deadline>\"} ]\n"
+    "  \"decisions\": [ {\"decision\": \"<decision>\", \"reason\": \"<reason>\", \"made_by\": \"<name>\"} ],\n"
+    "  \"action_items\": [ {\"task\": \"<task>\", \"description\": \"<what has to be done>\", \"owner\": \"<owner>\", \"deadline\": \"<deadline>\"} ],\n"
+    "  \"risks\": [ {\"risk\": \"<risk>\", \"impact\": \"<impact>\", \"raised_by\": \"<name>\"} ]\n"
     "}\n"
     "```\n"
     "\n"
@@ -55,33 +61,11 @@ PROMPT_TEMPLATE = (
     "{chunk}\n"
 )
 
-def chunk_text(text, max_words=900):
-    words = text.split()
-    chunks = []
-    for i in range(0, len(words), max_words):
-        chunk = ' '.join(words[i:i+max_words])
-        chunks.append(chunk)
-    return chunks
-
-def extract_last_json(text):
-    starts = []
-    ends = []
-    brace_count = 0
-    start = None
-    for i, c in enumerate(text):
-        if c == '{':
-            if brace_count == 0:
-                start = i
-            brace_count += 1
-        elif c == '}':
-            brace_count -= 1
-            if brace_count == 0 and start is not None:
-                starts.append(start)
-                ends.append(i+1)
-                start = None
-    if starts and ends:
-        return text[starts[-1]:ends[-1]]
-    return None
+def chunk_text(tokenizer, text, max_input_tokens=4096):
+    """Turn/sentence-aligned chunks that fill the input window left after the instruction prefix."""
+    prefix = PROMPT_TEMPLATE[:PROMPT_TEMPLATE.index("{chunk}")]
+    budget = max_input_tokens - len(tokenizer(prefix)["input_ids"]) - 2
+    return list(TranscriptChunker(tokenizer, max_tokens=budget).chunks(text))
 
 def is_valid_summary_item(item):
     if not item or not isinstance(item, str):
@@ -111,37 +95,39 @@ def is_valid_action_item(item):
     return False
 
 def summarize_chunk(chunk):
+    from transformers import LogitsProcessorList, StoppingCriteriaList
+    tokenizer, model = get_model()
     if not tokenizer or not model:
         return [], []
-    prompt = PROMPT_TEMPLATE.format(chunk=chunk)
-    device = next(model.parameters()).device
-    encoded = tokenizer.encode_plus(
-        prompt,
-        truncation=True,
-        max_length=4096,
-        return_tensors="pt"
-    )
-    input_ids = encoded["input_ids"].to(device)
-    attention_mask = encoded["attention_mask"].to(device)
-    summary_ids = model.generate(
-        input_ids,
-        attention_mask=attention_mask,
+    # str.format would trip over the JSON braces in the template, so substitute the placeholder directly
+    prompt = PROMPT_TEMPLATE.replace("{chunk}", chunk)
+    # Everything before the transcript is identical across chunks and requests; its KV cache is reused
+    prefix = PROMPT_TEMPLATE[:PROMPT_TEMPLATE.index("{chunk}")]
+    controls = {}
+    if os.environ.get("MISTRAL_DECODING", "schema") == "schema":
+        # Only tokens that keep the output a valid SUMMARY_SCHEMA document can be generated
+        controls['logits_processor'] = LogitsProcessorList([JSONSchemaLogitsProcessor(tokenizer, SUMMARY_SCHEMA, max_new_tokens=512)])
+    summary_ids = generate_with_prefix(
+        tokenizer,
+        model,
+        prefix,
+        [prompt],
+        strip_prompt=True,
+        stopping_criteria=StoppingCriteriaList([JSONObjectStoppingCriteria(tokenizer)]),
         max_new_tokens=512,
         do_sample=False,
         num_beams=4,
         early_stopping=True,
-        pad_token_id=tokenizer.eos_token_id
+        pad_token_id=tokenizer.eos_token_id,
+        **controls
     )
-    mistral_output = tokenizer.decode(summary_ids[0], skip_special_tokens=True)
-    json_str = extract_last_json(mistral_output)
-    if json_str:
-        try:
-            parsed = json.loads(json_str)
-            summary_text = parsed.get('summary', [])
-            action_items = parsed.get('action_items', [])
-        except Exception:
-            summary_text = []
-            action_items = []
+    # Only the generated tokens are decoded, so the first JSON object is the model's answer
+    scanner = IncrementalJSONScanner()
+    scanner.feed(tokenizer.decode(summary_ids[0], skip_special_tokens=True))
+    parsed = scanner.parsed()
+    if isinstance(parsed, dict):
+        summary_text = parsed.get('summary', [])
+        action_items = parsed.get('action_items', [])
     else:
         summary_text = []
         action_items = []
@@ -153,13 +139,15 @@ def summarize_chunk(chunk):
 async def summarize(request: Request):
     data = await request.json()
     transcript = data.get('transcript', '')
+    tokenizer, model = await inference_executor.run(get_model)
     if not tokenizer or not model:
         return {"status": "error", "error": "Mistral model not loaded."}
-    chunks = chunk_text(transcript, max_words=900)
+    chunks = chunk_text(tokenizer, transcript)
     all_summaries = []
     all_action_items = []
     for chunk in chunks:
-        summaries, action_items = summarize_chunk(chunk)
+        # One job per chunk so concurrent requests interleave in the FIFO queue
+        summaries, action_items = await inference_executor.run(summarize_chunk, chunk)
         all_summaries.extend(summaries)
         all_action_items.extend(action_items)
     return {
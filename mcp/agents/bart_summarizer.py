@@ -1,26 +1,137 @@
-def summarize_with_bart(tokenizer, model, transcript, meeting_id):
+import os
+import time
+from mcp.core.chunking import TranscriptChunker
+from mcp.core.metrics import rouge_l_f1
+from mcp.core.deadline import DeadlineStoppingCriteria
+from mcp.core.sentence_tagger import meeting_tagger
+
+# BART's encoder only sees 1024 positions; anything beyond that used to be truncated away.
+BART_MAX_INPUT_TOKENS = 1024
+
+
+def _token_windows(tokenizer, transcript, max_input_tokens=BART_MAX_INPUT_TOKENS):
+    """Split the transcript on turn/sentence boundaries into windows that each fit the encoder."""
+    budget = max_input_tokens - tokenizer.num_special_tokens_to_add()
+    return list(TranscriptChunker(tokenizer, max_tokens=budget).chunks(transcript))
+
+
+def _deadline_controls(deadline):
+    if deadline is None:
+        return {}
+    from transformers import StoppingCriteriaList
+    return {'stopping_criteria': StoppingCriteriaList([DeadlineStoppingCriteria(deadline)])}
+
+
+def _generate_batch(tokenizer, model, windows, deadline=None):
+    """Encode all windows as one padded batch and summarize them in a single generate call."""
+    batch = tokenizer(windows, padding=True, truncation=True, max_length=BART_MAX_INPUT_TOKENS, return_tensors="pt")
+    # ONNX Runtime models expose .device but no parameters()
+    device = model.device
+    summary_ids = model.generate(
+        batch["input_ids"].to(device),
+        attention_mask=batch["attention_mask"].to(device),
+        max_length=130,
+        min_length=30,
+        do_sample=False,
+        num_beams=4,
+        early_stopping=True,
+        **_deadline_controls(deadline)
+    )
+    return [s.strip() for s in tokenizer.batch_decode(summary_ids, skip_special_tokens=True)]
+
+
+def map_reduce_summarize(tokenizer, model, transcript, max_input_tokens=BART_MAX_INPUT_TOKENS, deadline=None, chunks=None):
+    """
+    Summarize a transcript of any length without dropping tokens.
+    Map: every token window is summarized in one batched generate call.
+    Reduce: the partial summaries are joined and summarized again (recursively if still too long).
+    deadline: generation stops when it passes; the joined partial summaries are returned unreduced.
+    chunks: pre-split transcript chunks used as the map windows (any over the window are split further).
+    """
+    if chunks:
+        windows = [w for chunk in chunks for w in _token_windows(tokenizer, chunk, max_input_tokens)]
+    else:
+        windows = _token_windows(tokenizer, transcript, max_input_tokens)
+    if len(windows) <= 1:
+        return _generate_batch(tokenizer, model, windows or [""], deadline)[0]
+    print(f"[BART] Map-reduce over {len(windows)} token window(s).")
+    partials = _generate_batch(tokenizer, model, windows, deadline)
+    combined = " ".join(p for p in partials if p)
+    if deadline is not None and deadline.expired:
+        print("[BART] Deadline passed; returning map stage summaries without reduce.")
+        return combined
+    return map_reduce_summarize(tokenizer, model, combined, max_input_tokens, deadline)
+
+
+def summarize_with_bart(tokenizer, model, transcript, meeting_id, strategy=None, deadline=None, chunks=None):
+    """
+    strategy: 'map_reduce' (default, covers the whole transcript) or 'truncate'
+    (legacy behaviour, only the first 1024 tokens). Defaults to BART_SUMMARY_STRATEGY env var.
+    deadline: a mcp.core.deadline.Deadline; a summary cut short by it is marked 'degraded'.
+    chunks: the transcript already split by the caller (map_reduce only).
+    """
+    strategy = strategy or os.environ.get("BART_SUMMARY_STRATEGY", "map_reduce")
     if not transcript or len(transcript.split()) < 10:
         bart_summary = "Transcript too short for summarization."
     else:
         try:
-            input_ids = tokenizer.encode(transcript, truncation=True, max_length=1024, return_tensors="pt")
-            summary_ids = model.generate(
-                input_ids,
-                max_length=130,
-                min_length=30,
-                do_sample=False,
-                num_beams=4,
-                early_stopping=True
-            )
-            bart_summary = tokenizer.decode(summary_ids[0], skip_special_tokens=True)
+            if strategy == "map_reduce":
+                bart_summary = map_reduce_summarize(tokenizer, model, transcript, deadline=deadline, chunks=chunks)
+            else:
+                input_ids = tokenizer.encode(transcript, truncation=True, max_length=BART_MAX_INPUT_TOKENS, return_tensors="pt")
+                summary_ids = model.generate(
+                    input_ids,
+                    max_length=130,
+                    min_length=30,
+                    do_sample=False,
+                    num_beams=4,
+                    early_stopping=True,
+                    **_deadline_controls(deadline)
+                )
+                bart_summary = tokenizer.decode(summary_ids[0], skip_special_tokens=True)
         except Exception as e:
             bart_summary = f"[BART summarization error: {e}]"
     # Improved rule-based extraction for action items
-    lines = [l.strip() for l in transcript.replace('\n', '. ').split('.') if l.strip()]
-    action_keywords = ['fix', 'complete', 'implement', 'create', 'update', 'assign', 'test', 'review', 'prepare', 'set up', 'ensure']
-    action_items = [l for l in lines if any(k in l.lower() for k in action_keywords)]
-    return {
+    action_items = meeting_tagger.select(transcript, 'action')
+    result = {
         'meeting_id': meeting_id,
         'summary_text': bart_summary,
         'action_items': action_items
     }
+    if deadline is not None and deadline.expired:
+        result['degraded'] = True
+    return result
+
+
+def parity_check(tokenizer, reference_model, candidate_model, transcripts, min_rouge_l=0.9):
+    """
+    Compare an alternate BART backend (int8 / ONNX) with the PyTorch reference on sample transcripts.
+    Returns per-transcript ROUGE-L between the two summaries and the latency of each backend.
+    """
+    rows = []
+    for i, transcript in enumerate(transcripts):
+        start = time.perf_counter()
+        reference = map_reduce_summarize(tokenizer, reference_model, transcript)
+        reference_s = time.perf_counter() - start
+        start = time.perf_counter()
+        candidate = map_reduce_summarize(tokenizer, candidate_model, transcript)
+        candidate_s = time.perf_counter() - start
+        rows.append({
+            'index': i,
+            'rouge_l': rouge_l_f1(reference, candidate),
+            'exact_match': reference == candidate,
+            'reference_seconds': reference_s,
+            'candidate_seconds': candidate_s
+        })
+        print(f"[BART][Parity] #{i}: rougeL={rows[-1]['rouge_l']:.3f} torch={reference_s:.2f}s candidate={candidate_s:.2f}s")
+    mean_rouge = sum(r['rouge_l'] for r in rows) / len(rows) if rows else 1.0
+    reference_total = sum(r['reference_seconds'] for r in rows)
+    candidate_total = sum(r['candidate_seconds'] for r in rows)
+    return {
+        'transcripts': len(rows),
+        'mean_rouge_l': mean_rouge,
+        'exact_match_rate': sum(r['exact_match'] for r in rows) / len(rows) if rows else 1.0,
+        'speedup': reference_total / candidate_total if candidate_total else None,
+        'passed': mean_rouge >= min_rouge_l,
+        'rows': rows
+    }
@@ -0,0 +1,22 @@
+"""
+Extractive Filter Agent
+- Optional stage between preprocessing and summarization.
+- Keeps the most central sentences (TF-IDF / TextRank) up to a token budget, in order and with
+  speaker labels, so abstractive models receive fewer input tokens.
+"""
+import os
+from mcp.core.extractive import extractive_filter
+
+
+class ExtractiveFilterAgent:
+    def process(self, processed_transcripts, token_budget=None, tokenizer=None):
+        """
+        token_budget: tokens to keep (default EXTRACTIVE_TOKEN_BUDGET env, 1500)
+        Returns {'processed_transcripts': [...], 'report': {..., 'compression_ratio'}}
+        """
+        token_budget = token_budget or int(os.environ.get("EXTRACTIVE_TOKEN_BUDGET", "1500"))
+        filtered, report = extractive_filter("\n".join(processed_transcripts), token_budget, tokenizer)
+        print(f"[ExtractiveFilter] {report['input_tokens']} -> {report['output_tokens']} tokens "
+              f"(compression ratio {report['compression_ratio']:.2f}, "
+              f"{report['sentences_kept']}/{report['sentences_total']} sentences)")
+        return {'processed_transcripts': [filtered] if filtered else [], 'report': report}
@@ -2,8 +2,8 @@ from mcp.protocols.a2a import a2a_endpoint
 from mcp.agents.task_manager_agent import TaskManagerAgent
 
 class JiraAgent:
-    def __init__(self):
-        self.task_manager = TaskManagerAgent()
+    def __init__(self, jira_provider=None):
+        self.task_manager = TaskManagerAgent(jira_provider=jira_provider)
 
     @a2a_endpoint
     def create_jira(self, summary, user=None, date=None):
@@ -1,40 +1,10 @@
 
 
 from mcp.core.utils import gen_id
+from mcp.core.jira_client import jira_clients
+from mcp.core.jira_bulk import create_issues_bulk
 import os, json
-from mcp.tools.llm_task_extraction import extract_tasks_jira_format
-import re
-from datetime import datetime
-
-
-# Try to load credentials from Google Drive path first, then local folder
-import pathlib
-drive_cred_path = pathlib.Path('/content/drive/MyDrive/credentials.json')
-local_cred_path = pathlib.Path('mcp/config/credentials.json')
-
-if drive_cred_path.exists():
-    print(f"[INFO] Loading credentials from Google Drive: {drive_cred_path}")
-    with open(drive_cred_path, 'r') as f:
-        creds = json.load(f)
-elif local_cred_path.exists():
-    print(f"[INFO] Loading credentials from local folder: {local_cred_path}")
-    with open(local_cred_path, 'r') as f:
-        creds = json.load(f)
-else:
-    print("[ERROR] No credentials.json found in Google Drive or local folder.")
-    raise FileNotFoundError("No credentials.json found in Google Drive or local folder.")
-jira = creds.get("jira", {})
-print(f"[DEBUG] Loaded Jira credentials: {jira}")
-
-os.environ["JIRA_URL"] = jira.get("base_url", "")
-os.environ["JIRA_USER"] = jira.get("user", "")
-os.environ["JIRA_TOKEN"] = jira.get("token", "")
-os.environ["JIRA_PROJECT"] = jira.get("project", "PROJ")
-try:
-    from jira import JIRA
-except ImportError:
-    JIRA = None
-
+from mcp.tools.llm_task_extraction import extract_tasks_jira_format, jira_fields
 import re
 from datetime import datetime
 
@@ -65,12 +35,15 @@ class LLMTaskManagerAgent:
         """
         from mcp.tools.notification import send_notification
         from mcp.tools.jira_monitor import notify_due_tasks, notify_sprints_ending_soon
+        from mcp.agents.task_manager_agent import TaskManagerAgent
         created = []
         errors = []
         MAX_SUMMARY_LEN = 255
         # Load existing tasks file
         with open(self.tasks_file, 'r', encoding='utf-8') as f:
             existing = json.load(f)
+        pending = []
+        jira = self.jira
         for t in tasks:
             title = t.get('title') or t.get('Summary') or t.get('task') or str(t)
             owner = t.get('owner') or t.get('assignee') or t.get('Assignee')
@@ -89,7 +62,7 @@ class LLMTaskManagerAgent:
             }
             existing.append(task_obj)
             # --- JIRA Integration ---
-            if self.jira:
+            if jira:
                 issue_dict = {
                     'project': {'key': self.jira_project},
                     'summary': jira_title,
@@ -100,51 +73,57 @@ class LLMTaskManagerAgent:
                     issue_dict['assignee'] = {'name': owner}
                 if due:
                     issue_dict['duedate'] = due
-                try:
-                    issue = self.jira.create_issue(fields=issue_dict)
-                    task_obj['jira_issue'] = issue.key
-                    created.append(issue.key)
-                    # Notify if due date is within 2 days
-                    from datetime import datetime, timedelta
-                    if due:
-                        try:
-                            due_dt = datetime.strptime(due[:10], '%Y-%m-%d')
-                            if due_dt - datetime.utcnow() <= timedelta(days=2):
-                                send_notification(f"Jira Task '{jira_title}' is due soon: {due}")
-                        except Exception as e:
-                            errors.append(f"Error parsing due date for notification: {e}")
-                except Exception as e:
-                    task_obj['jira_error'] = str(e)
-                    errors.append(str(e))
+                pending.append((task_obj, issue_dict, jira_title, due))
             else:
                 task_obj['jira_error'] = "Jira connection not configured."
                 errors.append("Jira connection not configured.")
+        # All selected issues in one bulk request (chunked at Jira's limit); errors map back per task
+        results = create_issues_bulk(jira, [issue_dict for _, issue_dict, _, _ in pending]) if pending else []
+        for (task_obj, _, jira_title, due), result in zip(pending, results):
+            if result['error']:
+                task_obj['jira_error'] = result['error']
+                errors.append(f"{jira_title}: {result['error']}")
+                continue
+            task_obj['jira_issue'] = result['key']
+            created.append(result['key'])
+            # Notify if due date is within 2 days
+            from datetime import datetime, timedelta
+            if due:
+                try:
+                    due_dt = datetime.strptime(due[:10], '%Y-%m-%d')
+                    if due_dt - datetime.utcnow() <= timedelta(days=2):
+                        send_notification(f"Jira Task '{jira_title}' is due soon: {due}")
+                except Exception as e:
+                    errors.append(f"Error parsing due date for notification: {e}")
         # Save updated tasks file
         with open(self.tasks_file, 'w', encoding='utf-8') as f:
             json.dump(existing, f, indent=2)
         # After creating tasks, trigger due/sprint notifications
         try:
-            notify_due_tasks(days=2)
-            notify_sprints_ending_soon(days=2)
+            # One agent on this agent's Jira client for both checks
+            monitor = TaskManagerAgent(jira_provider=self.jira_provider)
+            notify_due_tasks(days=2, agent=monitor)
+            notify_sprints_ending_soon(days=2, agent=monitor)
         except Exception as e:
             errors.append(f"Notification error: {e}")
         return {'created': created, 'errors': errors}
         return {'created': created, 'errors': errors}
 
-    def __init__(self):
+    def __init__(self, jira_provider=None):
         self.tasks_file = os.path.join(os.path.dirname(__file__), '..', 'data', 'tasks', 'llm_tasks.json')
         os.makedirs(os.path.dirname(self.tasks_file), exist_ok=True)
         if not os.path.exists(self.tasks_file):
             with open(self.tasks_file, 'w', encoding='utf-8') as f:
                 json.dump([], f)
-        self.jira_url = os.environ.get("JIRA_URL")
-        self.jira_user = os.environ.get("JIRA_USER")
-        self.jira_token = os.environ.get("JIRA_TOKEN")
-        self.jira_project = os.environ.get("JIRA_PROJECT")
-        self.jira = None
+        # Credentials are loaded on first construction, not at import; the connection is the
+        # process-wide pooled client, opened on first use and shared by every agent
+        self.jira_provider = jira_provider or jira_clients
+        settings = self.jira_provider.settings()
+        self.jira_url = settings['url']
+        self.jira_user = settings['user']
+        self.jira_token = settings['token']
+        self.jira_project = settings['project']
         print(f"LLMTaskManagerAgent: JIRA_URL={self.jira_url}, JIRA_USER={self.jira_user}, JIRA_PROJECT={self.jira_project}")
-        if not JIRA:
-            print("[ERROR][LLMTaskManagerAgent] Jira package not imported (JIRA is None)")
         if not self.jira_url:
             print("[ERROR][LLMTaskManagerAgent] JIRA_URL is missing or empty")
         if not self.jira_user:
@@ -153,30 +132,28 @@ class LLMTaskManagerAgent:
             print("[ERROR][LLMTaskManagerAgent] JIRA_TOKEN is missing or empty")
         if not self.jira_project:
             print("[ERROR][LLMTaskManagerAgent] JIRA_PROJECT is missing or empty")
-        if JIRA and self.jira_url and self.jira_user and self.jira_token:
-            print("LLMTaskManagerAgent: Initializing JIRA connection")
-            try:
-                self.jira = JIRA(server=self.jira_url, basic_auth=(self.jira_user, self.jira_token))
-                print("LLMTaskManagerAgent:  ", self.jira)
-            except Exception as e:
-                print(f"[ERROR][LLMTaskManagerAgent] Failed to initialize JIRA connection: {e}")
-                self.jira = None
+
+    @property
+    def jira(self):
+        return self.jira_provider.get()
 
 
     def extract_tasks_from_transcript_llm(self, meeting_id: str, transcript: str):
         """
         Extract tasks from transcript using LLM (Jira format) and create tasks/Jira issues.
         """
-        jira_text = extract_tasks_jira_format(transcript)
+        jira_text = extract_tasks_jira_format(transcript, meeting_id=meeting_id)
         tasks = self._parse_jira_formatted_tasks(jira_text, meeting_id)
         with open(self.tasks_file, 'r', encoding='utf-8') as f:
             existing = json.load(f)
+        pending = []
+        jira = self.jira
         for t in tasks:
             # Clean due date before sending to Jira
             if 'due' in t:
                 t['due'] = clean_due_date(t['due'])
             existing.append(t)
-            if self.jira:
+            if jira:
                 issue_dict = {
                     'project': {'key': self.jira_project},
                     'summary': t['title'][:255],
@@ -187,22 +164,37 @@ class LLMTaskManagerAgent:
                     issue_dict['assignee'] = {'name': t['owner']}
                 if t.get('due'):
                     issue_dict['duedate'] = t['due']
-                try:
-                    print(f"[DEBUG][LLMTaskManagerAgent] Creating Jira issue with fields: {issue_dict}")
-                    issue = self.jira.create_issue(fields=issue_dict)
-                    print(f"[DEBUG][LLMTaskManagerAgent] Created Jira issue: {issue.key}")
-                    t['jira_issue'] = issue.key
-                except Exception as e:
-                    print(f"[ERROR][LLMTaskManagerAgent] Jira issue creation failed: {e}")
-                    t['jira_error'] = str(e)
+                print(f"[DEBUG][LLMTaskManagerAgent] Creating Jira issue with fields: {issue_dict}")
+                pending.append((t, issue_dict))
             else:
                 print("[ERROR][LLMTaskManagerAgent] JIRA not configured")
+        results = create_issues_bulk(jira, [issue_dict for _, issue_dict in pending]) if pending else []
+        for (t, _), result in zip(pending, results):
+            if result['error']:
+                print(f"[ERROR][LLMTaskManagerAgent] Jira issue creation failed: {result['error']}")
+                t['jira_error'] = result['error']
+            else:
+                print(f"[DEBUG][LLMTaskManagerAgent] Created Jira issue: {result['key']}")
+                t['jira_issue'] = result['key']
         with open(self.tasks_file, 'w', encoding='utf-8') as f:
             json.dump(existing, f, indent=2)
         return tasks
 
     def _parse_jira_formatted_tasks(self, jira_text, meeting_id):
         print(f"[DEBUG][_parse_jira_formatted_tasks] Raw jira_text input:\n{jira_text}")
+        if isinstance(jira_text, list):
+            # Jira field dicts from the joint summary pass (or plain sentences from its fallback)
+            tasks = []
+            for item in jira_text:
+                fields = jira_fields(item)
+                tasks.append({
+                    'meeting_id': meeting_id,
+                    'title': fields['Summary'],
+                    'description': fields['Description'],
+                    'owner': fields['Assignee'],
+                    'due': fields['Due Date']
+                })
+            return tasks
         tasks = []
         lines = [l.strip() for l in jira_text.splitlines() if l.strip()]
         print(f"[DEBUG][_parse_jira_formatted_tasks] Split lines: {lines}")
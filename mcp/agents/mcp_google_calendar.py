@@ -9,14 +9,15 @@ MCP Google Calendar Integration Tool
 
 import datetime
 import os
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
 
 SCOPES = ['https://www.googleapis.com/auth/calendar.readonly']
 SERVICE_ACCOUNT_FILE = os.path.abspath(os.path.join(os.path.dirname(__file__), '../config/credentials.json'))
 
 class MCPGoogleCalendar:
     def __init__(self, calendar_id='primary'):
+        # Google client libraries are imported only when a calendar is actually used
+        from google.oauth2 import service_account
+        from googleapiclient.discovery import build
         self.calendar_id = calendar_id
         self.creds = service_account.Credentials.from_service_account_file(
             SERVICE_ACCOUNT_FILE, scopes=SCOPES)
@@ -1,5 +1,5 @@
 from mcp.agents.mcp_google_calendar import MCPGoogleCalendar
-import re
+from mcp.core.sentence_tagger import meeting_tagger
 import datetime
 
 class MeetingFollowupAgent:
@@ -8,20 +8,8 @@ class MeetingFollowupAgent:
         self.calendar = MCPGoogleCalendar(calendar_id=calendar_id)
 
     def detect_followup_intent(self, transcript: str) -> bool:
-        # Simple heuristic: look for common follow-up meeting phrases
-        followup_patterns = [
-            r"follow[- ]?up meeting",
-            r"schedule (another|a) meeting",
-            r"need to (meet|discuss) again",
-            r"set up (a|another) meeting",
-            r"next meeting",
-            r"reconvene",
-            r"continue discussion"
-        ]
-        for pat in followup_patterns:
-            if re.search(pat, transcript, re.IGNORECASE):
-                return True
-        return False
+        # Simple heuristic: look for common follow-up meeting phrases (FOLLOWUP_PATTERNS)
+        return meeting_tagger.matches(transcript, 'followup')
 
     def extract_meeting_details(self, transcript: str) -> dict:
         # Very basic extraction: look for date/time phrases (could be improved with NLP)
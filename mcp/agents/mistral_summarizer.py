@@ -1,173 +1,434 @@
+import os
 import re
-import json
-import torch
+import threading
+from mcp.core.inference_executor import inference_executor
+from mcp.core.prefix_cache import generate_with_prefix
+from mcp.core.json_stream import IncrementalJSONScanner, JSONObjectStoppingCriteria
+from mcp.core.constrained_decoding import JSONSchemaLogitsProcessor, SUMMARY_SCHEMA
+from mcp.core.chunking import TranscriptChunker
+from mcp.core.dedup import dedupe_texts, dedupe_records
+from mcp.core.deadline import DeadlineStoppingCriteria, CancelledStoppingCriteria
 
-def summarize_with_mistral(mistral_tokenizer, mistral_model, transcript, meeting_id):
+# Prompts are truncated to this many tokens by generate_with_prefix
+MISTRAL_MAX_INPUT_TOKENS = 4096
+# Generation limits per chunk and for the reduce pass; schema decoding closes the JSON within them
+MAX_NEW_TOKENS = 512
+REDUCE_MAX_NEW_TOKENS = 384
+# Beam width of summarize_with_mistral; streaming decodes greedily (the streamer needs one beam),
+# so the two produce different summaries for the same chunk
+NUM_BEAMS = 4
+STREAM_NUM_BEAMS = 1
+
+# Instruction preamble shared by every chunk; the chunk text is appended after it.
+# One pass yields the summary and Jira-ready action items (see mcp/tools/llm_task_extraction.py).
+PROMPT_TEMPLATE = (
+    "You are an AI specialized in analyzing meeting transcripts.\n"
+    "Your task is to produce:\n"
+    "1. A clear and concise SUMMARY of the meeting as a numbered or bulleted list (do not use 'point 1', 'point 2', use real content).\n"
+    "2. A list of ACTION ITEMS ready to file as Jira issues: a short task title, a description, and the owner and deadline if mentioned.\n"
+    "3. A list of DECISIONS made during the meeting.\n"
+    "4. A list of RISKS, blockers, or concerns raised.\n"
+    "5. A list of FOLLOW-UP QUESTIONS that attendees should clarify.\n"
+    "\n"
+    "INSTRUCTIONS:\n"
+    "- Read the provided meeting transcript thoroughly.\n"
+    "- Do NOT invent information. Only extract what is explicitly or implicitly present.\n"
+    "- If some sections have no information, return an empty list.\n"
+    "- Keep summary short but complete (5–8 bullet points or numbers).\n"
+    "- Use simple, business-friendly language.\n"
+    "- DO NOT use placeholder text like 'point 1', 'point 2', '<summary bullet 1>', '<task>', etc.\n"
+    "- DO NOT copy the example below. Fill with real meeting content.\n"
+    "\n"
+    "RETURN THE OUTPUT IN THIS EXACT JSON FORMAT (as a code block):\n"
+    "```json\n"
+    "{\n"
+    "  \"summary\": [\"<summary bullet 1>\", \"<summary bullet 2>\"],\n"
+    "  \"decisions\": [ {\"decision\": \"<decision>\", \"reason\": \"<reason>\", \"made_by\": \"<name>\"} ],\n"
+    "  \"action_items\": [ {\"task\": \"<task>\", \"description\": \"<what has to be done>\", \"owner\": \"<owner>\", \"deadline\": \"<deadline>\"} ],\n"
+    "  \"risks\": [ {\"risk\": \"<risk>\", \"impact\": \"<impact>\", \"raised_by\": \"<name>\"} ]\n"
+    "}\n"
+    "```\n"
+    "\n"
+    "TRANSCRIPT:\n"
+)
+
+# Second-pass prompt for the optional reduce generation; the clustered bullets are appended after it.
+REDUCE_PROMPT_TEMPLATE = (
+    "You are an AI specialized in analyzing meeting transcripts.\n"
+    "The bullet points below were extracted from consecutive parts of ONE meeting and may overlap.\n"
+    "Merge them into 5–8 concise bullet points without repeating information.\n"
+    "Do NOT invent information.\n"
+    "\n"
+    "RETURN THE OUTPUT IN THIS EXACT JSON FORMAT:\n"
+    "{\"summary\": [\"<summary bullet 1>\", \"<summary bullet 2>\"]}\n"
+    "\n"
+    "BULLET POINTS:\n"
+)
+REDUCE_SCHEMA = {"type": "object", "properties": {"summary": SUMMARY_SCHEMA["properties"]["summary"]}}
+
+def chunk_budget(mistral_tokenizer):
+    """Transcript tokens per chunk: the input window minus the instruction prefix (MISTRAL_CHUNK_TOKENS caps it)."""
+    budget = MISTRAL_MAX_INPUT_TOKENS - len(mistral_tokenizer(PROMPT_TEMPLATE)["input_ids"]) - 2
+    cap = int(os.environ.get("MISTRAL_CHUNK_TOKENS", "0"))
+    return min(budget, cap) if cap > 0 else budget
+
+def chunk_transcript(mistral_tokenizer, transcript):
+    """Lazily yield turn/sentence-aligned transcript chunks that fill the Mistral input window."""
+    overlap = int(os.environ.get("MISTRAL_CHUNK_OVERLAP_TOKENS", "0"))
+    return TranscriptChunker(mistral_tokenizer, max_tokens=chunk_budget(mistral_tokenizer), overlap_tokens=overlap).chunks(transcript)
+
+# Clean up and filter out empty/placeholder/point items
+def is_valid_summary_item(item):
+    if not item or not isinstance(item, str):
+        return False
+    s = item.strip().lower()
+    if s in ("point 1", "point 2", "point1", "point2", "", "-", "<summary bullet 1>", "<summary bullet 2>"):
+        return False
+    if s.startswith("point ") or s.startswith("<summary"):
+        return False
+    if '<' in s and '>' in s:
+        return False
+    return True
+
+def is_valid_action_item(item):
+    if not item:
+        return False
+    if isinstance(item, dict):
+        # Remove if any value is a placeholder like <task> or empty
+        for v in item.values():
+            if isinstance(v, str) and (v.strip() == '' or v.strip().startswith('<')):
+                return False
+        return any(v for v in item.values())
+    if isinstance(item, str):
+        s = item.strip()
+        if s == '' or s.startswith('<'):
+            return False
+        return True
+    return False
+
+def parse_mistral_output(mistral_output, label="[Mistral]", scanner=None):
+    """
+    Parse one chunk's generated text (prompt excluded) into filtered
+    (summary bullets, action items, decisions, risks).
+    scanner: an IncrementalJSONScanner already fed while streaming; otherwise the text is scanned here.
+    """
+    decisions = []
+    risks = []
+    if scanner is None:
+        scanner = IncrementalJSONScanner()
+        scanner.feed(mistral_output)
+    if scanner.closed:
+        print(f"{label} JSON block found in output.")
+        parsed = scanner.parsed()
+        if isinstance(parsed, dict):
+            summary_text = parsed.get('summary', [])
+            action_items = parsed.get('action_items', [])
+            decisions = parsed.get('decisions', [])
+            risks = parsed.get('risks', [])
+            print(f"{label} Parsed summary: {summary_text}")
+            print(f"{label} Parsed action_items: {action_items}")
+        else:
+            summary_text = []
+            action_items = []
+    elif scanner.started:
+        # An object that never closed was cut off (token limit or deadline); its raw JSON is no summary
+        print(f"{label} JSON block was cut off; nothing to parse.")
+        summary_text = []
+        action_items = []
+    else:
+        print(f"{label} No JSON block found in output.")
+        summary_text = []
+        action_items = []
+        lines = mistral_output.splitlines()
+        summary_started = False
+        for line in lines:
+            l = line.strip()
+            if l.startswith('-') or l.startswith('1.') or l.startswith('•'):
+                summary_started = True
+            if summary_started and l:
+                summary_text.append(l)
+        if not summary_text:
+            summary_text = [mistral_output.strip()]
+    filtered_summaries = [s for s in (summary_text if isinstance(summary_text, list) else [summary_text]) if is_valid_summary_item(s)]
+    filtered_action_items = [a for a in (action_items if isinstance(action_items, list) else [action_items]) if is_valid_action_item(a)]
+    print(f"{label} Filtered summary: {filtered_summaries}")
+    print(f"{label} Filtered action_items: {filtered_action_items}")
+    filtered_decisions = [d for d in (decisions if isinstance(decisions, list) else [decisions]) if is_valid_action_item(d)]
+    filtered_risks = [r for r in (risks if isinstance(risks, list) else [risks]) if is_valid_action_item(r)]
+    return filtered_summaries, filtered_action_items, filtered_decisions, filtered_risks
+
+def decoding_mode():
+    """MISTRAL_DECODING: 'schema' (default) constrains output to SUMMARY_SCHEMA, 'free' leaves it unconstrained."""
+    return os.environ.get("MISTRAL_DECODING", "schema")
+
+def _generation_controls(mistral_tokenizer, schema=SUMMARY_SCHEMA, deadline=None, cancelled=None, max_new_tokens=MAX_NEW_TOKENS):
+    """
+    stopping_criteria / logits_processor kwargs for model.generate under the current decoding mode.
+    max_new_tokens: the generate() limit; schema decoding closes the object before reaching it.
+    deadline: also stop every row once it passes (the cut-off output is then incomplete JSON).
+    cancelled: a threading.Event; also stop every row once it is set.
+    """
+    from transformers import LogitsProcessorList, StoppingCriteriaList
+    criteria = [JSONObjectStoppingCriteria(mistral_tokenizer)]
+    if deadline is not None:
+        criteria.append(DeadlineStoppingCriteria(deadline))
+    if cancelled is not None:
+        criteria.append(CancelledStoppingCriteria(cancelled))
+    controls = {'stopping_criteria': StoppingCriteriaList(criteria)}
+    if decoding_mode() == "schema":
+        controls['logits_processor'] = LogitsProcessorList([JSONSchemaLogitsProcessor(mistral_tokenizer, schema, max_new_tokens)])
+    return controls
+
+def _too_short_result(meeting_id):
+    print("[Mistral] Transcript too short for summarization.")
+    return {
+        'meeting_id': meeting_id,
+        'summary_text': "Transcript too short for summarization.",
+        'action_items': []
+    }
+
+def bucket_by_length(lengths, max_batch_size, padding_tolerance=1.25):
+    """
+    Group item indices into batches of similar length so left-padding stays cheap.
+    A batch is closed when it is full or when the next item would be more than
+    padding_tolerance times longer than the batch's shortest item.
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    batches = []
+    current = []
+    for i in order:
+        if current and (len(current) >= max_batch_size or lengths[i] > lengths[current[0]] * padding_tolerance):
+            batches.append(current)
+            current = []
+        current.append(i)
+    if current:
+        batches.append(current)
+    return batches
+
+def _generate_batch(mistral_tokenizer, mistral_model, prompts, deadline=None):
+    """
+    Beam-search all prompts in one generate call, reusing the cached instruction prefix.
+    Generation stops once each row's JSON object closes (or the deadline passes);
+    returns the decoded new text in order.
+    """
+    summary_ids = generate_with_prefix(
+        mistral_tokenizer,
+        mistral_model,
+        PROMPT_TEMPLATE,
+        prompts,
+        strip_prompt=True,
+        max_new_tokens=MAX_NEW_TOKENS,
+        do_sample=False,
+        num_beams=NUM_BEAMS,
+        early_stopping=True,
+        pad_token_id=mistral_tokenizer.eos_token_id,
+        **_generation_controls(mistral_tokenizer, deadline=deadline)
+    )
+    return mistral_tokenizer.batch_decode(summary_ids, skip_special_tokens=True)
+
+def _condense_summary(mistral_tokenizer, mistral_model, bullets):
+    """
+    Second, short generation that rewrites clustered bullets from all chunks into 5-8 points.
+    Runs on the inference pool (inline when the caller is already on it, as summarize_with_mistral is).
+    """
+    prompt = REDUCE_PROMPT_TEMPLATE + "".join(f"- {b}\n" for b in bullets)
+    output_ids = inference_executor.call(
+        generate_with_prefix,
+        mistral_tokenizer,
+        mistral_model,
+        REDUCE_PROMPT_TEMPLATE,
+        [prompt],
+        strip_prompt=True,
+        max_new_tokens=REDUCE_MAX_NEW_TOKENS,
+        do_sample=False,
+        num_beams=1,
+        pad_token_id=mistral_tokenizer.eos_token_id,
+        **_generation_controls(mistral_tokenizer, REDUCE_SCHEMA, max_new_tokens=REDUCE_MAX_NEW_TOKENS)
+    )
+    scanner = IncrementalJSONScanner()
+    scanner.feed(mistral_tokenizer.decode(output_ids[0], skip_special_tokens=True))
+    parsed = scanner.parsed()
+    condensed = [b for b in (parsed or {}).get('summary', []) if is_valid_summary_item(b)]
+    return condensed or bullets
+
+def reduce_results(mistral_tokenizer, mistral_model, summaries, action_items, decisions, risks, chunk_count):
+    """
+    Reduce stage over all chunks: near-duplicate bullets and records are clustered (MinHash/LSH)
+    and merged, then, with MISTRAL_REDUCE_GENERATION=1, a short generation condenses the bullets.
+    """
+    reduced = {
+        'summary_text': dedupe_texts(summaries),
+        'action_items': dedupe_records(action_items, 'task'),
+        'decisions': dedupe_records(decisions, 'decision'),
+        'risks': dedupe_records(risks, 'risk')
+    }
+    print(f"[Mistral] Reduce: {len(summaries)} -> {len(reduced['summary_text'])} bullets, "
+          f"{len(action_items)} -> {len(reduced['action_items'])} action items")
+    if (chunk_count > 1 and len(reduced['summary_text']) > 8
+            and os.environ.get("MISTRAL_REDUCE_GENERATION", "0") == "1"):
+        reduced['summary_text'] = _condense_summary(mistral_tokenizer, mistral_model, reduced['summary_text'])
+    return reduced
+
+def _cut_off_result(meeting_id, summaries, action_items, decisions, risks, completed, total):
+    """Result of a run stopped by its deadline: the completed chunks, merged without a reduce generation."""
+    print(f"[Mistral] Deadline passed: {completed}/{total} chunk(s) completed.")
+    return {
+        'meeting_id': meeting_id,
+        'summary_text': dedupe_texts(summaries),
+        'action_items': dedupe_records(action_items, 'task'),
+        'decisions': dedupe_records(decisions, 'decision'),
+        'risks': dedupe_records(risks, 'risk'),
+        'degraded': True,
+        'chunks_completed': completed,
+        'chunks_total': total
+    }
+
+def summarize_with_mistral(mistral_tokenizer, mistral_model, transcript, meeting_id, max_batch_size=None, deadline=None, chunks=None):
+    """
+    max_batch_size: chunks generated together in one forward pass (default MISTRAL_MAX_BATCH_SIZE env, 4).
+    Use 1 to fall back to one generate call per chunk.
+    deadline: a mcp.core.deadline.Deadline. Once it passes, running generation stops, remaining
+    chunks are skipped, and the result holds only completed chunks with 'degraded': True.
+    chunks: the transcript already split by the caller; any chunk over chunk_budget is split further.
+    """
     if not transcript or len(transcript.split()) < 10:
-        print("[Mistral] Transcript too short for summarization.")
-        return {
-            'meeting_id': meeting_id,
-            'summary_text': "Transcript too short for summarization.",
-            'action_items': []
-        }
-
-    # --- Chunking logic ---
-    def chunk_text(text, max_words=900):
-        words = text.split()
-        chunks = []
-        for i in range(0, len(words), max_words):
-            chunk = ' '.join(words[i:i+max_words])
-            chunks.append(chunk)
-        return chunks
-
-    transcript_chunks = chunk_text(transcript, max_words=900)
+        return _too_short_result(meeting_id)
+    if deadline is not None:
+        deadline.check("Mistral generation")
+    max_batch_size = max_batch_size or int(os.environ.get("MISTRAL_MAX_BATCH_SIZE", "4"))
+
+    if chunks:
+        transcript_chunks = [c for chunk in chunks for c in chunk_transcript(mistral_tokenizer, chunk)]
+    else:
+        transcript_chunks = list(chunk_transcript(mistral_tokenizer, transcript))
     print(f"[Mistral] Transcript split into {len(transcript_chunks)} chunk(s).")
 
+    prompts = [PROMPT_TEMPLATE + f"{chunk}\n" for chunk in transcript_chunks]
+    for idx, mistral_prompt in enumerate(prompts):
+        print(f"[Mistral][Chunk {idx+1}] Prompt sent to model (first 500 chars):\n", mistral_prompt[:500], "..." if len(mistral_prompt) > 500 else "")
+    lengths = [len(ids) for ids in mistral_tokenizer(prompts)["input_ids"]]
+    outputs = [None] * len(prompts)
+    for batch in bucket_by_length(lengths, max_batch_size):
+        if deadline is not None and deadline.expired:
+            print(f"[Mistral] Deadline passed; skipping chunk(s) {[i + 1 for i in batch]}.")
+            continue
+        print(f"[Mistral] Generating chunk(s) {[i + 1 for i in batch]} in one batch.")
+        for i, text in zip(batch, _generate_batch(mistral_tokenizer, mistral_model, [prompts[i] for i in batch], deadline)):
+            outputs[i] = text
+    cut_off = deadline is not None and deadline.expired
+
     all_summaries = []
     all_action_items = []
+    all_decisions = []
+    all_risks = []
 
-    for idx, chunk in enumerate(transcript_chunks):
-        mistral_prompt = (
-            "You are an AI specialized in analyzing meeting transcripts.\n"
-            "Your task is to produce:\n"
-            "1. A clear and concise SUMMARY of the meeting as a numbered or bulleted list (do not use 'point 1', 'point 2', use real content).\n"
-            "2. A list of ACTION ITEMS with owners and deadlines if mentioned.\n"
-            "3. A list of DECISIONS made during the meeting.\n"
-            "4. A list of RISKS, blockers, or concerns raised.\n"
-            "5. A list of FOLLOW-UP QUESTIONS that attendees should clarify.\n"
-            "\n"
-            "INSTRUCTIONS:\n"
-            "- Read the provided meeting transcript thoroughly.\n"
-            "- Do NOT invent information. Only extract what is explicitly or implicitly present.\n"
-            "- If some sections have no information, return an empty list.\n"
-            "- Keep summary short but complete (5–8 bullet points or numbers).\n"
-            "- Use simple, business-friendly language.\n"
-            "- DO NOT use placeholder text like 'point 1', 'point 2', '<summary bullet 1>', '<task>', etc.\n"
-            "- DO NOT copy the example below. Fill with real meeting content.\n"
-            "\n"
-            "RETURN THE OUTPUT IN THIS EXACT JSON FORMAT (as a code block):\n"
-            "```json\n"
-            "{\n"
-            "  \"summary\": [\"<summary bullet 1>\", \"<summary bullet 2>\"],\n"
-            "  \"action_items\": [ {\"task\": \"<task>\", \"owner\": \"<owner>\", \"deadline\": \"<deadline>\"} ]\n"
-            "}\n"
-            "```\n"
-            "\n"
-            "TRANSCRIPT:\n"
-            f"{chunk}\n"
-        )
-        print(f"[Mistral][Chunk {idx+1}] Prompt sent to model (first 500 chars):\n", mistral_prompt[:500], "..." if len(mistral_prompt) > 500 else "")
-        device = next(mistral_model.parameters()).device
-        encoded = mistral_tokenizer.encode_plus(
-            mistral_prompt,
-            truncation=True,
-            max_length=4096,
-            return_tensors="pt"
-        )
-        input_ids = encoded["input_ids"].to(device)
-        attention_mask = encoded["attention_mask"].to(device)
-        summary_ids = mistral_model.generate(
-            input_ids,
-            attention_mask=attention_mask,
-            max_new_tokens=512,
-            do_sample=False,
-            num_beams=4,
-            early_stopping=True,
-            pad_token_id=mistral_tokenizer.eos_token_id
-        )
-        mistral_output = mistral_tokenizer.decode(summary_ids[0], skip_special_tokens=True)
+    completed = 0
+    for idx, mistral_output in enumerate(outputs):
+        if mistral_output is None:
+            continue
         print(f"[Mistral][Chunk {idx+1}] Raw model output (first 500 chars):\n", mistral_output[:500], "..." if len(mistral_output) > 500 else "")
         print(f"[Mistral][Chunk {idx+1}] Full decoded output:\n", mistral_output)
 
-        def extract_last_json(text):
-            # Find all top-level JSON objects and return the last one
-            starts = []
-            ends = []
-            brace_count = 0
-            start = None
-            for i, c in enumerate(text):
-                if c == '{':
-                    if brace_count == 0:
-                        start = i
-                    brace_count += 1
-                elif c == '}':
-                    brace_count -= 1
-                    if brace_count == 0 and start is not None:
-                        starts.append(start)
-                        ends.append(i+1)
-                        start = None
-            if starts and ends:
-                # Return the last JSON block
-                return text[starts[-1]:ends[-1]]
-            return None
-
-        json_str = extract_last_json(mistral_output)
-        if json_str:
-            print(f"[Mistral][Chunk {idx+1}] JSON block found in output.")
-            try:
-                parsed = json.loads(json_str)
-                summary_text = parsed.get('summary', [])
-                action_items = parsed.get('action_items', [])
-                print(f"[Mistral][Chunk {idx+1}] Parsed summary: {summary_text}")
-                print(f"[Mistral][Chunk {idx+1}] Parsed action_items: {action_items}")
-            except Exception as e:
-                print(f"[Mistral][Chunk {idx+1}] JSON parsing error: {e}")
-                summary_text = []
-                action_items = []
-        else:
-            print(f"[Mistral][Chunk {idx+1}] No JSON block found in output.")
-            summary_text = []
-            action_items = []
-            lines = mistral_output.splitlines()
-            summary_started = False
-            for line in lines:
-                l = line.strip()
-                if l.startswith('-') or l.startswith('1.') or l.startswith('•'):
-                    summary_started = True
-                if summary_started and l:
-                    summary_text.append(l)
-            if not summary_text:
-                summary_text = [mistral_output.strip()]
-        # Clean up and filter out empty/placeholder/point items
-        def is_valid_summary_item(item):
-            if not item or not isinstance(item, str):
-                return False
-            s = item.strip().lower()
-            if s in ("point 1", "point 2", "point1", "point2", "", "-", "<summary bullet 1>", "<summary bullet 2>"):
-                return False
-            if s.startswith("point ") or s.startswith("<summary"):
-                return False
-            if '<' in s and '>' in s:
-                return False
-            return True
-        def is_valid_action_item(item):
-            if not item:
-                return False
-            if isinstance(item, dict):
-                # Remove if any value is a placeholder like <task> or empty
-                for v in item.values():
-                    if isinstance(v, str) and (v.strip() == '' or v.strip().startswith('<')):
-                        return False
-                return any(v for v in item.values())
-            if isinstance(item, str):
-                s = item.strip()
-                if s == '' or s.startswith('<'):
-                    return False
-                return True
-            return False
-        filtered_summaries = [s for s in (summary_text if isinstance(summary_text, list) else [summary_text]) if is_valid_summary_item(s)]
-        filtered_action_items = [a for a in (action_items if isinstance(action_items, list) else [action_items]) if is_valid_action_item(a)]
-        print(f"[Mistral][Chunk {idx+1}] Filtered summary: {filtered_summaries}")
-        print(f"[Mistral][Chunk {idx+1}] Filtered action_items: {filtered_action_items}")
+        scanner = IncrementalJSONScanner()
+        scanner.feed(mistral_output)
+        if cut_off and not scanner.closed:
+            # Stopped by the deadline mid-object: nothing trustworthy to parse
+            print(f"[Mistral][Chunk {idx+1}] Cut off by the deadline; dropped.")
+            continue
+        completed += 1
+        filtered_summaries, filtered_action_items, decisions, risks = parse_mistral_output(mistral_output, f"[Mistral][Chunk {idx+1}]", scanner)
         all_summaries.extend(filtered_summaries)
         all_action_items.extend(filtered_action_items)
+        all_decisions.extend(decisions)
+        all_risks.extend(risks)
         print(f"[Mistral][Chunk {idx+1}] all_summaries so far: {all_summaries}")
         print(f"[Mistral][Chunk {idx+1}] all_action_items so far: {all_action_items}")
 
-    print(f"[Mistral] FINAL all_summaries: {all_summaries}")
-    print(f"[Mistral] FINAL all_action_items: {all_action_items}")
-    return {
-        'meeting_id': meeting_id,
-        'summary_text': all_summaries,
-        'action_items': all_action_items
-    }
+    if cut_off:
+        # No reduce generation: there is no time left for it
+        return _cut_off_result(meeting_id, all_summaries, all_action_items, all_decisions, all_risks, completed, len(outputs))
+    reduced = reduce_results(mistral_tokenizer, mistral_model, all_summaries, all_action_items, all_decisions, all_risks, len(outputs))
+    print(f"[Mistral] FINAL summaries: {reduced['summary_text']}")
+    print(f"[Mistral] FINAL action_items: {reduced['action_items']}")
+    return dict(reduced, meeting_id=meeting_id)
+
+def stream_with_mistral(mistral_tokenizer, mistral_model, transcript, meeting_id, deadline=None):
+    """
+    Streaming variant of summarize_with_mistral.
+    Yields {'token': text} events as text is decoded, then one {'result': summary_obj} event.
+    Uses greedy decoding: token streamers do not support beam search.
+    deadline: as for summarize_with_mistral; the result then holds the chunks completed in time.
+    Closing the generator (the client went away) cancels a queued generation and stops a running one.
+    """
+    from transformers import TextIteratorStreamer
+    if not transcript or len(transcript.split()) < 10:
+        yield {'result': _too_short_result(meeting_id)}
+        return
+    all_summaries = []
+    all_action_items = []
+    all_decisions = []
+    all_risks = []
+    chunk_count = 0
+    completed = 0
+    cancelled = threading.Event()
+    future = None
+    # Chunks are produced lazily, so the first tokens stream before the whole transcript is split
+    chunks = chunk_transcript(mistral_tokenizer, transcript)
+    try:
+        for idx, chunk in enumerate(chunks):
+            chunk_count += 1
+            if deadline is not None and deadline.expired:
+                # Count the chunks that will not be generated, for chunks_total
+                chunk_count += sum(1 for _ in chunks)
+                break
+            # skip_prompt: only newly generated text reaches the client (and the JSON parser)
+            streamer = TextIteratorStreamer(mistral_tokenizer, skip_prompt=True, skip_special_tokens=True)
+            future = inference_executor.submit(
+                generate_with_prefix,
+                mistral_tokenizer,
+                mistral_model,
+                PROMPT_TEMPLATE,
+                [PROMPT_TEMPLATE + f"{chunk}\n"],
+                max_new_tokens=MAX_NEW_TOKENS,
+                do_sample=False,
+                num_beams=STREAM_NUM_BEAMS,
+                streamer=streamer,
+                pad_token_id=mistral_tokenizer.eos_token_id,
+                **_generation_controls(mistral_tokenizer, deadline=deadline, cancelled=cancelled)
+            )
+
+            def _unblock(f, streamer=streamer):
+                # If generate() dies (or never starts) the streamer never sees its end signal; release the reader
+                if f.cancelled() or f.exception() is not None:
+                    streamer.end()
+            future.add_done_callback(_unblock)
+
+            if idx > 0:
+                yield {'token': "\n"}
+            pieces = []
+            scanner = IncrementalJSONScanner()
+            for text in streamer:
+                if text:
+                    pieces.append(text)
+                    scanner.feed(text)
+                    yield {'token': text}
+            future.result()
+            if deadline is not None and deadline.expired and not scanner.closed:
+                print(f"[Mistral][Stream][Chunk {idx+1}] Cut off by the deadline; dropped.")
+                continue
+            completed += 1
+            filtered_summaries, filtered_action_items, decisions, risks = parse_mistral_output(''.join(pieces), f"[Mistral][Stream][Chunk {idx+1}]", scanner)
+            all_summaries.extend(filtered_summaries)
+            all_action_items.extend(filtered_action_items)
+            all_decisions.extend(decisions)
+            all_risks.extend(risks)
+    finally:
+        # Normal exit, error or GeneratorExit: nothing may keep generating for a reader that is gone
+        cancelled.set()
+        if future is not None:
+            future.cancel()
+    if completed < chunk_count:
+        yield {'result': _cut_off_result(meeting_id, all_summaries, all_action_items, all_decisions, all_risks, completed, chunk_count)}
+        return
+    reduced = reduce_results(mistral_tokenizer, mistral_model, all_summaries, all_action_items, all_decisions, all_risks, chunk_count)
+    yield {'result': dict(reduced, meeting_id=meeting_id)}
@@ -1,13 +1,16 @@
 """
 Orchestrator agent for MCP: Handles user queries, input validation, agent routing, parallel execution, and workflow state management.
 """
+import os
 from typing import Dict, Any, List
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from mcp.protocols.a2a import a2a_endpoint, a2a_request
 from mcp.agents.mcp_google_calendar import MCPGoogleCalendar
 from mcp.agents.transcript_preprocessing_agent import TranscriptPreprocessingAgent
+from mcp.agents.extractive_filter_agent import ExtractiveFilterAgent
 from mcp.agents.summarization_agent import SummarizationAgent
+from mcp.core.deadline import Deadline
 
 class OrchestratorState:
     def __init__(self):
@@ -23,12 +26,15 @@ class OrchestratorAgent:
         pass  # No state needed for single-agent workflow
 
     @a2a_endpoint
-    def handle_query(self, query: str, user: str, date: str = None, permissions: list = None, selected_event_indices: list = None, mode: str = None, create_jira: bool = False) -> dict:
+    def handle_query(self, query: str, user: str, date: str = None, permissions: list = None, selected_event_indices: list = None, mode: str = None, create_jira: bool = False, prefilter: bool = None, latency_budget: float = None) -> dict:
         print(f"[DEBUG] OrchestratorAgent.handle_query received mode: {mode}, create_jira: {create_jira}")
-        mode = "bart"  # Force BART mode regardless of input
+        # No explicit mode: the router picks a backend per request from size, budget and load
+        mode = mode or "auto"
         # Validate inputs
         if not query or not user:
             return {"error": "Missing query or user."}
+        # One deadline for the whole request: calendar fetch, model load and preprocessing count against it
+        deadline = Deadline.from_budget(latency_budget)
         result = {}
         try:
             cal = MCPGoogleCalendar(calendar_id="primary")
@@ -55,22 +61,47 @@ class OrchestratorAgent:
             result['selected_transcripts'] = selected_transcripts
             result['selected_event_indices'] = selected_event_indices
 
+            # The backend is picked up front so chunks are counted with its tokenizer and sized to its window
+            summarizer = SummarizationAgent(mode=mode)
+            backend, routing = summarizer.resolve_backend(mode, "\n".join(t for t in selected_transcripts if t), deadline)
+            tokenizer, chunk_size = summarizer.chunking_for(backend)
+
             # Step 2: Transcript Preprocessing Agent (protocol-driven)
             preproc = TranscriptPreprocessingAgent()
-            preproc_payload = {"transcripts": selected_transcripts}
+            preproc_payload = {"transcripts": selected_transcripts, "chunk_size": chunk_size, "tokenizer": tokenizer}
             preproc_response = a2a_request(preproc.process, preproc_payload)
             if preproc_response["status"] == "ok":
                 processed_transcripts = preproc_response["result"]
                 result['processed_transcripts'] = processed_transcripts
                 result['processed_transcript_count'] = len(processed_transcripts)
 
+                # Step 2b: optional extractive pre-filter (EXTRACTIVE_PREFILTER=1 or prefilter=True)
+                if prefilter is None:
+                    prefilter = os.environ.get("EXTRACTIVE_PREFILTER", "0") == "1"
+                if prefilter:
+                    filter_response = a2a_request(ExtractiveFilterAgent().process, {"processed_transcripts": processed_transcripts, "tokenizer": tokenizer})
+                    if filter_response["status"] == "ok":
+                        # The filter returns one text; chunk it again for the backend
+                        processed_transcripts = preproc.process(filter_response["result"]["processed_transcripts"], chunk_size, tokenizer)
+                        result['prefilter'] = filter_response["result"]["report"]
+                    else:
+                        result['prefilter_error'] = filter_response["error"]
+
                 # Step 3: Summarization Agent (protocol-driven)
-                print(f"[DEBUG] Passing mode to SummarizationAgent: {mode}")
-                summarizer = SummarizationAgent(mode=mode)
-                summarization_payload = {"processed_transcripts": processed_transcripts, "mode": mode}
+                print(f"[DEBUG] Passing mode to SummarizationAgent: {mode} (backend {backend})")
+                summarization_payload = {"processed_transcripts": processed_transcripts, "mode": backend, "deadline": deadline}
+                if not prefilter:
+                    # The chunks cover the transcripts unchanged: task extraction on them can reuse the pass
+                    summarization_payload["source_transcript"] = "\n".join(t for t in selected_transcripts if t)
                 summarization_response = a2a_request(summarizer.summarize_protocol, summarization_payload)
+                if routing:
+                    result['routing'] = routing
                 if summarization_response["status"] == "ok":
-                    summaries = summarization_response["result"]
+                    summaries, degradation = summarization_response["result"]
+                    if degradation:
+                        # The backend missed the deadline; the summary came from a faster path
+                        result['degraded'] = True
+                        result['degradation'] = degradation
                     result['summaries'] = summaries
                     result['summary_count'] = len(summaries) if isinstance(summaries, list) else 1
                     # Step 4: Jira Agent (protocol-driven, only if approved)
@@ -1,4 +1,5 @@
 from mcp.core.utils import gen_id
+from mcp.core.sentence_tagger import meeting_tagger
 class RiskDetectionAgent:
 	def __init__(self):
 		pass
@@ -6,7 +7,7 @@ class RiskDetectionAgent:
 	def detect(self, meeting_id: str, summary: dict, tasks: list, progress: dict):
 		risks = []
 		blockers = summary.get('blockers', [])
-		summary_text = summary.get('summary_text','').lower()
+		summary_text = summary.get('summary_text','')
 		if blockers:
 			for b in blockers:
 				risks.append({
@@ -15,7 +16,7 @@ class RiskDetectionAgent:
 					'description': b,
 					'severity': 'high'
 				})
-		if any(k in summary_text for k in ['delay', 'delayed', 'blocked', 'pending', 'cannot', 'error']):
+		if meeting_tagger.matches(summary_text, 'risk'):
 			risks.append({
 				'id': gen_id('risk'),
 				'meeting_id': meeting_id,
@@ -0,0 +1,187 @@
+"""
+Incremental (rolling) summarization for transcripts that keep growing.
+- A session keeps the text it has already seen, summarizes only complete new chunks and
+  merges their partial results (near-duplicates clustered) into a running summary and action-item list
+- The incomplete tail is held back (and only summarized provisionally) until it fills a chunk
+  or the session is finalized, so per-update cost follows the appended text, not the meeting
+- State is persisted through ContextHandler, so a session survives restarts and re-fetches
+- Updates to one meeting are serialized by a per-meeting_id lock: state is re-loaded, updated and
+  saved under it, so concurrent appends never overwrite each other's segments
+"""
+import os
+import threading
+import time
+import weakref
+
+from mcp.core.chunking import TranscriptChunker, count_tokens
+from mcp.core.context_handler import ContextHandler
+from mcp.core.dedup import dedupe_texts, dedupe_records
+from mcp.core.inference_executor import inference_executor
+from mcp.core.json_stream import IncrementalJSONScanner
+from mcp.core.llm_client import llm_client
+from mcp.core.summary_cache import summary_cache
+from mcp.agents.bart_summarizer import summarize_with_bart, BART_MAX_INPUT_TOKENS
+from mcp.agents.mistral_summarizer import summarize_with_mistral, chunk_budget
+from mcp.agents.summarization_agent import (
+    SummarizationAgent, get_bart_model, get_mistral_model, openai_available, LLM_SUMMARY_PROMPT, MISTRAL_PROMPT_TEMPLATE
+)
+
+# Text kept from the end of the seen transcript to recognise an appended-to re-fetch
+ANCHOR_CHARS = 200
+MIN_CHUNK_WORDS = 10
+
+# meeting_id -> lock, held while any session object updates that meeting
+_meeting_locks = weakref.WeakValueDictionary()
+_meeting_locks_guard = threading.Lock()
+
+
+def meeting_lock(meeting_id):
+    """The process-wide (reentrant) lock for one meeting's session state."""
+    with _meeting_locks_guard:
+        lock = _meeting_locks.get(meeting_id)
+        if lock is None:
+            lock = threading.RLock()
+            _meeting_locks[meeting_id] = lock
+        return lock
+
+
+class RollingSummarySession:
+    def __init__(self, meeting_id, mode=None, context=None):
+        self.meeting_id = meeting_id
+        self.context = context or ContextHandler()
+        self._lock = meeting_lock(meeting_id)
+        self._requested_mode = mode
+        with self._lock:
+            self._load()
+        self._agent = SummarizationAgent(mode=self.mode)
+
+    def _load(self):
+        """(Re-)read the persisted state; called under the meeting lock before every update."""
+        mode = self._requested_mode
+        self.state = self.context.get_session(self.meeting_id)
+        if self.state is None or (mode and self.state.get('mode') != mode):
+            self.state = self._new_state(mode or getattr(self, 'mode', None) or os.environ.get("ROLLING_SUMMARY_MODE", "bart"))
+        self.mode = self.state['mode']
+
+    def _new_state(self, mode):
+        return {
+            'meeting_id': self.meeting_id,
+            'mode': mode,
+            'seen_chars': 0,
+            'anchor': '',
+            'tail': '',
+            'chunks': [],         # committed partial results, one per summarized chunk
+            'tail_result': None,  # provisional result for the current tail
+            'updated_at': None
+        }
+
+    def _tokenizer_and_budget(self):
+        if self.mode == "mistral":
+            tokenizer, _ = inference_executor.call(get_mistral_model)
+            return tokenizer, chunk_budget(tokenizer)
+        if self.mode == "bart":
+            tokenizer, _ = inference_executor.call(get_bart_model)
+            return tokenizer, BART_MAX_INPUT_TOKENS - tokenizer.num_special_tokens_to_add()
+        return None, int(os.environ.get("ROLLING_CHUNK_TOKENS", "1024"))
+
+    def _summarize_chunk(self, chunk):
+        """{'summary': [...], 'action_items': [...]} for one chunk; cached by content like full summaries."""
+        if len(chunk.split()) < MIN_CHUNK_WORDS:
+            return {'summary': [], 'action_items': []}
+        template = {"llm": LLM_SUMMARY_PROMPT, "mistral": MISTRAL_PROMPT_TEMPLATE}.get(self.mode, "")
+        cache_key = self._agent._cache_key(chunk, f"rolling:{self.mode}", self.mode, template)
+        cached = summary_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        if self.mode == "mistral":
+            tokenizer, model = inference_executor.call(get_mistral_model)
+            obj = inference_executor.call(summarize_with_mistral, tokenizer, model, chunk, self.meeting_id)
+            part = {'summary': list(obj.get('summary_text', [])), 'action_items': obj.get('action_items', [])}
+        elif self.mode == "bart":
+            tokenizer, model = inference_executor.call(get_bart_model)
+            obj = inference_executor.call(summarize_with_bart, tokenizer, model, chunk, self.meeting_id)
+            if str(obj['summary_text']).startswith("[BART summarization error"):
+                raise RuntimeError(obj['summary_text'])
+            part = {'summary': [obj['summary_text']], 'action_items': obj.get('action_items', [])}
+        elif self.mode == "llm" and openai_available() and os.environ.get('OPENAI_API_KEY'):
+            scanner = IncrementalJSONScanner()
+            scanner.feed(llm_client.chat_sync(LLM_SUMMARY_PROMPT + f"{chunk}\n", max_tokens=300))
+            parsed = scanner.parsed() or {}
+            part = {'summary': parsed.get('summary', []), 'action_items': parsed.get('action_items', [])}
+        else:
+            raise RuntimeError(f"No summarizer available for rolling mode '{self.mode}'")
+        summary_cache.set(cache_key, part)
+        return part
+
+    def append(self, segment, final=False, include_tail=True):
+        """
+        Add newly appended transcript text.
+        final: the meeting is over; the remaining tail is committed as the last chunk
+        include_tail: also summarize the uncommitted tail so the returned result is up to date
+        """
+        with self._lock:
+            # Another request may have updated this meeting since the state was loaded
+            self._load()
+            return self._append(segment, final, include_tail)
+
+    def _append(self, segment, final, include_tail):
+        self.state['tail'] += segment or ''
+        self.state['seen_chars'] += len(segment or '')
+        self.state['anchor'] = (self.state['anchor'] + (segment or ''))[-ANCHOR_CHARS:]
+        if segment:
+            self.state['tail_result'] = None
+        tail = self.state['tail']
+        tokenizer, budget = self._tokenizer_and_budget()
+        if final or count_tokens(tokenizer, tail) > budget:
+            chunks = list(TranscriptChunker(tokenizer, max_tokens=budget).chunks(tail))
+            if not final and chunks:
+                # The last chunk may still grow; keep it (and its trailing whitespace) as the new tail
+                trailing = tail[len(tail.rstrip()):]
+                chunks, tail = chunks[:-1], chunks[-1] + trailing
+            else:
+                tail = ''
+            for chunk in chunks:
+                print(f"[RollingSummary] {self.meeting_id}: summarizing new chunk {len(self.state['chunks']) + 1} ({len(chunk)} chars)")
+                self.state['chunks'].append(self._summarize_chunk(chunk))
+            self.state['tail'] = tail
+            self.state['tail_result'] = None
+        if include_tail and self.state['tail'].strip() and self.state['tail_result'] is None:
+            self.state['tail_result'] = self._summarize_chunk(self.state['tail'])
+        self.state['updated_at'] = time.time()
+        self.context.save_session(self.meeting_id, self.state)
+        result = self.result()
+        self.context.save_summary(self.meeting_id, result)
+        return result
+
+    def sync(self, transcript, final=False, include_tail=True):
+        """
+        Bring the session up to date with a re-fetched full transcript.
+        Only the text after what was already seen is processed; if earlier text changed, start over.
+        """
+        with self._lock:
+            self._load()
+            seen = self.state['seen_chars']
+            anchor = self.state['anchor']
+            if len(transcript) < seen or transcript[seen - len(anchor):seen] != anchor:
+                print(f"[RollingSummary] {self.meeting_id}: transcript changed before the appended part; restarting session")
+                self.reset()
+                seen = 0
+            return self._append(transcript[seen:], final, include_tail)
+
+    def reset(self):
+        with self._lock:
+            self.state = self._new_state(self.mode)
+            self.context.delete_session(self.meeting_id)
+
+    def result(self):
+        parts = list(self.state['chunks'])
+        if self.state['tail_result']:
+            parts.append(self.state['tail_result'])
+        return {
+            'meeting_id': self.meeting_id,
+            'mode': self.mode,
+            'summary_text': dedupe_texts([s for p in parts for s in p.get('summary', [])]),
+            'action_items': dedupe_records([a for p in parts for a in p.get('action_items', [])], 'task'),
+            'chunks_summarized': len(self.state['chunks']),
+            'pending_chars': len(self.state['tail'])
+        }
@@ -1,84 +1,237 @@
 import os
 import asyncio
-import json
+import functools
+import importlib.util
+import time
 from mcp.core.utils import gen_id
 from mcp.core.context_handler import ContextHandler
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM, AutoModelForCausalLM
-from transformers import BitsAndBytesConfig
-from mcp.agents.mistral_summarizer import summarize_with_mistral
-from mcp.agents.bart_summarizer import summarize_with_bart
-try:
-    import openai
-    from openai import OpenAI
-except Exception:
-    openai = None
+from mcp.core.model_registry import model_registry, load_seq2seq, load_causal_lm, seq2seq_backend
+from mcp.core.summary_cache import summary_cache, model_revision
+from mcp.core.inference_executor import inference_executor
+from mcp.core.llm_client import llm_client, LLMUnavailableError
+from mcp.core.single_flight import single_flight
+from mcp.core.router import backend_router
+from mcp.core.chunking import count_tokens
+from mcp.core.deadline import Deadline, DeadlineExceeded, TIMEOUT_ERRORS
+from mcp.core.extractive import extractive_summary
+from mcp.core.sentence_tagger import meeting_tagger, split_sentences
+from mcp.agents.mistral_summarizer import summarize_with_mistral, stream_with_mistral, chunk_budget as mistral_chunk_budget, decoding_mode as mistral_decoding_mode, PROMPT_TEMPLATE as MISTRAL_PROMPT_TEMPLATE, NUM_BEAMS as MISTRAL_NUM_BEAMS, STREAM_NUM_BEAMS as MISTRAL_STREAM_NUM_BEAMS
+from mcp.agents.bart_summarizer import summarize_with_bart, BART_MAX_INPUT_TOKENS
+from mcp.core.config import export_credentials_env
 
-with open('mcp/config/credentials.json') as f:
-    creds = json.load(f)
-os.environ["OPENAI_API_KEY"] = creds.get("openai_api_key", "")
+LLM_MODEL = llm_client.model
 
 
+@functools.lru_cache(maxsize=None)
+def openai_available():
+    """Whether the openai package is installed, without paying for importing it."""
+    return importlib.util.find_spec("openai") is not None
 
 
+LLM_PROTOCOL_PROMPT = (
+    "You are an AI specialized in analyzing meeting transcripts.\n"
+    "Your task is to produce a concise summary of the following transcript.\n"
+    "TRANSCRIPT:\n{transcript}\n"
+    "Return a short summary (5-8 bullet points)."
+)
+
+# Structured-output preamble for summarize(); the transcript is appended after it.
+LLM_SUMMARY_PROMPT = (
+    "You are an AI specialized in analyzing meeting transcripts.\n"
+    "Your task is to produce:\n"
+    "1. A clear and concise SUMMARY of the meeting.\n"
+    "2. A list of ACTION ITEMS with owners and deadlines if mentioned.\n"
+    "3. A list of DECISIONS made during the meeting.\n"
+    "4. A list of RISKS, blockers, or concerns raised.\n"
+    "5. A list of FOLLOW-UP QUESTIONS that attendees should clarify.\n"
+    "\n"
+    "INSTRUCTIONS:\n"
+    "- Read the provided meeting transcript thoroughly.\n"
+    "- Do NOT invent information. Only extract what is explicitly or implicitly present.\n"
+    "- If some sections have no information, return an empty list.\n"
+    "- Keep summary short but complete (5–8 bullet points).\n"
+    "- Use simple, business-friendly language.\n"
+    "\n"
+    "RETURN THE OUTPUT IN THIS EXACT JSON FORMAT:\n"
+    "{\n"
+    "  \"summary\": [\"point 1\", \"point 2\"],\n"
+    "  \"decisions\": [ {\"decision\": \"\", \"reason\": \"\", \"made_by\": \"\"} ],\n"
+    "  \"action_items\": [ {\"task\": \"\", \"owner\": \"\", \"deadline\": \"\"} ],\n"
+    "  \"risks\": [ {\"risk\": \"\", \"impact\": \"\", \"raised_by\": \"\"} ],\n"
+    "  \"follow_up_questions\": [\"question 1\"]\n"
+    "}\n"
+    "\n"
+    "TRANSCRIPT:\n"
+)
+
+
+def resolve_bart_model_path():
+    bart_drive_path = os.environ.get("BART_MODEL_PATH")
+    if bart_drive_path and os.path.exists(bart_drive_path):
+        model_path = bart_drive_path
+    else:
+        model_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "models", "bart_finetuned_meeting_summary"))
+    return model_path
+
+def resolve_mistral_model_path():
+    # Check for Google Drive path via env var, else fallback to local
+    mistral_drive_path = os.environ.get("MISTRAL_MODEL_PATH")
+    if mistral_drive_path and os.path.exists(mistral_drive_path):
+        return mistral_drive_path
+    return os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "models", "mistral-7B-Instruct-v0.2"))
+
 def get_bart_model():
     print("[DEBUG] Entering get_bart_model()")
-    if not hasattr(get_bart_model, "tokenizer") or not hasattr(get_bart_model, "model"):
-        bart_drive_path = os.environ.get("BART_MODEL_PATH")
-        print(f"[DEBUG] BART_MODEL_PATH env: {bart_drive_path}")
-        if bart_drive_path and os.path.exists(bart_drive_path):
-            model_path = bart_drive_path
-        else:
-            model_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "models", "bart_finetuned_meeting_summary"))
-        print(f"[DEBUG] BART model_path resolved: {model_path}")
-        if not os.path.exists(model_path):
-            print(f"[ERROR] BART model path does not exist: {model_path}")
-            raise FileNotFoundError(f"BART model path not found: {model_path}")
-        try:
-            get_bart_model.tokenizer = AutoTokenizer.from_pretrained(model_path)
-            get_bart_model.model = AutoModelForSeq2SeqLM.from_pretrained(model_path)
-            print(f"[DEBUG] BART model and tokenizer loaded from {model_path}")
-        except Exception as e:
-            print(f"[ERROR] Exception loading BART model: {e}")
-            raise
-    else:
-        print("[DEBUG] BART model/tokenizer already loaded (cached)")
-    return get_bart_model.tokenizer, get_bart_model.model
+    print(f"[DEBUG] BART_MODEL_PATH env: {os.environ.get('BART_MODEL_PATH')}")
+    model_path = resolve_bart_model_path()
+    print(f"[DEBUG] BART model_path resolved: {model_path}")
+    if not os.path.exists(model_path):
+        print(f"[ERROR] BART model path does not exist: {model_path}")
+        raise FileNotFoundError(f"BART model path not found: {model_path}")
+    backend = bart_backend()
+    try:
+        return model_registry.get(model_path, lambda: load_seq2seq(model_path, backend), quantization=None if backend == "torch" else backend)
+    except Exception as e:
+        print(f"[ERROR] Exception loading BART model: {e}")
+        raise
+
+def bart_backend():
+    """
+    BART_BACKEND: 'torch' (default), 'int8' (dynamic int8 on CPU) or 'onnx' (ONNX Runtime).
+    Returns the backend that actually loads ('int8' for 'onnx' without optimum), which the
+    registry entry and the summary cache key are based on.
+    """
+    return seq2seq_backend(os.environ.get("BART_BACKEND", "torch"))
 
 def get_mistral_model():
-    if not hasattr(get_mistral_model, "tokenizer") or not hasattr(get_mistral_model, "model"):
-        # Check for Google Drive path via env var, else fallback to local
-        mistral_drive_path = os.environ.get("MISTRAL_MODEL_PATH")
-        if mistral_drive_path and os.path.exists(mistral_drive_path):
-            model_path = mistral_drive_path
-        else:
-            model_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "models", "mistral-7B-Instruct-v0.2"))
-        if not os.path.exists(model_path):
-            raise FileNotFoundError(f"Mistral model path not found: {model_path}")
-        get_mistral_model.tokenizer = AutoTokenizer.from_pretrained(model_path)
-        try:
-            print(f"[INFO] Attempting to load Mistral from {model_path} in 4-bit quantized mode (bitsandbytes)...")
-            get_mistral_model.model = AutoModelForCausalLM.from_pretrained(
-                model_path,
-                device_map="auto",
-                quantization_config=BitsAndBytesConfig(load_in_4bit=True)
-            )
-            print("[INFO] Loaded Mistral in 4-bit quantized mode.")
-        except Exception as e:
-            print(f"[WARN] 4-bit quantization failed or bitsandbytes not available: {e}\nFalling back to normal model load.")
-            get_mistral_model.model = AutoModelForCausalLM.from_pretrained(model_path)
-    return get_mistral_model.tokenizer, get_mistral_model.model
+    model_path = resolve_mistral_model_path()
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"Mistral model path not found: {model_path}")
+    return model_registry.get(model_path, lambda: load_causal_lm(model_path, quantization="4bit"), quantization="4bit")
+
+def _observed(backend, transcript, fn):
+    """fn, reporting its own run time (not time spent queued) to the router's latency estimates."""
+    def run(*args, **kwargs):
+        started = time.perf_counter()
+        result = fn(*args, **kwargs)
+        backend_router.observe(backend, count_tokens(None, transcript), time.perf_counter() - started)
+        return result
+    return run
+
+def keyword_action_items(transcript):
+    """Rule-based action items: sentences containing an action keyword."""
+    return meeting_tagger.select(transcript, 'action')
+
+def stream_with_openai(prompt, max_tokens=300):
+    """Yield text deltas from the OpenAI streaming chat API (shared pooled client)."""
+    return llm_client.stream_sync(prompt, max_tokens=max_tokens)
 
 
 class SummarizationAgent:
     def __init__(self, mode="auto"):
         print(f"[DEBUG] SummarizationAgent.__init__ called with mode: {mode}")
+        export_credentials_env()
         self.context = ContextHandler()
         self.mode = mode
-    def summarize_protocol(self, processed_transcripts=None, mode=None, **kwargs):
+
+    @staticmethod
+    def _route_candidates():
+        """Availability, residency and queue depth of each backend, for the router."""
+        executor = inference_executor.stats()
+        llm = llm_client.stats()
+        bart_path, mistral_path = resolve_bart_model_path(), resolve_mistral_model_path()
+        backend = bart_backend()
+        local = {'queue_depth': executor['running'] + executor['queued'], 'concurrency': executor['workers']}
+        return {
+            'llm': {'available': openai_available() and bool(os.environ.get('OPENAI_API_KEY')), 'resident': True,
+                    'queue_depth': llm['in_flight'], 'concurrency': llm['max_concurrency']},
+            'bart': dict(local, available=os.path.exists(bart_path),
+                         resident=model_registry.is_resident(bart_path, quantization=None if backend == "torch" else backend)),
+            'mistral': dict(local, available=os.path.exists(mistral_path),
+                            resident=model_registry.is_resident(mistral_path, quantization="4bit")),
+            'fallback': {'available': True, 'resident': True}
+        }
+
+    def resolve_backend(self, mode, transcript, deadline=None):
+        """
+        (backend, routing decision) for this request: explicit modes map directly (decision None),
+        'auto' asks the router. Kept per request: the agent instance is shared across requests.
+        deadline: the request's Deadline (None: no deadline); the router only picks a backend
+        expected to finish before it.
+        """
+        if mode != "auto":
+            return (mode if mode in ("llm", "bart", "mistral") else "fallback"), None
+        # An already-spent deadline still counts as a (tiny) budget: 0 would mean "no deadline" to the router
+        budget = (deadline.remaining() or 1e-6) if deadline else 0
+        routing = backend_router.choose(count_tokens(None, transcript), self._route_candidates(), budget)
+        return routing['backend'], routing
+
+    @staticmethod
+    def chunking_for(backend):
+        """
+        (tokenizer, max tokens per chunk) that backend summarizes with, for preprocessing;
+        (None, None) for backends that take the transcript whole or whose model cannot be loaded.
+        """
+        try:
+            if backend == "bart":
+                tokenizer, _ = inference_executor.call(get_bart_model)
+                return tokenizer, BART_MAX_INPUT_TOKENS - tokenizer.num_special_tokens_to_add()
+            if backend == "mistral":
+                tokenizer, _ = inference_executor.call(get_mistral_model)
+                return tokenizer, mistral_chunk_budget(tokenizer)
+        except Exception as e:
+            print(f"[SummarizationAgent] No {backend} tokenizer for chunking: {e}")
+        return None, None
+
+    @staticmethod
+    def _model_revision(backend, streamed=False):
+        """Everything besides transcript and prompt that changes backend's output; streamed: stream_summary's decoding."""
+        if backend == "llm":
+            return LLM_MODEL + (f"@{llm_client.base_url}" if llm_client.base_url else "")
+        if backend == "bart":
+            return model_revision(resolve_bart_model_path()) + ":" + os.environ.get("BART_SUMMARY_STRATEGY", "map_reduce") + ":" + bart_backend()
+        if backend == "mistral":
+            return (model_revision(resolve_mistral_model_path()) + ":" + mistral_decoding_mode()
+                    + f":beams={MISTRAL_STREAM_NUM_BEAMS if streamed else MISTRAL_NUM_BEAMS}"
+                    + ":reduce=" + os.environ.get("MISTRAL_REDUCE_GENERATION", "0"))
+        return ""
+
+    def _cache_key(self, transcript, cache_mode, backend, prompt_template, streamed=False):
+        return summary_cache.make_key(transcript, cache_mode, prompt_template, self._model_revision(backend, streamed))
+
+    def cached_joint_summary(self, transcript):
+        """
+        A completed joint Mistral pass (summary, decisions, risks, action items) over transcript from any
+        flow, or None: summarize() or the orchestrator's (beam search) first, else a streamed one (greedy).
+        For callers that only need its action items; summarize() itself never serves the streamed result.
+        """
+        for streamed in (False, True):
+            cached = summary_cache.get(self._cache_key(transcript, "mistral", "mistral", MISTRAL_PROMPT_TEMPLATE, streamed))
+            if cached is not None:
+                return cached
+        return None
+
+    @staticmethod
+    def _flight_key(cache_key, deadline):
+        # Requests coalesce only with the same budget: a result degraded under a short deadline
+        # is never handed to a caller that could have waited for the full one
+        return f"{cache_key}:budget={deadline.seconds if deadline else 0}"
+
+    def summarize_protocol(self, processed_transcripts=None, mode=None, latency_budget=None, deadline=None, source_transcript=None, **kwargs):
         """
-        Protocol-driven: summarize all transcript chunks as a single transcript (sync, for orchestrator)
-        mode: 'llm', 'bart', 'mistral', or None (defaults to self.mode)
-        Returns: a single summary string
+        Protocol-driven: summarize the transcript chunks of one meeting (sync, for orchestrator)
+        processed_transcripts: chunks from TranscriptPreprocessingAgent, ideally sized with chunking_for(backend);
+        BART and Mistral summarize them chunk by chunk (re-splitting any chunk over their window), the
+        LLM and the fallback get them joined
+        mode: 'llm', 'bart', 'mistral', 'auto' (routed), or None (defaults to self.mode)
+        latency_budget: seconds the caller can wait; used when routing 'auto' and as the deadline
+        deadline: the request's Deadline, when the caller started it earlier (it then counts the caller's
+        own stages too); takes precedence over latency_budget
+        source_transcript: the transcript the chunks were cut from, unfiltered; a Mistral result is then
+        also stored as summarize() would store it for that transcript, so task extraction on it
+        (llm_task_extraction) reuses this pass
+        Returns: (summary string, degradation). degradation is None, or says how the (faster, degraded)
+        summary was produced when the backend missed the deadline.
         """
         if processed_transcripts is None:
             processed_transcripts = kwargs.get("processed_transcripts", [])
@@ -88,43 +241,62 @@ class SummarizationAgent:
         print(f"[SummarizationAgent] Number of chunks: {len(processed_transcripts)}")
         full_transcript = "\n".join(processed_transcripts)
         print(f"[SummarizationAgent] Full transcript length: {len(full_transcript)}")
+        deadline = deadline or Deadline.from_budget(latency_budget)
+        mode, _ = self.resolve_backend(mode, full_transcript, deadline)
+        prompt_template = {"llm": LLM_PROTOCOL_PROMPT, "mistral": MISTRAL_PROMPT_TEMPLATE}.get(mode, "")
+        cache_key = self._cache_key(full_transcript, f"protocol:{mode}", mode, prompt_template)
+        cached = summary_cache.get(cache_key)
+        if cached is not None:
+            print(f"[SummarizationAgent] Summary cache hit ({cache_key[:12]})")
+            return cached, None
+        # Concurrent identical requests share one computation
+        return single_flight.do(self._flight_key(cache_key, deadline), self._summarize_protocol_uncached, full_transcript, mode, cache_key, deadline, processed_transcripts, source_transcript)
+
+    def _degrade_protocol(self, full_transcript, failed_backend, reason):
+        """(summary, degradation) from _degraded_summary, for the sync protocol path."""
+        summary_obj = asyncio.run(self._degraded_summary("meeting", full_transcript, failed_backend, reason))
+        summary = summary_obj['summary_text']
+        # The extractive path yields sentences; the protocol returns one summary string
+        if isinstance(summary, list):
+            summary = "\n".join(summary)
+        return summary, {k: summary_obj[k] for k in ('degraded_from', 'degraded_reason', 'served_by')}
+
+    def _summarize_protocol_uncached(self, full_transcript, mode, cache_key, deadline=None, chunks=None, source_transcript=None):
+        """Returns (summary, degradation); degradation is None unless the deadline forced a faster path."""
         summary = None
+        degradation = None
+        cacheable = False
         if mode == "llm":
             print("[SummarizationAgent] Entering LLM branch")
             try:
                 api_key = os.environ.get('OPENAI_API_KEY')
-                print(f"[SummarizationAgent] openai module: {openai}")
+                print(f"[SummarizationAgent] openai available: {openai_available()}")
                 print(f"[SummarizationAgent] api_key present: {bool(api_key)}")
-                if openai and api_key:
-                    prompt = (
-                        "You are an AI specialized in analyzing meeting transcripts.\n"
-                        "Your task is to produce a concise summary of the following transcript.\n"
-                        f"TRANSCRIPT:\n{full_transcript}\n"
-                        "Return a short summary (5-8 bullet points)."
-                    )
+                if openai_available() and api_key:
+                    prompt = LLM_PROTOCOL_PROMPT.format(transcript=full_transcript)
                     print(f"[SummarizationAgent] LLM prompt length: {len(prompt)}")
-                    client = OpenAI(api_key=api_key)
-                    resp = client.chat.completions.create(
-                        model='gpt-4o-mini',
-                        messages=[{'role':'user','content':prompt}],
-                        max_tokens=400,
-                        temperature=0.2
-                    )
-                    summary = resp.choices[0].message.content.strip()
+                    summary = _observed("llm", full_transcript, llm_client.chat_sync)(
+                        prompt, max_tokens=400, timeout=deadline.remaining() if deadline else None
+                    ).strip()
+                    cacheable = True
                     print("[SummarizationAgent] LLM summary received.")
                 else:
                     print("[SummarizationAgent] LLM not available, using fallback.")
                     summary = full_transcript[:100] + ("..." if len(full_transcript) > 100 else "")
-            except Exception as e:
-                print(f"[SummarizationAgent] LLM Exception: {e}")
-                summary = full_transcript[:100] + ("..." if len(full_transcript) > 100 else f" [LLM error: {e}]")
+            except TIMEOUT_ERRORS:
+                summary, degradation = self._degrade_protocol(full_transcript, "llm", "LLM call exceeded the deadline")
+            except LLMUnavailableError as e:
+                summary, degradation = self._degrade_protocol(full_transcript, "llm", f"LLM unavailable: {e}")
         elif mode == "bart":
             print("[SummarizationAgent] Entering BART branch")
             try:
-                tokenizer, model = get_bart_model()
+                tokenizer, model = inference_executor.call(get_bart_model)
                 print(f"[DEBUG] BART model objects: tokenizer={tokenizer is not None}, model={model is not None}")
-                summary_obj = summarize_with_bart(tokenizer, model, full_transcript, "meeting")
+                summary_obj = inference_executor.call(_observed("bart", full_transcript, summarize_with_bart), tokenizer, model, full_transcript, "meeting", deadline=deadline, chunks=chunks)
                 summary = summary_obj.get('summary_text', '')
+                if summary_obj.get('degraded'):
+                    degradation = {'degraded_from': "bart", 'degraded_reason': "BART generation cut short by the deadline", 'served_by': "bart"}
+                cacheable = not degradation and not summary.startswith("[BART summarization error")
                 print(f"[DEBUG] BART summary: {summary[:100]}")
             except Exception as e:
                 print(f"[ERROR] BART Exception: {e}")
@@ -132,11 +304,22 @@ class SummarizationAgent:
         elif mode == "mistral":
             print("[SummarizationAgent] Entering Mistral branch")
             try:
-                mistral_tokenizer, mistral_model = get_mistral_model()
+                mistral_tokenizer, mistral_model = inference_executor.call(get_mistral_model)
                 print("[SummarizationAgent] Mistral model loaded.")
-                summary_obj = summarize_with_mistral(mistral_tokenizer, mistral_model, full_transcript, "meeting")
-                summary = summary_obj.get('summary_text', '')
+                summary_obj = inference_executor.call(_observed("mistral", full_transcript, summarize_with_mistral), mistral_tokenizer, mistral_model, full_transcript, "meeting", deadline=deadline, chunks=chunks)
+                if summary_obj.get('degraded') and not summary_obj.get('chunks_completed'):
+                    summary, degradation = self._degrade_protocol(full_transcript, "mistral", "Mistral finished no chunk before the deadline")
+                else:
+                    summary = summary_obj.get('summary_text', '')
+                    if summary_obj.get('degraded'):
+                        degradation = {'degraded_from': "mistral", 'served_by': "mistral",
+                                       'degraded_reason': f"Mistral finished {summary_obj['chunks_completed']}/{summary_obj['chunks_total']} chunks before the deadline"}
+                    cacheable = not degradation
+                    if cacheable and source_transcript:
+                        summary_cache.set(self._cache_key(source_transcript, "mistral", "mistral", MISTRAL_PROMPT_TEMPLATE), summary_obj)
                 print("[SummarizationAgent] Mistral summary received.")
+            except DeadlineExceeded:
+                summary, degradation = self._degrade_protocol(full_transcript, "mistral", "Mistral did not start before the deadline")
             except Exception as e:
                 print(f"[SummarizationAgent] Mistral Exception: {e}")
                 summary = full_transcript[:100] + ("..." if len(full_transcript) > 100 else f" [Mistral error: {e}]")
@@ -145,86 +328,188 @@ class SummarizationAgent:
             print("[SummarizationAgent] Entering fallback branch (no model available)")
             summary = full_transcript[:100] + ("..." if len(full_transcript) > 100 else "")
         print(f"[SummarizationAgent] Final summary length: {len(summary) if summary else 0}")
-        return summary
+        if cacheable:
+            summary_cache.set(cache_key, summary)
+        return summary, degradation
 
-    async def summarize(self, meeting_id: str, transcript: str) -> dict:
-        api_key = os.environ.get('OPENAI_API_KEY')
+    async def summarize(self, meeting_id: str, transcript: str, latency_budget=None, save=True) -> dict:
+        """
+        latency_budget: seconds the caller can wait (default SUMMARY_DEADLINE_SECONDS, 0: none). It steers the
+        'auto' router and bounds generation; a backend that misses it is cut off and the result
+        comes from a faster path, marked 'degraded'.
+        save: store the result as the meeting's summary (off for callers that only want its action items).
+        """
         print(f"SummarizationAgent: Using mode={self.mode}")
-        use_llm = (self.mode == "llm") or (self.mode == "auto" and api_key and openai)
-        use_bart = (self.mode == "bart") or (self.mode == "auto" and not use_llm and self.mode != "mistral")
-        use_mistral = (self.mode == "mistral") or (self.mode == "auto" and not use_llm and not use_bart)
+        deadline = Deadline.from_budget(latency_budget)
+        backend, routing = self.resolve_backend(self.mode, transcript, deadline)
+        prompt_template = {"llm": LLM_SUMMARY_PROMPT, "mistral": MISTRAL_PROMPT_TEMPLATE}.get(backend, "")
+        cache_key = self._cache_key(transcript, backend, backend, prompt_template)
+        cached = summary_cache.get(cache_key) if backend != "fallback" else None
+
+        if cached is not None:
+            print(f"SummarizationAgent: Summary cache hit ({cache_key[:12]})")
+            summary_obj = dict(cached, meeting_id=meeting_id)
+        else:
+            # Concurrent identical requests (same transcript hash, backend and budget) await one computation
+            shared = await single_flight.do_async(self._flight_key(cache_key, deadline), self._summarize_uncached, meeting_id, transcript, backend, cache_key, deadline)
+            summary_obj = dict(shared, meeting_id=meeting_id)
+        if routing:
+            summary_obj['routing'] = {k: routing[k] for k in ('backend', 'reason', 'estimates')}
+        if save:
+            self.context.save_summary(meeting_id, summary_obj)
+        return summary_obj
 
-        if use_llm:
+    async def _summarize_uncached(self, meeting_id, transcript, backend, cache_key, deadline=None):
+        cacheable = False
+        if backend == "llm":
             print("SummarizationAgent: Using LLM summarizer")
-            prompt = (
-                "You are an AI specialized in analyzing meeting transcripts.\n"
-                "Your task is to produce:\n"
-                "1. A clear and concise SUMMARY of the meeting.\n"
-                "2. A list of ACTION ITEMS with owners and deadlines if mentioned.\n"
-                "3. A list of DECISIONS made during the meeting.\n"
-                "4. A list of RISKS, blockers, or concerns raised.\n"
-                "5. A list of FOLLOW-UP QUESTIONS that attendees should clarify.\n"
-                "\n"
-                "INSTRUCTIONS:\n"
-                "- Read the provided meeting transcript thoroughly.\n"
-                "- Do NOT invent information. Only extract what is explicitly or implicitly present.\n"
-                "- If some sections have no information, return an empty list.\n"
-                "- Keep summary short but complete (5–8 bullet points).\n"
-                "- Use simple, business-friendly language.\n"
-                "\n"
-                "RETURN THE OUTPUT IN THIS EXACT JSON FORMAT:\n"
-                "{\n"
-                "  \"summary\": [\"point 1\", \"point 2\"],\n"
-                "  \"decisions\": [ {\"decision\": \"\", \"reason\": \"\", \"made_by\": \"\"} ],\n"
-                "  \"action_items\": [ {\"task\": \"\", \"owner\": \"\", \"deadline\": \"\"} ],\n"
-                "  \"risks\": [ {\"risk\": \"\", \"impact\": \"\", \"raised_by\": \"\"} ],\n"
-                "  \"follow_up_questions\": [\"question 1\"]\n"
-                "}\n"
-                "\n"
-                "TRANSCRIPT:\n"
-                f"{transcript}\n"
-            )
+            prompt = LLM_SUMMARY_PROMPT + f"{transcript}\n"
             print("[DEBUG][LLM] Prompt sent to LLM:\n", prompt[:1000], "..." if len(prompt) > 1000 else "")
             try:
-                client = OpenAI(api_key=api_key)
-                resp = client.chat.completions.create(
-                    model='gpt-4o-mini',
-                    messages=[{'role':'user','content':prompt}],
-                    max_tokens=300,
-                    temperature=0.2
-                )
-                text = resp.choices[0].message.content
+                # Network-bound: pooled async client, bounded and retried; never the inference pool
+                started = time.perf_counter()
+                text = await llm_client.chat(prompt, max_tokens=300, timeout=deadline.remaining() if deadline else None)
+                backend_router.observe("llm", count_tokens(None, transcript), time.perf_counter() - started)
                 print("[DEBUG][LLM] Raw LLM response:\n", text)
                 summary_obj = {'meeting_id': meeting_id, 'summary_text': text}
-            except Exception as e:
-                print(f"[DEBUG][LLM] Exception during LLM summarization: {e}")
-                summary_obj = {'meeting_id': meeting_id, 'summary_text': transcript[:300], 'note': str(e)}
+                cacheable = True
+            except TIMEOUT_ERRORS:
+                summary_obj = await self._degraded_summary(meeting_id, transcript, "llm", "LLM call exceeded the deadline")
+            except LLMUnavailableError as e:
+                # Retries ran out (429/5xx/connection) or the request was rejected
+                summary_obj = await self._degraded_summary(meeting_id, transcript, "llm", f"LLM unavailable: {e}")
 
-        elif use_bart:
+        elif backend == "bart":
             print("SummarizationAgent: Using BART summarizer")
-            tokenizer, model = get_bart_model()
-            summary_obj = summarize_with_bart(tokenizer, model, transcript, meeting_id)
+            tokenizer, model = await inference_executor.run(get_bart_model)
+            summary_obj = await inference_executor.run(_observed("bart", transcript, summarize_with_bart), tokenizer, model, transcript, meeting_id, deadline=deadline)
+            if summary_obj.get('degraded'):
+                summary_obj['degraded_reason'] = "BART generation cut short by the deadline"
+            cacheable = not summary_obj.get('degraded') and not str(summary_obj.get('summary_text', '')).startswith("[BART summarization error")
 
-        elif use_mistral:
+        elif backend == "mistral":
             print("SummarizationAgent: Using local Mistral summarizer")
             print("[INFO] Loading Mistral model, this may take a few moments...")
-            mistral_tokenizer, mistral_model = get_mistral_model()
+            mistral_tokenizer, mistral_model = await inference_executor.run(get_mistral_model)
             print("[INFO] Mistral model loaded!")
-            summary_obj = summarize_with_mistral(mistral_tokenizer, mistral_model, transcript, meeting_id)
+            try:
+                summary_obj = await inference_executor.run(_observed("mistral", transcript, summarize_with_mistral), mistral_tokenizer, mistral_model, transcript, meeting_id, deadline=deadline)
+            except DeadlineExceeded:
+                summary_obj = {'degraded': True, 'chunks_completed': 0}
+            if summary_obj.get('degraded') and not summary_obj.get('chunks_completed'):
+                summary_obj = await self._degraded_summary(meeting_id, transcript, "mistral", "Mistral finished no chunk before the deadline")
+            elif summary_obj.get('degraded'):
+                summary_obj['degraded_reason'] = f"Mistral finished {summary_obj['chunks_completed']}/{summary_obj['chunks_total']} chunks before the deadline"
+            cacheable = not summary_obj.get('degraded')
 
         else:
             print("SummarizationAgent: No valid summarization method available.")
             # Fallback: very basic extraction
-            lines = [l.strip() for l in transcript.replace('\n', '. ').split('.') if l.strip()]
-            action_keywords = ['fix', 'complete', 'implement', 'create', 'update', 'assign', 'test', 'review', 'prepare', 'set up', 'ensure']
-            summary_text = lines[0] if lines else ''
-            action_items = [l for l in lines if any(k in l.lower() for k in action_keywords)]
+            lines = split_sentences(transcript)
             summary_obj = {
                 'meeting_id': meeting_id,
-                'summary_text': summary_text,
-                'action_items': action_items
+                'summary_text': lines[0] if lines else '',
+                'action_items': keyword_action_items(transcript)
             }
 
-        self.context.save_summary(meeting_id, summary_obj)
-        await asyncio.sleep(0)
+        if cacheable:
+            summary_cache.set(cache_key, summary_obj)
         return summary_obj
+
+    async def _degraded_summary(self, meeting_id, transcript, failed_backend, reason):
+        """
+        Best result still reachable after failed_backend missed its deadline or was unavailable: BART if
+        it is already resident (within a short DEGRADED_GRACE_SECONDS window), else an extractive summary.
+        Never cached.
+        """
+        print(f"[SummarizationAgent] {reason}; degrading")
+        degraded = {'degraded': True, 'degraded_from': failed_backend, 'degraded_reason': reason}
+        bart_path, backend = resolve_bart_model_path(), bart_backend()
+        if failed_backend != "bart" and model_registry.is_resident(bart_path, quantization=None if backend == "torch" else backend):
+            grace = float(os.environ.get("DEGRADED_GRACE_SECONDS", "10"))
+            try:
+                tokenizer, model = await inference_executor.run(get_bart_model)
+                summary_obj = await asyncio.wait_for(
+                    inference_executor.run(summarize_with_bart, tokenizer, model, transcript, meeting_id, deadline=Deadline(grace)), grace * 1.5
+                )
+                if not str(summary_obj.get('summary_text', '')).startswith("[BART summarization error"):
+                    return dict(summary_obj, served_by="bart", **degraded)
+            except Exception as e:
+                print(f"[SummarizationAgent] BART degradation failed: {e}")
+        return {
+            'meeting_id': meeting_id,
+            'summary_text': extractive_summary(transcript),
+            'action_items': keyword_action_items(transcript),
+            'served_by': "extractive",
+            **degraded
+        }
+
+    def stream_summary(self, meeting_id: str, transcript: str, mode=None, latency_budget=None):
+        """
+        Sync generator for incremental output (SSE endpoint, Streamlit).
+        Yields {'token': text} events, then a final {'result': summary_obj} event.
+        'llm' and 'mistral' stream token by token; other modes (and cache hits) arrive in one piece.
+        A completed stream is cached for the same transcript and backend; a Mistral stream decodes greedily,
+        so it is kept apart from summarize()'s beam-search results (served here, and to task extraction,
+        but never by summarize()).
+        latency_budget: as for summarize(); Mistral stops streaming once it passes. Closing the generator
+        (the client disconnected) stops a running Mistral generation.
+        """
+        mode = mode or self.mode
+        api_key = os.environ.get('OPENAI_API_KEY')
+        deadline = Deadline.from_budget(latency_budget)
+        backend, _ = self.resolve_backend(mode, transcript, deadline)
+        prompt_template = {"llm": LLM_SUMMARY_PROMPT, "mistral": MISTRAL_PROMPT_TEMPLATE}.get(backend, "")
+        cache_key = self._cache_key(transcript, backend, backend, prompt_template, streamed=True)
+        if backend == "mistral":
+            cached = self.cached_joint_summary(transcript)
+        else:
+            cached = summary_cache.get(cache_key) if backend == "llm" else None
+        flight_key = "stream:" + self._flight_key(cache_key, deadline)
+        print(f"[SummarizationAgent] stream_summary using backend: {backend}")
+        streams = (backend == "llm" and openai_available() and api_key) or backend == "mistral"
+        leader, shared = single_flight.join(flight_key) if cached is None and streams else (True, None)
+        if cached is not None:
+            summary_obj = dict(cached, meeting_id=meeting_id)
+        elif not leader:
+            # An identical stream is already generating; deliver its result in one piece
+            print(f"[SummarizationAgent] Waiting on in-flight stream ({cache_key[:12]})")
+            summary_obj = dict(shared.result(), meeting_id=meeting_id)
+            self.context.save_summary(meeting_id, summary_obj)
+        elif streams:
+            try:
+                yield from self._stream_as_leader(backend, meeting_id, transcript, cache_key, flight_key, deadline)
+            except BaseException as e:
+                single_flight.fail(flight_key, e)
+                raise
+            # No-op once resolved; releases waiters if the stream ended without a result event
+            single_flight.fail(flight_key, RuntimeError("stream ended without a result"))
+            return
+        else:
+            summary_obj = asyncio.run(SummarizationAgent(mode=backend).summarize(meeting_id, transcript, latency_budget))
+        summary_text = summary_obj.get('summary_text', '')
+        yield {'token': summary_text if isinstance(summary_text, str) else "\n".join(str(s) for s in summary_text)}
+        yield {'result': summary_obj}
+
+    def _stream_as_leader(self, backend, meeting_id, transcript, cache_key, flight_key, deadline=None):
+        if backend == "llm":
+            pieces = []
+            for delta in stream_with_openai(LLM_SUMMARY_PROMPT + f"{transcript}\n"):
+                pieces.append(delta)
+                yield {'token': delta}
+            summary_obj = {'meeting_id': meeting_id, 'summary_text': ''.join(pieces)}
+            summary_cache.set(cache_key, summary_obj)
+            self.context.save_summary(meeting_id, summary_obj)
+            single_flight.resolve(flight_key, summary_obj)
+            yield {'result': summary_obj}
+            return
+        mistral_tokenizer, mistral_model = inference_executor.call(get_mistral_model)
+        for event in stream_with_mistral(mistral_tokenizer, mistral_model, transcript, meeting_id, deadline=deadline):
+            if 'result' in event:
+                # Task extraction after a streamed summary (llm_task_extraction) finds it through
+                # cached_joint_summary instead of running the model again
+                if not event['result'].get('degraded'):
+                    summary_cache.set(cache_key, event['result'])
+                self.context.save_summary(meeting_id, event['result'])
+                single_flight.resolve(flight_key, event['result'])
+            yield event
@@ -1,17 +1,7 @@
 from mcp.core.utils import gen_id
+from mcp.core.jira_client import jira_clients
+from mcp.core.jira_bulk import create_issues_bulk
 import os, json
-with open('mcp/config/credentials.json') as f:
-	creds = json.load(f)
-jira = creds.get("jira", {})
-
-os.environ["JIRA_URL"] = jira.get("base_url", "")
-os.environ["JIRA_USER"] = jira.get("user", "")
-os.environ["JIRA_TOKEN"] = jira.get("token", "")
-os.environ["JIRA_PROJECT"] = jira.get("project", "PROJ")
-try:
-	from jira import JIRA
-except ImportError:
-	JIRA = None
 
 
 class TaskManagerAgent:
@@ -21,11 +11,12 @@ class TaskManagerAgent:
 		"""
 		from datetime import datetime, timedelta
 		due_soon = []
-		if not self.jira:
+		jira = self.jira
+		if not jira:
 			return due_soon
 		jql = f'project={self.jira_project} AND duedate >= now() AND duedate <= {days}d order by duedate asc'
 		try:
-			issues = self.jira.search_issues(jql)
+			issues = jira.search_issues(jql)
 			for issue in issues:
 				due = getattr(issue.fields, 'duedate', None)
 				if due:
@@ -46,10 +37,11 @@ class TaskManagerAgent:
 		# Example assumes you have a board id set as self.jira_board_id
 		from datetime import datetime, timedelta
 		ending_soon = []
-		if not self.jira or not hasattr(self, 'jira_board_id'):
+		jira = self.jira
+		if not jira or not hasattr(self, 'jira_board_id'):
 			return ending_soon
 		try:
-			sprints = self.jira.sprints(self.jira_board_id, state='active')
+			sprints = jira.sprints(self.jira_board_id, state='active')
 			now = datetime.utcnow()
 			soon = now + timedelta(days=days)
 			for sprint in sprints:
@@ -65,21 +57,24 @@ class TaskManagerAgent:
 			print(f"[TaskManagerAgent] Error fetching sprints: {e}")
 		return ending_soon
 
-	def __init__(self):
+	def __init__(self, jira_provider=None):
 		self.tasks_file = os.path.join(os.path.dirname(__file__), '..', 'data', 'tasks', 'tasks.json')
 		os.makedirs(os.path.dirname(self.tasks_file), exist_ok=True)
 		if not os.path.exists(self.tasks_file):
 			with open(self.tasks_file, 'w', encoding='utf-8') as f:
 				json.dump([], f)
-		# Jira config (set these as env vars or config)
-		self.jira_url = os.environ.get("JIRA_URL")
-		self.jira_user = os.environ.get("JIRA_USER")
-		self.jira_token = os.environ.get("JIRA_TOKEN")
-		self.jira_project = os.environ.get("JIRA_PROJECT")
-		self.jira = None
-		print(f"TaskManagerAgent: JIRA_URL={self.jira_url}, JIRA_USER={self.jira_user}, JIRA_PROJECT={self.jira_project}")  
-		if JIRA and self.jira_url and self.jira_user and self.jira_token:
-			self.jira = JIRA(server=self.jira_url, basic_auth=(self.jira_user, self.jira_token))
+		# Jira config (set these as env vars or config); the connection is the process-wide pooled
+		# client, opened on first use and shared by every agent
+		self.jira_provider = jira_provider or jira_clients
+		settings = self.jira_provider.settings()
+		self.jira_url = settings['url']
+		self.jira_user = settings['user']
+		self.jira_project = settings['project']
+		print(f"TaskManagerAgent: JIRA_URL={self.jira_url}, JIRA_USER={self.jira_user}, JIRA_PROJECT={self.jira_project}")
+
+	@property
+	def jira(self):
+		return self.jira_provider.get()
 
 	def extract_and_create_tasks(self, meeting_id: str, summary: dict):
 		from mcp.tools.notification import send_notification
@@ -94,6 +89,8 @@ class TaskManagerAgent:
 			existing = json.load(f)
 
 		MAX_SUMMARY_LEN = 255
+		pending = []
+		jira = self.jira
 
 		for a in raw_actions:
 			if isinstance(a, dict):
@@ -118,7 +115,7 @@ class TaskManagerAgent:
 			tasks.append(t)
 
 			# --- JIRA Integration ---
-			if self.jira:
+			if jira:
 				issue_dict = {
 					'project': {'key': self.jira_project},
 					'summary': jira_title,
@@ -129,24 +126,28 @@ class TaskManagerAgent:
 					issue_dict['assignee'] = {'name': owner}
 				if due:
 					issue_dict['duedate'] = due
+				pending.append((t, issue_dict, jira_title, due))
+
+		# All of the meeting's issues in one bulk request (chunked at Jira's limit)
+		results = create_issues_bulk(jira, [issue_dict for _, issue_dict, _, _ in pending]) if pending else []
+		for (t, _, jira_title, due), result in zip(pending, results):
+			if result['error']:
+				t['jira_error'] = result['error']
+				continue
+			t['jira_issue'] = result['key']
+			# Notify if due date is within 2 days
+			from datetime import datetime, timedelta
+			if due:
 				try:
-					issue = self.jira.create_issue(fields=issue_dict)
-					t['jira_issue'] = issue.key
-					# Notify if due date is within 2 days
-					from datetime import datetime, timedelta
-					if due:
-						try:
-							due_dt = datetime.strptime(due[:10], '%Y-%m-%d')
-							if due_dt - datetime.utcnow() <= timedelta(days=2):
-								send_notification(f"Jira Task '{jira_title}' is due soon: {due}")
-						except Exception as e:
-							print(f"[TaskManagerAgent] Error parsing due date for notification: {e}")
+					due_dt = datetime.strptime(due[:10], '%Y-%m-%d')
+					if due_dt - datetime.utcnow() <= timedelta(days=2):
+						send_notification(f"Jira Task '{jira_title}' is due soon: {due}")
 				except Exception as e:
-					t['jira_error'] = str(e)
+					print(f"[TaskManagerAgent] Error parsing due date for notification: {e}")
 
 		with open(self.tasks_file, 'w', encoding='utf-8') as f:
 			json.dump(existing, f, indent=2)
-		# After creating tasks, trigger due/sprint notifications
-		notify_due_tasks(days=2)
-		notify_sprints_ending_soon(days=2)
+		# After creating tasks, trigger due/sprint notifications (same agent, same connection)
+		notify_due_tasks(days=2, agent=self)
+		notify_sprints_ending_soon(days=2, agent=self)
 		return tasks
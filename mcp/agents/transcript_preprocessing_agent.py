@@ -1,16 +1,25 @@
 """
 Transcript Preprocessing Agent
 - Chunks, cleans, or filters transcripts for downstream processing.
+- Chunks are token-budgeted and cut on speaker-turn / sentence boundaries (see mcp.core.chunking).
 """
+import os
+from mcp.core.chunking import TranscriptChunker
+
+
 class TranscriptPreprocessingAgent:
-    def process(self, transcripts, chunk_size=500):
-        # Example: chunk each transcript into pieces of chunk_size characters
+    def process(self, transcripts, chunk_size=None, tokenizer=None, overlap=0):
+        """
+        chunk_size: max tokens per chunk (default PREPROCESS_CHUNK_TOKENS env, 512)
+        tokenizer: target model tokenizer used for counting; None uses a character-based estimate
+        overlap: tokens of trailing context repeated at the start of the next chunk
+        """
+        chunk_size = chunk_size or int(os.environ.get("PREPROCESS_CHUNK_TOKENS", "512"))
+        chunker = TranscriptChunker(tokenizer, max_tokens=chunk_size, overlap_tokens=overlap)
         processed = []
         for t in transcripts:
             t = t.strip()
             if not t:
                 continue
-            # Simple chunking by character count
-            for i in range(0, len(t), chunk_size):
-                processed.append(t[i:i+chunk_size])
+            processed.extend(chunker.chunks(t))
         return processed
@@ -0,0 +1,160 @@
+"""
+Token-budgeted transcript chunking shared by preprocessing and the summarizers.
+- Token counts come from the target model's tokenizer (a ~4 chars/token estimate when none is given)
+- Chunks are cut on speaker turns first, then sentences, and only split inside a sentence
+  when a single sentence exceeds the budget
+- Optional overlap repeats trailing turns/sentences at the start of the next chunk
+- Chunks are yielded lazily; every chunk is verified against the budget before it is emitted
+"""
+import re
+
+from mcp.core.sentence_tagger import split_sentences
+
+# "Alice: ...", "[00:01:02] Bob: ...", "DEV LEAD - Carol: ..." at the start of a line
+SPEAKER_TURN_RE = re.compile(r"^\s*(?:\[[\d:.]+\]\s*)?[A-Z][\w .'()-]{0,40}:\s")
+APPROX_CHARS_PER_TOKEN = 4
+
+
+def count_tokens(tokenizer, text):
+    if tokenizer is None:
+        return max(1, -(-len(text) // APPROX_CHARS_PER_TOKEN))
+    return len(tokenizer(text, add_special_tokens=False)["input_ids"])
+
+
+def split_turns(text):
+    """Group lines into speaker turns; text without speaker labels yields one block per paragraph."""
+    turns = []
+    current = []
+    for line in text.splitlines():
+        if not line.strip():
+            if current and not SPEAKER_TURN_RE.match(current[0]):
+                turns.append("\n".join(current))
+                current = []
+            continue
+        if SPEAKER_TURN_RE.match(line) and current:
+            turns.append("\n".join(current))
+            current = []
+        current.append(line.strip())
+    if current:
+        turns.append("\n".join(current))
+    return turns
+
+
+class TranscriptChunker:
+    """
+    tokenizer: the target model's tokenizer (None = character estimate)
+    max_tokens: hard budget per chunk, excluding special tokens the caller adds
+    overlap_tokens: at most this many tokens of trailing units repeated in the next chunk
+    """
+
+    def __init__(self, tokenizer=None, max_tokens=512, overlap_tokens=0):
+        if max_tokens <= 0:
+            raise ValueError("max_tokens must be positive")
+        self.tokenizer = tokenizer
+        self.max_tokens = max_tokens
+        self.overlap_tokens = min(overlap_tokens, max_tokens // 2)
+
+    def _count(self, text):
+        return count_tokens(self.tokenizer, text)
+
+    def _hard_split(self, text):
+        """Split a single over-long sentence into pieces that each fit the budget."""
+        if self.tokenizer is None:
+            # The estimate is character based, so pack words up to the character budget exactly
+            max_chars = self.max_tokens * APPROX_CHARS_PER_TOKEN
+            pieces = []
+            current = ""
+            for word in text.split():
+                while len(word) > max_chars:
+                    if current:
+                        pieces.append(current)
+                        current = ""
+                    pieces.append(word[:max_chars])
+                    word = word[max_chars:]
+                if current and len(current) + 1 + len(word) > max_chars:
+                    pieces.append(current)
+                    current = ""
+                current = f"{current} {word}" if current else word
+            if current:
+                pieces.append(current)
+            return pieces
+        ids = self.tokenizer(text, add_special_tokens=False)["input_ids"]
+        windows = (
+            self.tokenizer.decode(ids[i:i + self.max_tokens], skip_special_tokens=True).strip()
+            for i in range(0, len(ids), self.max_tokens)
+        )
+        return [piece for window in windows for piece in self._fit(window)]
+
+    def _fit(self, text):
+        """Yield text, halved until each piece fits (decoded windows can re-tokenize longer)."""
+        if not text:
+            return
+        if self._count(text) <= self.max_tokens or len(text) <= 1:
+            yield text
+            return
+        middle = len(text) // 2
+        cut = text.rfind(" ", 0, middle)
+        cut = cut if cut > 0 else middle
+        yield from self._fit(text[:cut].strip())
+        yield from self._fit(text[cut:].strip())
+
+    def _units(self, text):
+        """Yield (separator, text, tokens) units no larger than the budget, in transcript order."""
+        for turn in split_turns(text):
+            tokens = self._count(turn)
+            if tokens <= self.max_tokens:
+                yield "\n", turn, tokens
+                continue
+            sep = "\n"
+            for sentence in split_sentences(turn, keep_periods=True):
+                tokens = self._count(sentence)
+                pieces = [(sentence, tokens)] if tokens <= self.max_tokens else [(p, self._count(p)) for p in self._hard_split(sentence)]
+                for piece, piece_tokens in pieces:
+                    yield sep, piece, piece_tokens
+                    sep = " "
+
+    @staticmethod
+    def _join(units):
+        return "".join((sep if i else "") + text for i, (sep, text, _) in enumerate(units))
+
+    def chunks(self, text):
+        """Lazily yield chunk strings that each fit max_tokens."""
+        current = []
+        total = 0
+        for unit in self._units(text or ""):
+            if current and total + unit[2] > self.max_tokens:
+                yield from self._emit(current)
+                current = self._overlap(current)
+                while current and sum(u[2] for u in current) + unit[2] > self.max_tokens:
+                    current.pop(0)
+                total = sum(u[2] for u in current)
+            current.append(unit)
+            total += unit[2]
+        if current:
+            yield from self._emit(current)
+
+    def _emit(self, units):
+        # Per-unit counts can differ from the joined text by a token at each boundary; verify and
+        # move trailing units into their own chunk until the joined text fits.
+        units = list(units)
+        carry = []
+        while len(units) > 1 and self._count(self._join(units)) > self.max_tokens:
+            carry.insert(0, units.pop())
+        joined = self._join(units)
+        if len(units) == 1 and self._count(joined) > self.max_tokens:
+            # One unit alone is over budget: split inside it rather than let the model truncate its tail
+            yield from self._hard_split(joined)
+        else:
+            yield joined
+        if carry:
+            yield from self._emit(carry)
+
+    def _overlap(self, units):
+        kept = []
+        total = 0
+        for unit in reversed(units):
+            if total + unit[2] > self.overlap_tokens:
+                break
+            kept.insert(0, unit)
+            total += unit[2]
+        return kept
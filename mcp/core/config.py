@@ -0,0 +1,66 @@
+"""
+Process-wide configuration, loaded once on first use instead of at import.
+- credentials.json is read lazily (the Google Drive copy first, then mcp/config) and cached
+- export_credentials_env() fills OPENAI_API_KEY and JIRA_* from it for code that reads the
+  environment; values already set in the environment take precedence
+"""
+import functools
+import json
+import os
+import pathlib
+import threading
+
+CREDENTIALS_PATHS = (
+    pathlib.Path('/content/drive/MyDrive/credentials.json'),
+    pathlib.Path(__file__).resolve().parent.parent / 'config' / 'credentials.json'
+)
+
+_export_lock = threading.Lock()
+_exported = False
+
+
+@functools.lru_cache(maxsize=None)
+def load_credentials():
+    """Parsed credentials.json (cached); {} when no file is found."""
+    for path in CREDENTIALS_PATHS:
+        if path.exists():
+            print(f"[Config] Loading credentials from {path}")
+            with open(path, 'r') as f:
+                return json.load(f)
+    print("[Config] No credentials.json found in Google Drive or local folder.")
+    return {}
+
+
+def jira_settings():
+    jira = load_credentials().get("jira", {})
+    return {
+        'url': os.environ.get("JIRA_URL") or jira.get("base_url", ""),
+        'user': os.environ.get("JIRA_USER") or jira.get("user", ""),
+        'token': os.environ.get("JIRA_TOKEN") or jira.get("token", ""),
+        'project': os.environ.get("JIRA_PROJECT") or jira.get("project", "PROJ")
+    }
+
+
+def openai_api_key():
+    return os.environ.get("OPENAI_API_KEY") or load_credentials().get("openai_api_key", "")
+
+
+def export_credentials_env():
+    """Populate unset OPENAI_API_KEY / JIRA_* variables from credentials.json, once per process."""
+    global _exported
+    if _exported:
+        return
+    with _export_lock:
+        if _exported:
+            return
+        jira = jira_settings()
+        for name, value in (
+            ("OPENAI_API_KEY", openai_api_key()),
+            ("JIRA_URL", jira['url']),
+            ("JIRA_USER", jira['user']),
+            ("JIRA_TOKEN", jira['token']),
+            ("JIRA_PROJECT", jira['project'])
+        ):
+            if not os.environ.get(name):
+                os.environ[name] = value
+        _exported = True
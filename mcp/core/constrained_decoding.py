@@ -0,0 +1,376 @@
+"""
+JSON-schema constrained decoding for local models.
+- A small JSON-Schema subset (object with fixed properties, array, string, maxItems, maxLength)
+  is compiled into a character-level pushdown matcher
+- JSONSchemaLogitsProcessor masks every token that cannot continue a document matching the schema,
+  so output always parses and no tokens are spent on prose outside the object
+- Allowed tokens are found by walking a trie of the vocabulary's surface strings; plain string
+  content is allowed with one vectorized mask instead of a per-token check
+- Given max_new_tokens, the processor switches to closing the document (shortest completion) in
+  time, so a long output still ends as a complete object instead of being truncated mid-string
+"""
+import copy
+import threading
+import weakref
+
+MAX_WHITESPACE_RUN = 16
+_ALLOWED_CACHE_SIZE = 4096
+_WHITESPACE = ' \n\t\r'
+_ESCAPES = '"\\/bfnrtu'
+_HEX_DIGITS = '0123456789abcdefABCDEF'
+
+
+def _string_field(max_length=200):
+    return {"type": "string", "maxLength": max_length}
+
+
+def _record_list(fields, max_items=10):
+    return {
+        "type": "array",
+        "maxItems": max_items,
+        "items": {"type": "object", "properties": {f: _string_field() for f in fields}}
+    }
+
+
+# Mirrors the JSON shape requested by the summarization prompts
+SUMMARY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "summary": {"type": "array", "maxItems": 8, "items": _string_field(300)},
+        "decisions": _record_list(("decision", "reason", "made_by")),
+        "action_items": _record_list(("task", "description", "owner", "deadline")),
+        "risks": _record_list(("risk", "impact", "raised_by"))
+    }
+}
+
+
+class SchemaMatcher:
+    """
+    Character-level matcher for documents of one schema.
+    States are hashable tuples (stack, whitespace_run) and advance() is pure, so beam rows
+    and memo tables can share them. Properties are emitted in schema order, all required.
+    """
+
+    def __init__(self, schema):
+        self.nodes = []
+        self.root = self._compile(schema)
+        self.initial_state = ((('value', self.root),), 0)
+
+    def _compile(self, schema):
+        kind = schema.get("type")
+        idx = len(self.nodes)
+        self.nodes.append(None)
+        if kind == "string":
+            self.nodes[idx] = ('string', schema.get("maxLength"))
+        elif kind == "array":
+            self.nodes[idx] = ('array', self._compile(schema["items"]), schema.get("maxItems"))
+        elif kind == "object":
+            props = tuple((key, self._compile(sub)) for key, sub in schema.get("properties", {}).items())
+            self.nodes[idx] = ('object', props)
+        else:
+            raise ValueError(f"Unsupported schema type for constrained decoding: {kind}")
+        return idx
+
+    @staticmethod
+    def is_complete(state):
+        return state is not None and not state[0]
+
+    @staticmethod
+    def string_budget(state):
+        """Characters of plain content still allowed if the state is inside a string, else None."""
+        stack = state[0]
+        if stack and stack[-1][0] == 'str' and not stack[-1][1]:
+            limit = stack[-1][3]
+            return float('inf') if limit is None else limit - stack[-1][2]
+        return None
+
+    def _open_value(self, stack, node_idx, c):
+        node = self.nodes[node_idx]
+        if node[0] == 'string' and c == '"':
+            return stack + (('str', False, 0, node[1]),)
+        if node[0] == 'array' and c == '[':
+            return stack + (('arr', node[1], 0, node[2]),)
+        if node[0] == 'object' and c == '{':
+            frames = []
+            for i, (key, sub) in enumerate(node[1]):
+                if i:
+                    frames.append(('lit', ',', 0))
+                frames.append(('lit', f'"{key}":', 0))
+                frames.append(('value', sub))
+            frames.append(('lit', '}', 0))
+            return stack + tuple(reversed(frames))
+        return None
+
+    def advance_char(self, state, c):
+        stack, ws = state
+        if not stack:
+            return None
+        top = stack[-1]
+        kind = top[0]
+        rest = stack[:-1]
+        if kind == 'str':
+            _, escape, used, limit = top
+            if escape:
+                if c not in _ESCAPES:
+                    return None
+                if c == 'u':
+                    return (rest + (('hex', 4, used, limit),), 0)
+                return (rest + (('str', False, used + 1, limit),), 0)
+            if c == '"':
+                return (rest, 0)
+            if ord(c) < 0x20 or (limit is not None and used >= limit):
+                return None
+            return (rest + (('str', c == '\\', used + (c != '\\'), limit),), 0)
+        if kind == 'hex':
+            if c not in _HEX_DIGITS:
+                return None
+            _, left, used, limit = top
+            frame = ('hex', left - 1, used, limit) if left > 1 else ('str', False, used + 1, limit)
+            return (rest + (frame,), 0)
+        if c in _WHITESPACE and (kind in ('value', 'arr') or (kind == 'lit' and top[2] == 0)):
+            return (stack, ws + 1) if ws < MAX_WHITESPACE_RUN else None
+        if kind == 'lit':
+            _, text, pos = top
+            if c != text[pos]:
+                return None
+            return (rest if pos + 1 == len(text) else rest + (('lit', text, pos + 1),), 0)
+        if kind == 'value':
+            opened = self._open_value(rest, top[1], c)
+            return (opened, 0) if opened is not None else None
+        if kind == 'arr':
+            _, item, count, max_items = top
+            if c == ']':
+                return (rest, 0)
+            if count == 0:
+                # First element: no separator, the character must open an item
+                opened = self._open_value(rest + (('arr', item, 1, max_items),), item, c)
+                return (opened, 0) if opened is not None else None
+            if c == ',' and (max_items is None or count < max_items):
+                return (rest + (('arr', item, count + 1, max_items), ('value', item)), 0)
+        return None
+
+    def minimal_value(self, node_idx):
+        """Shortest text of a value of this node: empty strings and arrays, objects with minimal properties."""
+        node = self.nodes[node_idx]
+        if node[0] == 'string':
+            return '""'
+        if node[0] == 'array':
+            return '[]'
+        return '{' + ','.join(f'"{key}":{self.minimal_value(sub)}' for key, sub in node[1]) + '}'
+
+    def closing_text(self, state):
+        """Shortest text that completes a document from state ('' once it is complete)."""
+        out = []
+        for frame in reversed(state[0]):
+            kind = frame[0]
+            if kind == 'str':
+                out.append('n"' if frame[1] else '"')
+            elif kind == 'hex':
+                out.append('0' * frame[1] + '"')
+            elif kind == 'lit':
+                out.append(frame[1][frame[2]:])
+            elif kind == 'value':
+                out.append(self.minimal_value(frame[1]))
+            else:
+                out.append(']')
+        return ''.join(out)
+
+    def advance(self, state, text):
+        for c in text:
+            state = self.advance_char(state, c)
+            if state is None:
+                return None
+        return state
+
+
+class _VocabIndex:
+    """Surface strings of a tokenizer's vocabulary, arranged for fast allowed-token lookup."""
+
+    def __init__(self, tokenizer):
+        self.surfaces = _token_surfaces(tokenizer)
+        self.trie = self._build_trie(range(len(self.surfaces)))
+        plain, special = [], []
+        for i, s in enumerate(self.surfaces):
+            if not s:
+                continue
+            if any(c in '"\\' or ord(c) < 0x20 for c in s):
+                special.append(i)
+            else:
+                plain.append(i)
+        self.plain_ids = plain
+        self.plain_lengths = [len(self.surfaces[i]) for i in plain]
+        # Tokens that can end or escape a string; the only ones that need a walk inside string content
+        self.special_trie = self._build_trie(special)
+        self._tensors = {}
+
+    def _build_trie(self, ids):
+        root = ({}, [])
+        for i in ids:
+            s = self.surfaces[i]
+            if not s:
+                continue
+            node = root
+            for c in s:
+                node = node[0].setdefault(c, ({}, []))
+            node[1].append(i)
+        return root
+
+    def plain_tensors(self, device):
+        import torch
+        key = str(device)
+        if key not in self._tensors:
+            self._tensors[key] = (
+                torch.tensor(self.plain_ids, dtype=torch.long, device=device),
+                torch.tensor(self.plain_lengths, dtype=torch.long, device=device)
+            )
+        return self._tensors[key]
+
+
+def _token_surfaces(tokenizer):
+    """
+    Text each token contributes when it follows other text. Decoding a token after an anchor
+    keeps SentencePiece leading spaces that a lone decode() would strip.
+    Special tokens and partial UTF-8 byte tokens map to '' and are never allowed.
+    """
+    anchor = tokenizer.encode("a", add_special_tokens=False)[-1]
+    anchor_text = tokenizer.decode([anchor])
+    special = set(tokenizer.all_special_ids)
+    decoded = tokenizer.batch_decode([[anchor, i] for i in range(len(tokenizer))])
+    surfaces = []
+    for i, text in enumerate(decoded):
+        s = text[len(anchor_text):] if text.startswith(anchor_text) else ''
+        surfaces.append('' if i in special or '\ufffd' in s else s)
+    return surfaces
+
+
+_vocab_indexes = weakref.WeakKeyDictionary()
+_vocab_lock = threading.Lock()
+
+
+def vocab_index(tokenizer):
+    """Per-tokenizer vocabulary index, built once (a full vocab decode) and reused."""
+    with _vocab_lock:
+        index = _vocab_indexes.get(tokenizer)
+        if index is None:
+            index = _VocabIndex(tokenizer)
+            _vocab_indexes[tokenizer] = index
+        return index
+
+
+class JSONSchemaLogitsProcessor:
+    """
+    Logits processor for model.generate that only admits tokens continuing a schema-valid document.
+    Matcher state is keyed by each row's token history, like JSONObjectStoppingCriteria, so beam
+    reordering looks up the parent sequence. Once the document is complete only EOS is allowed.
+    max_new_tokens: the generate() limit. Once the tokens left barely cover the closing text (plus
+    the most one token can add to it), rows may only emit the closing text, so they end complete.
+    """
+
+    def __init__(self, tokenizer, schema=None, max_new_tokens=None):
+        self.matcher = SchemaMatcher(schema or SUMMARY_SCHEMA)
+        self.index = vocab_index(tokenizer)
+        self.eos_token_id = tokenizer.eos_token_id
+        self.max_new_tokens = max_new_tokens
+        # A ',' in an array adds a minimal item to the closing text; an escape adds up to 5 characters
+        self.reserve = max(len(self.matcher.minimal_value(i)) for i in range(len(self.matcher.nodes))) + 5
+        self._prompt_len = None
+        self._states = {}
+        self._allowed = {}
+
+    def fresh(self):
+        """Same constraint with no per-generation state (prompt length, row states), for another input."""
+        clone = copy.copy(self)
+        clone._prompt_len = None
+        clone._states = {}
+        return clone
+
+    def _walk(self, trie, state, out):
+        pending = [(trie, state)]
+        while pending:
+            node, s = pending.pop()
+            for c, child in node[0].items():
+                nxt = self.matcher.advance_char(s, c)
+                if nxt is not None:
+                    out.extend(child[1])
+                    pending.append((child, nxt))
+        return out
+
+    def allowed_ids(self, state):
+        """(explicit token ids, plain-string budget or None) allowed after state."""
+        cached = self._allowed.get(state)
+        if cached is not None:
+            return cached
+        if self.matcher.is_complete(state):
+            result = ([self.eos_token_id], None)
+        else:
+            budget = self.matcher.string_budget(state)
+            trie = self.index.trie if budget is None else self.index.special_trie
+            result = (self._walk(trie, state, []), budget)
+        if len(self._allowed) >= _ALLOWED_CACHE_SIZE:
+            self._allowed.clear()
+        self._allowed[state] = result
+        return result
+
+    def closing_ids(self, state):
+        """Token ids whose surface starts the closing text of state: each one brings the end closer."""
+        key = ('close', state)
+        cached = self._allowed.get(key)
+        if cached is not None:
+            return cached
+        ids = []
+        node = self.index.trie
+        for c in self.matcher.closing_text(state):
+            node = node[0].get(c)
+            if node is None:
+                break
+            ids.extend(node[1])
+        if len(self._allowed) >= _ALLOWED_CACHE_SIZE:
+            self._allowed.clear()
+        self._allowed[key] = ids
+        return ids
+
+    def row_allowed(self, state, remaining=None):
+        """
+        allowed_ids(state), or only the closing tokens once the remaining tokens (this one included)
+        are needed to close the document.
+        """
+        if remaining is not None and not self.matcher.is_complete(state):
+            if remaining <= len(self.matcher.closing_text(state)) + self.reserve:
+                closing = self.closing_ids(state)
+                if closing:
+                    return closing, None
+        return self.allowed_ids(state)
+
+    def _row_state(self, row):
+        if len(row) == self._prompt_len:
+            return self.matcher.initial_state
+        parent = self._states.get(row[:-1].tobytes())
+        if parent is None:
+            return None
+        token = int(row[-1])
+        surface = self.index.surfaces[token] if token < len(self.index.surfaces) else ''
+        return self.matcher.advance(parent, surface) if surface else None
+
+    def __call__(self, input_ids, scores, **kwargs):
+        import torch
+        if self._prompt_len is None:
+            self._prompt_len = input_ids.shape[1]
+        remaining = None if self.max_new_tokens is None else self.max_new_tokens - (input_ids.shape[1] - self._prompt_len)
+        rows = input_ids.detach().cpu().numpy()
+        states = {}
+        for r, row in enumerate(rows):
+            state = self._row_state(row)
+            if state is None:
+                # Finished (padded) rows or tokens we could not follow: leave unconstrained
+                continue
+            states[row.tobytes()] = state
+            ids, budget = self.row_allowed(state, remaining)
+            allowed = torch.zeros(scores.shape[-1], dtype=torch.bool, device=scores.device)
+            if ids:
+                allowed[torch.tensor(ids, dtype=torch.long, device=scores.device)] = True
+            if budget:
+                plain_ids, plain_lengths = self.index.plain_tensors(scores.device)
+                allowed[plain_ids[plain_lengths <= budget]] = True
+            scores[r] = scores[r].masked_fill(~allowed, float('-inf'))
+        self._states = states
+        return scores
@@ -27,3 +27,24 @@ class ContextHandler:
 			return None
 		with open(path, 'r', encoding='utf-8') as f:
 			return json.load(f)
+
+	def save_session(self, meeting_id: str, state: dict):
+		"""Persist a rolling summarization session (written atomically: updates can race with readers)."""
+		path = os.path.join(self.base, 'sessions', f'{meeting_id}.json')
+		os.makedirs(os.path.dirname(path), exist_ok=True)
+		tmp_path = f'{path}.tmp'
+		with open(tmp_path, 'w', encoding='utf-8') as f:
+			json.dump(state, f, indent=2)
+		os.replace(tmp_path, path)
+
+	def get_session(self, meeting_id: str) -> Optional[dict]:
+		path = os.path.join(self.base, 'sessions', f'{meeting_id}.json')
+		if not os.path.exists(path):
+			return None
+		with open(path, 'r', encoding='utf-8') as f:
+			return json.load(f)
+
+	def delete_session(self, meeting_id: str):
+		path = os.path.join(self.base, 'sessions', f'{meeting_id}.json')
+		if os.path.exists(path):
+			os.remove(path)
@@ -0,0 +1,82 @@
+"""
+Per-request deadlines for generation.
+- Deadline: a monotonic point in time shared by every stage of one request
+- DeadlineStoppingCriteria: ends model.generate() for every row once the deadline passes,
+  so a slow beam search returns what it has instead of holding the request open
+- CancelledStoppingCriteria: ends model.generate() once an event is set (e.g. a streaming client left)
+- Callers check `expired` between stages and degrade to a faster path (see SummarizationAgent)
+"""
+import asyncio
+import concurrent.futures
+import os
+import time
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+# What a missed deadline looks like from asyncio.wait_for, Future.result(timeout) and Deadline.check
+# (distinct classes before Python 3.11)
+TIMEOUT_ERRORS = (TimeoutError, asyncio.TimeoutError, concurrent.futures.TimeoutError)
+
+
+def default_budget():
+    """
+    SUMMARY_DEADLINE_SECONDS: latency budget of a request that names none (0, the default: no deadline).
+    The one default for both the 'auto' router and the generation deadline, so a deadline applies
+    only when the caller or the operator sets one.
+    """
+    return float(os.environ.get("SUMMARY_DEADLINE_SECONDS", "0"))
+
+
+class Deadline:
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.started = time.monotonic()
+        self.at = self.started + seconds
+
+    @classmethod
+    def from_budget(cls, seconds=None):
+        """Deadline for a request: the caller's budget, else default_budget() (0 disables)."""
+        seconds = seconds if seconds is not None else default_budget()
+        return cls(seconds) if seconds and seconds > 0 else None
+
+    def remaining(self):
+        return max(0.0, self.at - time.monotonic())
+
+    @property
+    def expired(self):
+        return time.monotonic() >= self.at
+
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    def check(self, stage=""):
+        if self.expired:
+            raise DeadlineExceeded(f"Deadline of {self.seconds:.1f}s exceeded{' before ' + stage if stage else ''}")
+
+
+class DeadlineStoppingCriteria:
+    """Stopping criterion for model.generate: stops all rows once the deadline has passed."""
+
+    def __init__(self, deadline):
+        self.deadline = deadline
+        self.triggered = False
+
+    def __call__(self, input_ids, scores=None, **kwargs):
+        import torch
+        if self.deadline.expired:
+            self.triggered = True
+        return torch.full((input_ids.shape[0],), self.triggered, dtype=torch.bool, device=input_ids.device)
+
+
+class CancelledStoppingCriteria:
+    """Stopping criterion for model.generate: stops all rows once the event is set."""
+
+    def __init__(self, event):
+        self.event = event
+
+    def __call__(self, input_ids, scores=None, **kwargs):
+        import torch
+        return torch.full((input_ids.shape[0],), self.event.is_set(), dtype=torch.bool, device=input_ids.device)
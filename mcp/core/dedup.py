@@ -0,0 +1,129 @@
+"""
+Near-duplicate clustering for summary bullets and action items merged across chunks.
+- MinHash signatures over character 4-gram shingles; LSH banding finds candidate pairs
+  without comparing every pair, and candidates are confirmed by exact Jaccard similarity
+- Clusters keep the most informative text and merge owners / deadlines from all members;
+  free-text fields (description, reason, impact) keep one representative, the longest
+"""
+import os
+import random
+import re
+import zlib
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+# Prose fields of merged records: joining them reads badly, so the longest value is kept
+LONGEST_FIELDS = frozenset({'description', 'reason', 'impact'})
+
+
+def normalize(text):
+    return ' '.join(re.sub(r"[^\w\s]", " ", str(text).lower()).split())
+
+
+def shingles(text, k=4):
+    text = normalize(text)
+    if len(text) <= k:
+        return {text} if text else set()
+    return {text[i:i + k] for i in range(len(text) - k + 1)}
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class MinHashLSH:
+    """
+    bands x rows hash functions; two texts become candidates when all rows of any band agree.
+    With 21 bands of 3 rows, pairs at Jaccard 0.5 are found ~94% of the time.
+    """
+
+    def __init__(self, threshold=0.5, bands=21, rows=3, seed=1):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = rows
+        rng = random.Random(seed)
+        self._perms = [(rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME)) for _ in range(bands * rows)]
+
+    def signature(self, shingle_set):
+        hashes = [zlib.crc32(s.encode('utf-8')) for s in shingle_set] or [0]
+        return [min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes) for a, b in self._perms]
+
+    def cluster(self, texts):
+        """Group indices of near-duplicate texts; clusters are ordered by first occurrence."""
+        sets = [shingles(t) for t in texts]
+        parent = list(range(len(texts)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        buckets = {}
+        for i, s in enumerate(sets):
+            if not s:
+                continue
+            sig = self.signature(s)
+            for band in range(self.bands):
+                key = (band, tuple(sig[band * self.rows:(band + 1) * self.rows]))
+                for j in buckets.setdefault(key, []):
+                    if find(i) != find(j) and jaccard(sets[i], sets[j]) >= self.threshold:
+                        parent[find(i)] = find(j)
+                buckets[key].append(i)
+        clusters = {}
+        for i in range(len(texts)):
+            clusters.setdefault(find(i), []).append(i)
+        return sorted(clusters.values(), key=lambda c: c[0])
+
+
+def _merge_values(values):
+    out = []
+    seen = set()
+    for v in values:
+        key = normalize(v)
+        if key and key not in seen:
+            seen.add(key)
+            out.append(str(v).strip())
+    return ', '.join(out)
+
+
+def dedupe_texts(texts, threshold=None):
+    """Keep one (the longest) text per near-duplicate cluster, in first-occurrence order."""
+    texts = [t for t in texts if t]
+    index = MinHashLSH(threshold or default_threshold())
+    return [max((texts[i] for i in c), key=len) for c in index.cluster([str(t) for t in texts])]
+
+
+def dedupe_records(items, key_field, threshold=None):
+    """
+    Cluster dict records (e.g. action items) on key_field and merge each cluster into one record:
+    the longest key_field text (plain-string members count as key_field texts), the longest value
+    of LONGEST_FIELDS, and the distinct values of every other field.
+    A cluster of plain strings only keeps its longest string.
+    """
+    items = [i for i in items if i]
+    texts = [i.get(key_field, '') if isinstance(i, dict) else str(i) for i in items]
+    index = MinHashLSH(threshold or default_threshold())
+    merged = []
+    for cluster in index.cluster(texts):
+        members = [items[i] for i in cluster]
+        records = [m for m in members if isinstance(m, dict)]
+        if not records:
+            merged.append(max(members, key=len))
+            continue
+        record = dict(max(records, key=lambda r: len(str(r.get(key_field, '')))))
+        record[key_field] = max((str(m.get(key_field, '')) if isinstance(m, dict) else str(m) for m in members), key=len)
+        for field in sorted({f for r in records for f in r} - {key_field}):
+            if field in LONGEST_FIELDS:
+                record[field] = max((str(r.get(field) or '').strip() for r in records), key=len)
+            else:
+                record[field] = _merge_values(r.get(field, '') for r in records)
+        merged.append(record)
+    return merged
+
+
+def default_threshold():
+    """Jaccard similarity above which two items count as the same (DEDUP_THRESHOLD env, 0.5)."""
+    return float(os.environ.get("DEDUP_THRESHOLD", "0.5"))
@@ -0,0 +1,136 @@
+"""
+Extractive pre-filter: keep the most central sentences of a transcript within a token budget.
+- Sentences are scored with TextRank over a TF-IDF cosine-similarity graph (numpy, vectorized)
+- The top sentences are kept up to the budget, then restored to transcript order with their
+  speaker labels, so abstractive models see a shorter but still well-formed transcript
+"""
+import math
+import re
+from collections import Counter
+
+from mcp.core.chunking import SPEAKER_TURN_RE, count_tokens, split_turns
+from mcp.core.sentence_tagger import split_sentences
+
+_WORD_RE = re.compile(r"[a-z0-9']+")
+# Filler that carries no content; dropped from the TF-IDF vocabulary
+STOP_WORDS = frozenset(
+    "a an and are as at be but by for from has have i if in is it its of on or so that the this "
+    "to was we were will with you yes yeah ok okay um uh like just right well oh hi hello thanks "
+    "thank sure also do did does not no our your they them he she me my can could would should".split()
+)
+
+
+def _sentences(text):
+    """[(speaker_label or '', sentence, turn_index)] in transcript order."""
+    out = []
+    for turn_index, turn in enumerate(split_turns(text)):
+        match = SPEAKER_TURN_RE.match(turn)
+        speaker = turn[:match.end()].strip() if match else ''
+        body = turn[match.end():] if match else turn
+        for sentence in split_sentences(" ".join(body.split()), keep_periods=True):
+            out.append((speaker, sentence, turn_index))
+    return out
+
+
+def textrank_scores(sentences, damping=0.85, iterations=50, tol=1e-6):
+    """TextRank centrality of each sentence over its TF-IDF cosine-similarity graph."""
+    import numpy as np
+    docs = [[w for w in _WORD_RE.findall(s.lower()) if w not in STOP_WORDS] for s in sentences]
+    vocab = {w: i for i, w in enumerate(sorted({w for d in docs for w in d}))}
+    n = len(sentences)
+    if n == 0:
+        return np.zeros(0)
+    if not vocab:
+        return np.full(n, 1.0 / n)
+    tf = np.zeros((n, len(vocab)))
+    for row, doc in enumerate(docs):
+        for w, c in Counter(doc).items():
+            tf[row, vocab[w]] = 1.0 + math.log(c)
+    df = (tf > 0).sum(axis=0)
+    tfidf = tf * (np.log((1.0 + n) / (1.0 + df)) + 1.0)
+    norms = np.linalg.norm(tfidf, axis=1, keepdims=True)
+    tfidf = np.divide(tfidf, norms, out=np.zeros_like(tfidf), where=norms > 0)
+    sim = tfidf @ tfidf.T
+    np.fill_diagonal(sim, 0.0)
+    out_weight = sim.sum(axis=1, keepdims=True)
+    # Sentences with no similar neighbour link uniformly, so the walk stays stochastic
+    transition = np.divide(sim, out_weight, out=np.full_like(sim, 1.0 / n), where=out_weight > 0)
+    scores = np.full(n, 1.0 / n)
+    for _ in range(iterations):
+        updated = (1.0 - damping) / n + damping * (transition.T @ scores)
+        if np.abs(updated - scores).sum() < tol:
+            scores = updated
+            break
+        scores = updated
+    return scores
+
+
+def _assemble(items, keep):
+    """Kept sentences in transcript order; consecutive kept sentences of one turn share a speaker line."""
+    lines = []
+    last_turn = None
+    for i in sorted(keep):
+        speaker, sentence, turn = items[i]
+        if lines and turn == last_turn:
+            lines[-1] += " " + sentence
+        else:
+            lines.append(f"{speaker} {sentence}" if speaker else sentence)
+        last_turn = turn
+    return "\n".join(lines)
+
+
+def extractive_filter(text, token_budget, tokenizer=None):
+    """
+    Returns (filtered_text, report). Text already within the budget is returned unchanged.
+    report: input/output tokens, compression_ratio (output/input), sentences kept/total.
+    """
+    input_tokens = count_tokens(tokenizer, text) if text else 0
+    items = _sentences(text or '')
+    report = {
+        'input_tokens': input_tokens,
+        'output_tokens': input_tokens,
+        'compression_ratio': 1.0,
+        'sentences_total': len(items),
+        'sentences_kept': len(items)
+    }
+    if input_tokens <= token_budget or len(items) < 2:
+        return text, report
+    scores = textrank_scores([s for _, s, _ in items])
+    lengths = [count_tokens(tokenizer, s) for _, s, _ in items]
+    keep = []
+    used = 0
+    for i in sorted(range(len(items)), key=lambda i: -scores[i]):
+        if used + lengths[i] <= token_budget:
+            keep.append(i)
+            used += lengths[i]
+    filtered = _assemble(items, keep)
+    output_tokens = count_tokens(tokenizer, filtered)
+    # Speaker labels and line breaks are not in the per-sentence counts: drop the least central
+    # kept sentences until the assembled text fits
+    while len(keep) > 1 and output_tokens > token_budget:
+        keep.pop()
+        filtered = _assemble(items, keep)
+        output_tokens = count_tokens(tokenizer, filtered)
+    report.update({
+        'output_tokens': output_tokens,
+        'compression_ratio': output_tokens / input_tokens if input_tokens else 1.0,
+        'sentences_kept': len(keep)
+    })
+    return filtered, report
+
+
+def extractive_summary(text, max_sentences=5):
+    """
+    The max_sentences most central sentences, in transcript order, as summary bullets.
+    Cheap enough to serve as the last-resort summary when a model misses its deadline;
+    without numpy, the leading sentences are used.
+    """
+    items = _sentences(text or '')
+    if len(items) <= max_sentences:
+        return [s for _, s, _ in items]
+    try:
+        scores = textrank_scores([s for _, s, _ in items])
+        keep = sorted(sorted(range(len(items)), key=lambda i: -scores[i])[:max_sentences])
+    except ImportError:
+        keep = range(max_sentences)
+    return [items[i][1] for i in keep]
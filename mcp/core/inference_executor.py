@@ -0,0 +1,93 @@
+"""
+Bounded executor for blocking model inference.
+- Runs generate() calls on a dedicated thread pool so they never block the event loop
+- Jobs are served FIFO; at most INFERENCE_WORKERS run at once and INFERENCE_QUEUE_SIZE wait
+- When the queue is full, submissions fail fast with InferenceBusyError instead of piling up
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class InferenceBusyError(RuntimeError):
+    pass
+
+
+class InferenceExecutor:
+    def __init__(self, max_workers=None, max_queue=None):
+        self.max_workers = max_workers or int(os.environ.get("INFERENCE_WORKERS", "1"))
+        self.max_queue = max_queue if max_queue is not None else int(os.environ.get("INFERENCE_QUEUE_SIZE", "16"))
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="inference")
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.pending = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def in_worker(self):
+        return getattr(self._local, "active", False)
+
+    def _wrap(self, fn, args, kwargs):
+        def job():
+            with self._lock:
+                self.running += 1
+            self._local.active = True
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._local.active = False
+                with self._lock:
+                    self.running -= 1
+                    self.completed += 1
+        return job
+
+    def _release(self, future):
+        # Runs on completion and also when a queued job is cancelled before it started
+        with self._lock:
+            self.pending -= 1
+
+    def submit(self, fn, *args, **kwargs):
+        """Queue fn(*args, **kwargs); returns a concurrent.futures.Future."""
+        with self._lock:
+            if self.pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise InferenceBusyError(f"Inference queue full ({self.pending} jobs pending)")
+            self.pending += 1
+        try:
+            future = self._pool.submit(self._wrap(fn, args, kwargs))
+        except Exception:
+            with self._lock:
+                self.pending -= 1
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    async def run(self, fn, *args, **kwargs):
+        """Await fn(*args, **kwargs) on the inference pool without blocking the event loop."""
+        if self.in_worker():
+            return fn(*args, **kwargs)
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def call(self, fn, *args, **kwargs):
+        """Blocking variant for sync callers; still bounded by the same pool."""
+        if self.in_worker():
+            # Already on an inference thread: run inline rather than deadlocking the pool
+            return fn(*args, **kwargs)
+        return self.submit(fn, *args, **kwargs).result()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'workers': self.max_workers,
+                'max_queue': self.max_queue,
+                'running': self.running,
+                'queued': self.pending - self.running,
+                'completed': self.completed,
+                'rejected': self.rejected
+            }
+
+
+# Shared instance for the whole process
+inference_executor = InferenceExecutor()
@@ -0,0 +1,46 @@
+"""
+Bulk Jira issue creation.
+- create_issues_bulk: one POST /rest/api/2/issue/bulk (JIRA.create_issues) per chunk of at most
+  JIRA_BULK_MAX_ISSUES issues (Jira's server-side limit, 50 by default) instead of one create_issue
+  round-trip per task
+- Results come back in input order, so per-item errors map onto the task records that produced them;
+  a chunk that fails as a whole (network, auth, timeout) marks every item in it; only a broken
+  connection also drops the shared client so the next call reconnects
+"""
+import os
+
+from mcp.core.jira_client import is_connection_error, jira_clients
+
+
+def _error_text(error):
+    # Jira reports per-item errors as {field: message}
+    if isinstance(error, dict):
+        return "; ".join(f"{field}: {message}" for field, message in error.items()) or "Jira rejected the issue"
+    return str(error) if error else "Jira rejected the issue"
+
+
+def create_issues_bulk(jira, field_list, chunk_size=None):
+    """[{'key': issue key or None, 'error': message or None}] for field_list, in order."""
+    size = max(1, chunk_size or int(os.environ.get("JIRA_BULK_MAX_ISSUES", "50")))
+    results = []
+    for start in range(0, len(field_list), size):
+        chunk = field_list[start:start + size]
+        try:
+            # prefetch=False: keys come from the bulk response instead of one GET per created issue
+            outcomes = jira.create_issues(field_list=chunk, prefetch=False)
+        except Exception as e:
+            print(f"[JiraBulk] Bulk creation of {len(chunk)} issue(s) failed: {e}")
+            if is_connection_error(e):
+                # The shared client's connection is gone: reconnect on next use. Other failures
+                # (a rejected or timed-out request) keep the client for every other caller
+                jira_clients.invalidate(jira, e)
+            results.extend({'key': None, 'error': str(e)} for _ in chunk)
+            continue
+        for outcome in outcomes:
+            issue = outcome.get('issue')
+            if outcome.get('status') == 'Success' and issue is not None:
+                results.append({'key': issue.key, 'error': None})
+            else:
+                results.append({'key': None, 'error': _error_text(outcome.get('error'))})
+        print(f"[JiraBulk] Created {sum(1 for r in results[start:] if r['key'])}/{len(chunk)} issue(s) in one request")
+    return results
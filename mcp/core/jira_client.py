@@ -0,0 +1,135 @@
+"""
+Shared Jira client for the whole process.
+- One JIRA client per process instead of one authenticated session per TaskManagerAgent; agents get
+  it from jira_clients (or an injected provider) each time they talk to Jira
+- Created on first use without a server round-trip (get_server_info=False); credentials are sent with
+  the first real request
+- Its HTTP session keeps connections alive in a pool of JIRA_POOL_SIZE connections
+- Health: an idle client (unused for JIRA_HEALTH_CHECK_SECONDS) is checked with GET /myself before
+  it is handed out; a failed check or a reported connection failure drops it, and the next caller
+  reconnects (a missing configuration or failed connect is retried once per check interval)
+"""
+import os
+import threading
+import time
+
+from mcp.core.config import export_credentials_env, jira_settings
+
+
+def is_connection_error(error):
+    """
+    Whether error means the client's connection is broken (refused, reset, DNS, connect timeout), as
+    opposed to a request Jira answered or rejected; only the former warrants reconnecting.
+    """
+    if isinstance(error, ConnectionError):
+        return True
+    try:
+        from requests.exceptions import ConnectionError as RequestsConnectionError
+    except ImportError:
+        return False
+    # Covers ConnectTimeout, ProxyError and SSLError too
+    return isinstance(error, RequestsConnectionError)
+
+
+class JiraClientProvider:
+    def __init__(self, pool_size=None, health_check_seconds=None, timeout=None):
+        self.pool_size = pool_size or int(os.environ.get("JIRA_POOL_SIZE", "10"))
+        self.health_check_seconds = health_check_seconds if health_check_seconds is not None else float(os.environ.get("JIRA_HEALTH_CHECK_SECONDS", "60"))
+        self.timeout = timeout or float(os.environ.get("JIRA_TIMEOUT_SECONDS", "30"))
+        self._client = None
+        self._last_used = 0.0
+        self._last_attempt = None
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.reconnects = 0
+        self.health_checks = 0
+        self.failures = 0
+
+    def settings(self):
+        """url / user / token / project, environment first, then credentials.json."""
+        export_credentials_env()
+        return jira_settings()
+
+    def _connect(self):
+        try:
+            from jira import JIRA
+        except ImportError:
+            print("[JiraClient] jira package not installed; Jira disabled")
+            return None
+        settings = self.settings()
+        if not (settings['url'] and settings['user'] and settings['token']):
+            print("[JiraClient] JIRA_URL / JIRA_USER / JIRA_TOKEN not configured; Jira disabled")
+            return None
+        from requests.adapters import HTTPAdapter
+        client = JIRA(server=settings['url'], basic_auth=(settings['user'], settings['token']),
+                      get_server_info=False, timeout=self.timeout)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        client._session.mount("https://", adapter)
+        client._session.mount("http://", adapter)
+        self.connects += 1
+        print(f"[JiraClient] Connected to {settings['url']} as {settings['user']} (pool {self.pool_size})")
+        return client
+
+    def _healthy(self, client):
+        try:
+            client.myself()
+            return True
+        except Exception as e:
+            print(f"[JiraClient] Health check failed: {e}")
+            return False
+
+    def get(self):
+        """The shared client, reconnecting if it was dropped; None when Jira is not configured."""
+        with self._lock:
+            client = self._client
+            # One caller checks an idle client; the others keep using it meanwhile
+            check = client is not None and time.monotonic() - self._last_used > self.health_check_seconds
+            if check:
+                self._last_used = time.monotonic()
+                self.health_checks += 1
+        # The GET /myself round-trip runs outside the lock, so it never holds up other callers
+        if check and not self._healthy(client):
+            with self._lock:
+                if self._client is client:
+                    self._client = None
+                    self._last_attempt = None
+                    self.reconnects += 1
+        with self._lock:
+            now = time.monotonic()
+            # Not configured or unreachable: retry at most once per health-check interval
+            retry = self._last_attempt is None or now - self._last_attempt > self.health_check_seconds
+            if self._client is None and retry:
+                self._last_attempt = now
+                try:
+                    # No server round-trip: the client authenticates on its first request
+                    self._client = self._connect()
+                except Exception as e:
+                    self.failures += 1
+                    print(f"[JiraClient] Connection failed: {e}")
+            self._last_used = now
+            return self._client
+
+    def invalidate(self, client=None, error=None):
+        """Drop the shared client (only if it is still `client`) so the next get() reconnects."""
+        with self._lock:
+            if self._client is not None and (client is None or client is self._client):
+                print(f"[JiraClient] Dropping client{f': {error}' if error else ''}")
+                self._client = None
+                self._last_attempt = None
+                self.failures += 1
+                self.reconnects += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'connected': self._client is not None,
+                'pool_size': self.pool_size,
+                'connects': self.connects,
+                'reconnects': self.reconnects,
+                'health_checks': self.health_checks,
+                'failures': self.failures
+            }
+
+
+# Shared instance for the whole process
+jira_clients = JiraClientProvider()
@@ -0,0 +1,109 @@
+"""
+Incremental JSON detection for model output.
+- IncrementalJSONScanner: brace/string-aware scanner fed piece by piece; captures the first
+  complete top-level JSON object without rescanning earlier text
+- JSONObjectStoppingCriteria: ends generate() as soon as every row's object has closed,
+  scanning only newly generated tokens (never the prompt or its example JSON)
+"""
+import json
+
+
+def _advance(state, text):
+    """Advance (started, depth, in_string, escape, closed) over text; pure so beam rows can share states."""
+    started, depth, in_string, escape, closed = state
+    if closed:
+        return state
+    for c in text:
+        if not started:
+            if c == '{':
+                started, depth = True, 1
+            continue
+        if in_string:
+            if escape:
+                escape = False
+            elif c == '\\':
+                escape = True
+            elif c == '"':
+                in_string = False
+        elif c == '"':
+            in_string = True
+        elif c == '{':
+            depth += 1
+        elif c == '}':
+            depth -= 1
+            if depth == 0:
+                return (started, depth, in_string, escape, True)
+    return (started, depth, in_string, escape, closed)
+
+
+INITIAL_STATE = (False, 0, False, False, False)
+
+
+class IncrementalJSONScanner:
+    def __init__(self):
+        self.state = INITIAL_STATE
+        self._pieces = []
+        self.result = None  # text of the first complete top-level object
+
+    @property
+    def started(self):
+        return self.state[0]
+
+    @property
+    def closed(self):
+        return self.state[4]
+
+    def feed(self, text):
+        """Consume the next piece of text; returns True once the object has closed."""
+        if self.closed:
+            return True
+        for c in text:
+            self.state = _advance(self.state, c)
+            if self.state[0]:
+                self._pieces.append(c)
+            if self.closed:
+                self.result = ''.join(self._pieces)
+                return True
+        return False
+
+    def parsed(self):
+        """The closed object as a dict, or None if it never closed or is not valid JSON."""
+        if self.result is None:
+            return None
+        try:
+            return json.loads(self.result)
+        except ValueError as e:
+            print(f"[JSONScanner] JSON parsing error: {e}")
+            return None
+
+
+class JSONObjectStoppingCriteria:
+    """
+    Stopping criterion for model.generate.
+    Scanner state is keyed by each row's token history, so beam reordering just looks up
+    the parent sequence and advances it by the single new token.
+    """
+
+    def __init__(self, tokenizer):
+        self.tokenizer = tokenizer
+        self._states = {}
+
+    def fresh(self):
+        """A new criterion with no scanned rows, for another input."""
+        return JSONObjectStoppingCriteria(self.tokenizer)
+
+    def __call__(self, input_ids, scores=None, **kwargs):
+        import torch
+        rows = input_ids.detach().cpu().numpy()
+        states = {}
+        done = []
+        for row in rows:
+            parent = self._states.get(row[:-1].tobytes())
+            if parent is None:
+                # First generated token: the parent is the prompt itself, which is never scanned
+                parent = INITIAL_STATE
+            state = _advance(parent, self.tokenizer.decode([int(row[-1])], skip_special_tokens=True))
+            states[row.tobytes()] = state
+            done.append(state[4])
+        self._states = states
+        return torch.tensor(done, dtype=torch.bool, device=input_ids.device)
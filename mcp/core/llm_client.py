@@ -0,0 +1,213 @@
+"""
+Shared async client for the hosted LLM ('llm' mode).
+- One AsyncOpenAI client with pooled keep-alive connections for the whole process, running on a
+  dedicated event-loop thread so async endpoints and sync agents share the same pool and limits
+- At most LLM_MAX_CONCURRENCY requests in flight; further callers wait on a semaphore
+- Rate-limit (429), timeout, connection and 5xx errors are retried with exponential backoff and
+  full jitter (honouring Retry-After), up to LLM_MAX_RETRIES times
+- LLM_BASE_URL (or OPENAI_BASE_URL) points the client at a local stand-in server for tests
+"""
+import asyncio
+import concurrent.futures
+import os
+import queue
+import random
+import threading
+
+RETRYABLE_STATUS = {408, 409, 429}
+
+
+class LLMUnavailableError(RuntimeError):
+    pass
+
+
+def _env_float(name, default):
+    return float(os.environ.get(name, str(default)))
+
+
+class LLMClient:
+    def __init__(self, api_key=None, base_url=None, model=None, max_concurrency=None, max_retries=None,
+                 timeout=None, backoff_base=None, backoff_max=None):
+        self.api_key = api_key
+        self.base_url = base_url or os.environ.get("LLM_BASE_URL") or os.environ.get("OPENAI_BASE_URL")
+        self.model = model or os.environ.get("LLM_MODEL", "gpt-4o-mini")
+        self.max_concurrency = max_concurrency or int(os.environ.get("LLM_MAX_CONCURRENCY", "4"))
+        self.max_retries = max_retries if max_retries is not None else int(os.environ.get("LLM_MAX_RETRIES", "5"))
+        self.timeout = timeout or _env_float("LLM_TIMEOUT_SECONDS", 60)
+        self.backoff_base = backoff_base or _env_float("LLM_BACKOFF_BASE_SECONDS", 0.5)
+        self.backoff_max = backoff_max or _env_float("LLM_BACKOFF_MAX_SECONDS", 20)
+        self._lock = threading.Lock()
+        self._loop = None
+        self._client = None
+        self._semaphore = None
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.in_flight = 0
+
+    # -- event loop / client lifecycle -------------------------------------------------------
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._loop is not None:
+                return
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="llm-client", daemon=True).start()
+            asyncio.run_coroutine_threadsafe(self._init_on_loop(), loop).result()
+            self._loop = loop
+
+    async def _init_on_loop(self):
+        import httpx
+        from openai import AsyncOpenAI
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency),
+            timeout=httpx.Timeout(self.timeout)
+        )
+        self._client = AsyncOpenAI(
+            api_key=self.api_key or os.environ.get("OPENAI_API_KEY"),
+            base_url=self.base_url,
+            http_client=http_client,
+            max_retries=0,  # retries are handled here, with jitter and the shared semaphore
+            timeout=self.timeout
+        )
+
+    def _run(self, coro):
+        """Schedule coro on the client loop; returns a concurrent.futures.Future."""
+        self._ensure_started()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    # -- retries ------------------------------------------------------------------------------
+
+    def _retry_delay(self, error, attempt):
+        """Seconds to wait before retrying error, or None if it is not retryable."""
+        import openai
+        if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError)):
+            status = None
+        elif isinstance(error, openai.APIStatusError):
+            status = error.status_code
+            if status not in RETRYABLE_STATUS and status < 500:
+                return None
+        else:
+            return None
+        if attempt >= self.max_retries:
+            return None
+        retry_after = None
+        response = getattr(error, 'response', None)
+        if status == 429 and response is not None:
+            try:
+                retry_after = float(response.headers.get('retry-after'))
+            except (TypeError, ValueError):
+                retry_after = None
+        # Full jitter: spreads synchronized retries from concurrent callers
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        return max(delay, retry_after or 0)
+
+    async def _with_retries(self, call, first_output=None):
+        attempt = 0
+        while True:
+            try:
+                async with self._semaphore:
+                    self.in_flight += 1
+                    self.requests += 1
+                    try:
+                        return await call()
+                    finally:
+                        self.in_flight -= 1
+            except Exception as e:
+                if first_output is not None and first_output():
+                    # Part of a stream already reached the caller; a retry would duplicate it
+                    self.failures += 1
+                    raise
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    self.failures += 1
+                    raise LLMUnavailableError(f"LLM request failed after {attempt + 1} attempt(s): {e}") from e
+                attempt += 1
+                self.retries += 1
+                print(f"[LLMClient] {type(e).__name__}; retry {attempt}/{self.max_retries} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+    # -- async API ----------------------------------------------------------------------------
+
+    async def _chat(self, messages, max_tokens, temperature):
+        async def call():
+            resp = await self._client.chat.completions.create(
+                model=self.model, messages=messages, max_tokens=max_tokens, temperature=temperature
+            )
+            return resp.choices[0].message.content or ''
+        return await self._with_retries(call)
+
+    async def chat(self, prompt, max_tokens=300, temperature=0.2, timeout=None):
+        """
+        Completion text for a single user prompt.
+        timeout: overall seconds including retries; on expiry the request is cancelled and
+        asyncio.TimeoutError is raised.
+        """
+        messages = [{'role': 'user', 'content': prompt}]
+        # Cancelling the wrapped future cancels the request on the client loop as well
+        return await asyncio.wait_for(asyncio.wrap_future(self._run(self._chat(messages, max_tokens, temperature))), timeout)
+
+    def chat_sync(self, prompt, max_tokens=300, temperature=0.2, timeout=None):
+        """Blocking variant for sync agents; shares the same pool, semaphore and retries."""
+        messages = [{'role': 'user', 'content': prompt}]
+        future = self._run(self._chat(messages, max_tokens, temperature))
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    async def _pump_stream(self, messages, max_tokens, temperature, put):
+        started = []
+
+        async def call():
+            stream = await self._client.chat.completions.create(
+                model=self.model, messages=messages, max_tokens=max_tokens, temperature=temperature, stream=True
+            )
+            async for event in stream:
+                delta = event.choices[0].delta.content if event.choices else None
+                if delta:
+                    started.append(True)
+                    put(delta)
+        await self._with_retries(call, first_output=lambda: bool(started))
+
+    def stream_sync(self, prompt, max_tokens=300, temperature=0.2):
+        """Sync generator of text deltas; retries only before the first delta is produced."""
+        messages = [{'role': 'user', 'content': prompt}]
+        deltas = queue.Queue()
+        done = object()
+
+        async def pump():
+            try:
+                await self._pump_stream(messages, max_tokens, temperature, deltas.put)
+                deltas.put(done)
+            except BaseException as e:
+                deltas.put(e)
+
+        future = self._run(pump())
+        try:
+            while True:
+                item = deltas.get()
+                if item is done:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            # Consumer went away (client disconnected): stop reading the upstream stream
+            future.cancel()
+
+    def stats(self):
+        return {
+            'base_url': self.base_url,
+            'max_concurrency': self.max_concurrency,
+            'in_flight': self.in_flight,
+            'requests': self.requests,
+            'retries': self.retries,
+            'failures': self.failures
+        }
+
+
+# Shared instance for the whole process
+llm_client = LLMClient()
@@ -0,0 +1,77 @@
+"""
+Dependency-free text similarity metrics for parity checks and benchmarks.
+"""
+import re
+
+
+def _words(text):
+    return re.findall(r"\w+", str(text).lower())
+
+
+def rouge_l_f1(reference, candidate):
+    """ROUGE-L F1 over lowercased word tokens (longest common subsequence)."""
+    ref, cand = _words(reference), _words(candidate)
+    if not ref or not cand:
+        return 1.0 if ref == cand else 0.0
+    prev = [0] * (len(cand) + 1)
+    for r in ref:
+        cur = [0]
+        for j, c in enumerate(cand):
+            cur.append(prev[j] + 1 if r == c else max(prev[j + 1], cur[j]))
+        prev = cur
+    lcs = prev[-1]
+    if not lcs:
+        return 0.0
+    precision, recall = lcs / len(cand), lcs / len(ref)
+    return 2 * precision * recall / (precision + recall)
+
+
+def _ngrams(words, n):
+    counts = {}
+    for i in range(len(words) - n + 1):
+        gram = tuple(words[i:i + n])
+        counts[gram] = counts.get(gram, 0) + 1
+    return counts
+
+
+def rouge_n_f1(reference, candidate, n=1):
+    """ROUGE-N F1 over lowercased word n-grams (clipped counts)."""
+    ref, cand = _ngrams(_words(reference), n), _ngrams(_words(candidate), n)
+    if not ref or not cand:
+        return 1.0 if ref == cand else 0.0
+    overlap = sum(min(c, ref.get(g, 0)) for g, c in cand.items())
+    if not overlap:
+        return 0.0
+    precision, recall = overlap / sum(cand.values()), overlap / sum(ref.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def rouge_scores(reference, candidate):
+    return {
+        'rouge1': rouge_n_f1(reference, candidate, 1),
+        'rouge2': rouge_n_f1(reference, candidate, 2),
+        'rougeL': rouge_l_f1(reference, candidate)
+    }
+
+
+def item_precision_recall(gold, predicted, threshold=0.5):
+    """
+    Precision/recall of predicted items (e.g. action items) against gold, one-to-one:
+    each predicted item matches at most one unmatched gold item with ROUGE-L F1 >= threshold.
+    """
+    gold, predicted = [str(g) for g in gold if g], [str(p) for p in predicted if p]
+    if not gold or not predicted:
+        # Nothing predicted: no false positives; nothing to find: nothing missed
+        return {'precision': 0.0 if predicted else 1.0, 'recall': 0.0 if gold else 1.0}
+    unmatched = set(range(len(gold)))
+    matched = 0
+    for p in predicted:
+        best, best_score = None, threshold
+        for g in unmatched:
+            score = rouge_l_f1(gold[g], p)
+            if score >= best_score:
+                best, best_score = g, score
+        if best is not None:
+            unmatched.discard(best)
+            matched += 1
+    return {'precision': matched / len(predicted), 'recall': matched / len(gold)}
@@ -0,0 +1,265 @@
+"""
+Process-wide model registry.
+- Holds one shared (tokenizer, model) pair per (model path, dtype, quantization)
+- Tracks resident bytes and evicts least-recently-used models to stay under a RAM budget
+- Budget comes from MODEL_RAM_BUDGET_MB (0 or unset = unlimited)
+"""
+import functools
+import gc
+import importlib.util
+import os
+import threading
+import time
+from collections import OrderedDict
+
+WEIGHT_FILE_SUFFIXES = ('.safetensors', '.bin', '.pt', '.pth', '.onnx')
+# Rough in-memory size of quantized weights relative to the fp16/fp32 files on disk
+QUANTIZATION_SIZE_FACTOR = {'4bit': 0.25, '8bit': 0.5, 'int8': 0.5}
+
+
+def model_nbytes(model):
+    """
+    Bytes held by a loaded model's weights (0 if unknown, e.g. ONNX Runtime sessions).
+    Counted from the state dict so dynamically quantized (packed) int8 weights are included.
+    """
+    if not hasattr(model, 'state_dict'):
+        return 0
+    total = 0
+    pending = list(model.state_dict().values())
+    while pending:
+        value = pending.pop()
+        if isinstance(value, (tuple, list)):
+            pending.extend(value)
+        elif hasattr(value, 'numel') and hasattr(value, 'element_size'):
+            total += value.numel() * value.element_size()
+    return total
+
+
+def estimate_nbytes(model_path, quantization=None):
+    """Estimate a model's resident size from its weight files before loading it."""
+    total = 0
+    if os.path.isdir(model_path):
+        for root, _, files in os.walk(model_path):
+            for name in files:
+                if name.endswith(WEIGHT_FILE_SUFFIXES):
+                    total += os.path.getsize(os.path.join(root, name))
+    elif os.path.isfile(model_path):
+        total = os.path.getsize(model_path)
+    return int(total * QUANTIZATION_SIZE_FACTOR.get(quantization, 1.0))
+
+
+def _budget_from_env():
+    try:
+        return int(float(os.environ.get("MODEL_RAM_BUDGET_MB", "0")) * 1024 * 1024)
+    except ValueError:
+        return 0
+
+
+class ModelRegistry:
+    def __init__(self, budget_bytes=None):
+        self.budget_bytes = _budget_from_env() if budget_bytes is None else budget_bytes
+        self._models = OrderedDict()  # key -> {'tokenizer', 'model', 'nbytes', 'loaded_at', 'last_used'}
+        self._lock = threading.RLock()
+        self._load_locks = {}
+        self.loads = 0
+        self.hits = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(model_path, dtype=None, quantization=None):
+        return (os.path.abspath(model_path), str(dtype) if dtype else None, quantization)
+
+    @property
+    def resident_bytes(self):
+        with self._lock:
+            return sum(e['nbytes'] for e in self._models.values())
+
+    def is_resident(self, model_path, dtype=None, quantization=None):
+        with self._lock:
+            return self.make_key(model_path, dtype, quantization) in self._models
+
+    def get(self, model_path, loader, dtype=None, quantization=None):
+        """
+        Return the shared (tokenizer, model) for this key, calling loader() on first use.
+        loader: zero-arg callable returning (tokenizer, model)
+        """
+        key = self.make_key(model_path, dtype, quantization)
+        entry = self._touch(key)
+        if entry:
+            return entry['tokenizer'], entry['model']
+        with self._lock:
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+        # Per-key lock: concurrent callers wait for one load instead of loading twice
+        with load_lock:
+            try:
+                return self._load_locked(key, model_path, loader, quantization)
+            finally:
+                # Waiters already hold a reference to load_lock; later callers find the model resident
+                with self._lock:
+                    if self._load_locks.get(key) is load_lock:
+                        del self._load_locks[key]
+
+    def _load_locked(self, key, model_path, loader, quantization):
+        entry = self._touch(key)
+        if entry:
+            return entry['tokenizer'], entry['model']
+        self._make_room(estimate_nbytes(model_path, quantization))
+        print(f"[ModelRegistry] Loading {key}")
+        tokenizer, model = loader()
+        nbytes = model_nbytes(model) or estimate_nbytes(model_path, quantization)
+        now = time.time()
+        with self._lock:
+            self._models[key] = {
+                'tokenizer': tokenizer,
+                'model': model,
+                'nbytes': nbytes,
+                'loaded_at': now,
+                'last_used': now
+            }
+            self.loads += 1
+        print(f"[ModelRegistry] Loaded {key} ({nbytes / 1024 ** 2:.0f} MB resident)")
+        # The estimate may have been low; trim other models if we are now over budget
+        self._make_room(0, keep=key)
+        return tokenizer, model
+
+    def _touch(self, key):
+        with self._lock:
+            entry = self._models.get(key)
+            if entry:
+                self._models.move_to_end(key)
+                entry['last_used'] = time.time()
+                self.hits += 1
+            return entry
+
+    def _make_room(self, incoming_bytes, keep=None):
+        if not self.budget_bytes:
+            return
+        with self._lock:
+            for key in list(self._models.keys()):
+                if self.resident_bytes + incoming_bytes <= self.budget_bytes:
+                    break
+                if key == keep:
+                    continue
+                self._evict_locked(key)
+            if self.resident_bytes + incoming_bytes > self.budget_bytes:
+                print(f"[ModelRegistry][WARN] Model needs {(self.resident_bytes + incoming_bytes) / 1024 ** 2:.0f} MB, over budget of {self.budget_bytes / 1024 ** 2:.0f} MB")
+
+    def _evict_locked(self, key):
+        entry = self._models.pop(key, None)
+        if entry is None:
+            return False
+        self.evictions += 1
+        print(f"[ModelRegistry] Evicting {key} ({entry['nbytes'] / 1024 ** 2:.0f} MB)")
+        del entry
+        gc.collect()
+        try:
+            import torch
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except ImportError:
+            pass
+        return True
+
+    def evict(self, model_path, dtype=None, quantization=None):
+        with self._lock:
+            return self._evict_locked(self.make_key(model_path, dtype, quantization))
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._models.keys()):
+                self._evict_locked(key)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'loads': self.loads,
+                'hits': self.hits,
+                'evictions': self.evictions,
+                'resident_bytes': self.resident_bytes,
+                'budget_bytes': self.budget_bytes,
+                'models': [
+                    {
+                        'model_path': key[0],
+                        'dtype': key[1],
+                        'quantization': key[2],
+                        'nbytes': e['nbytes'],
+                        'loaded_at': e['loaded_at'],
+                        'last_used': e['last_used']
+                    }
+                    for key, e in self._models.items()
+                ]
+            }
+
+
+@functools.lru_cache(maxsize=None)
+def onnx_runtime_available():
+    """Whether optimum[onnxruntime] is installed, without importing it."""
+    try:
+        return importlib.util.find_spec("optimum.onnxruntime") is not None and importlib.util.find_spec("onnxruntime") is not None
+    except ImportError:
+        return False
+
+
+def seq2seq_backend(backend):
+    """The backend load_seq2seq actually uses: 'onnx' becomes 'int8' when optimum[onnxruntime] is missing."""
+    if backend == "onnx" and not onnx_runtime_available():
+        return "int8"
+    return backend
+
+
+def load_seq2seq(model_path, backend="torch"):
+    """
+    backend: 'torch' (fp32 PyTorch), 'int8' (PyTorch with dynamic int8 Linear layers, CPU)
+    or 'onnx' (ONNX Runtime encoder/decoder with past key values; needs optimum[onnxruntime]).
+    Loads seq2seq_backend(backend); callers key and report on that, not on the requested one.
+    """
+    from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+    tokenizer = AutoTokenizer.from_pretrained(model_path)
+    if seq2seq_backend(backend) != backend:
+        print("[WARN] ONNX Runtime backend not available (optimum[onnxruntime] missing); falling back to int8.")
+        backend = seq2seq_backend(backend)
+    if backend == "onnx":
+        return tokenizer, _load_seq2seq_onnx(model_path)
+    model = AutoModelForSeq2SeqLM.from_pretrained(model_path)
+    model.eval()
+    if backend == "int8":
+        import torch
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        print(f"[INFO] Loaded {model_path} with dynamic int8 quantization.")
+    return tokenizer, model
+
+
+def _load_seq2seq_onnx(model_path):
+    """Export once to <model_path>_onnx (or BART_ONNX_PATH), then load the exported graphs."""
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    export_dir = os.environ.get("BART_ONNX_PATH") or model_path.rstrip('/\\') + "_onnx"
+    if os.path.exists(os.path.join(export_dir, 'config.json')):
+        return ORTModelForSeq2SeqLM.from_pretrained(export_dir, use_cache=True)
+    print(f"[INFO] Exporting {model_path} to ONNX at {export_dir} (one-time)...")
+    model = ORTModelForSeq2SeqLM.from_pretrained(model_path, export=True, use_cache=True)
+    model.save_pretrained(export_dir)
+    return model
+
+
+def load_causal_lm(model_path, quantization=None):
+    from transformers import AutoTokenizer, AutoModelForCausalLM
+    tokenizer = AutoTokenizer.from_pretrained(model_path)
+    if quantization == "4bit":
+        try:
+            from transformers import BitsAndBytesConfig
+            print(f"[INFO] Attempting to load {model_path} in 4-bit quantized mode (bitsandbytes)...")
+            model = AutoModelForCausalLM.from_pretrained(
+                model_path,
+                device_map="auto",
+                quantization_config=BitsAndBytesConfig(load_in_4bit=True)
+            )
+            print("[INFO] Loaded model in 4-bit quantized mode.")
+            return tokenizer, model
+        except Exception as e:
+            print(f"[WARN] 4-bit quantization failed or bitsandbytes not available: {e}\nFalling back to normal model load.")
+    model = AutoModelForCausalLM.from_pretrained(model_path)
+    return tokenizer, model
+
+
+# Shared instance for the whole process
+model_registry = ModelRegistry()
@@ -0,0 +1,140 @@
+"""
+Prompt-prefix KV cache for decoder-only models.
+- The fixed instruction preamble is prefilled once per loaded model and its past key/values reused
+- Entries are tied to the model object (dropped when the registry evicts it) and to the prefix text
+  (recomputed when the prompt template changes)
+- Batches are laid out as prefix + padding + suffix so the cached prefix stays at position 0
+"""
+import copy
+import threading
+import weakref
+
+
+class PrefixKVCache:
+    def __init__(self):
+        self._entries = weakref.WeakKeyDictionary()  # model -> {prefix_text: entry}
+        self._lock = threading.Lock()
+        self.builds = 0
+        self.hits = 0
+
+    def get(self, tokenizer, model, prefix_text):
+        """Return {'prefix_ids': [...], 'past_key_values': cache} for this model and prefix."""
+        import torch
+        with self._lock:
+            per_model = self._entries.get(model)
+            if per_model and prefix_text in per_model:
+                self.hits += 1
+                return per_model[prefix_text]
+        device = next(model.parameters()).device
+        prefix_ids = tokenizer(prefix_text, return_tensors="pt")["input_ids"].to(device)
+        with torch.no_grad():
+            past_key_values = model(prefix_ids, use_cache=True).past_key_values
+        entry = {'prefix_ids': prefix_ids[0].tolist(), 'past_key_values': past_key_values}
+        with self._lock:
+            # Only the current template is kept; a changed PROMPT_TEMPLATE replaces the old entry
+            self._entries[model] = {prefix_text: entry}
+            self.builds += 1
+        print(f"[PrefixKVCache] Prefilled {len(entry['prefix_ids'])} prefix tokens")
+        return entry
+
+    def stats(self):
+        with self._lock:
+            return {'builds': self.builds, 'hits': self.hits, 'models': len(self._entries)}
+
+
+def _expanded_cache(past_key_values, rows):
+    """Private copy of the prefix cache with its batch dimension repeated to `rows`."""
+    from transformers import DynamicCache
+    cache = copy.deepcopy(past_key_values)
+    if isinstance(cache, tuple):
+        cache = DynamicCache.from_legacy_cache(cache)
+    if rows > 1:
+        cache.batch_repeat_interleave(rows)
+    return cache
+
+
+def _prefix_layout(prefix_ids, rows, pad_id):
+    """
+    (input_ids, attention_mask, suffix width) for token rows that all start with prefix_ids.
+    Pads sit between prefix and suffix; position ids come from the attention mask, so they are skipped.
+    """
+    P = len(prefix_ids)
+    suffixes = [r[P:] for r in rows]
+    width = max(len(s) for s in suffixes)
+    input_ids = [prefix_ids + [pad_id] * (width - len(s)) + s for s in suffixes]
+    attention_mask = [[1] * P + [0] * (width - len(s)) + [1] * len(s) for s in suffixes]
+    return input_ids, attention_mask, width
+
+
+def _generate_with_cached_prefix(tokenizer, model, prefix_text, prompts, gen_kwargs, strip_prompt):
+    import torch
+    entry = prefix_kv_cache.get(tokenizer, model, prefix_text)
+    prefix_ids = entry['prefix_ids']
+    P = len(prefix_ids)
+    rows = tokenizer(prompts, truncation=True, max_length=4096)["input_ids"]
+    if any(r[:P] != prefix_ids for r in rows):
+        # The prompt does not tokenize to prefix + suffix at the boundary; nothing to reuse
+        return None
+    pad_id = tokenizer.pad_token_id if tokenizer.pad_token_id is not None else tokenizer.eos_token_id
+    input_ids, attention_mask, width = _prefix_layout(prefix_ids, rows, pad_id)
+    device = next(model.parameters()).device
+    num_beams = gen_kwargs.get('num_beams', 1)
+    output = model.generate(
+        torch.tensor(input_ids, device=device),
+        attention_mask=torch.tensor(attention_mask, device=device),
+        past_key_values=_expanded_cache(entry['past_key_values'], len(prompts) * num_beams),
+        **gen_kwargs
+    )
+    return output[:, P + width:] if strip_prompt else output
+
+
+def _fresh_controls(gen_kwargs):
+    """
+    gen_kwargs with new instances of stateful logits processors and stopping criteria (those with
+    fresh()): after a failed cached attempt they are bound to the prefix + suffix layout
+    """
+    fresh = dict(gen_kwargs)
+    for name in ('logits_processor', 'stopping_criteria'):
+        items = gen_kwargs.get(name)
+        if items is not None:
+            fresh[name] = type(items)(item.fresh() if hasattr(item, 'fresh') else item for item in items)
+    return fresh
+
+
+def generate_with_prefix(tokenizer, model, prefix_text, prompts, strip_prompt=False, **gen_kwargs):
+    """
+    model.generate over prompts that all start with prefix_text, reusing the prefix KV cache.
+    Falls back to a plain left-padded generate if the cached path is not usable.
+    strip_prompt: return only the newly generated token ids.
+    """
+    try:
+        output = _generate_with_cached_prefix(tokenizer, model, prefix_text, prompts, gen_kwargs, strip_prompt)
+        if output is not None:
+            return output
+        print("[PrefixKVCache] Prompt does not start with the cached prefix tokens; generating without cache.")
+    except Exception as e:
+        print(f"[PrefixKVCache][WARN] Cached prefix generation failed, generating without cache: {e}")
+        streamer = gen_kwargs.get('streamer')
+        if streamer is not None and hasattr(streamer, 'next_tokens_are_prompt'):
+            streamer.next_tokens_are_prompt = True
+        gen_kwargs = _fresh_controls(gen_kwargs)
+    device = next(model.parameters()).device
+    padding_side = tokenizer.padding_side
+    if tokenizer.pad_token is None:
+        tokenizer.pad_token = tokenizer.eos_token
+    # Decoder-only models must be left-padded so every row continues from its last real token
+    tokenizer.padding_side = "left"
+    try:
+        encoded = tokenizer(prompts, padding=True, truncation=True, max_length=4096, return_tensors="pt")
+    finally:
+        tokenizer.padding_side = padding_side
+    output = model.generate(
+        encoded["input_ids"].to(device),
+        attention_mask=encoded["attention_mask"].to(device),
+        **gen_kwargs
+    )
+    return output[:, encoded["input_ids"].shape[1]:] if strip_prompt else output
+
+
+# Shared instance for the whole process
+prefix_kv_cache = PrefixKVCache()
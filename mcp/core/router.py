@@ -0,0 +1,120 @@
+"""
+Cost- and latency-aware backend routing for the 'auto' summarization mode.
+- Backends are preferred by transcript length: short meetings take the fast local path (BART),
+  mid-size ones use the hosted LLM (billed per token), and only long meetings pay for the 7B model (Mistral)
+- A preferred backend is skipped when its estimated latency (queue wait + cold load if not
+  resident + observed seconds per 1k tokens) does not fit the latency budget; if none fit,
+  the fastest available backend wins
+- The budget is the request's deadline (what is left of it), defaulting to SUMMARY_DEADLINE_SECONDS
+  like the deadline itself, so a backend is never picked only to be cut off
+- Latency estimates start from priors and follow observed calls (exponential moving average)
+- Every decision is logged and kept in a bounded in-memory log for auditing
+"""
+import os
+import threading
+import time
+from collections import deque
+
+from mcp.core.deadline import default_budget
+
+# Seconds per 1k input tokens, before any observation
+PRIOR_SECONDS_PER_1K = {'bart': 2.0, 'llm': 1.5, 'mistral': 15.0, 'fallback': 0.01}
+# One-off cost of loading a model that is not resident
+COLD_LOAD_SECONDS = {'bart': 10.0, 'mistral': 90.0}
+# Shortest transcript (in 1k tokens) a call is charged for: fixed per-call overhead
+MIN_BILLED_1K = 0.25
+
+
+def _env_int(name, default):
+    return int(os.environ.get(name, str(default)))
+
+
+class BackendRouter:
+    def __init__(self, short_tokens=None, long_tokens=None, latency_budget=None, smoothing=0.3, log_size=200):
+        self.short_tokens = short_tokens or _env_int("ROUTER_SHORT_TOKENS", 1500)
+        self.long_tokens = long_tokens or _env_int("ROUTER_LONG_TOKENS", 6000)
+        self.latency_budget = latency_budget if latency_budget is not None else default_budget()
+        self.smoothing = smoothing
+        self._rates = dict(PRIOR_SECONDS_PER_1K)
+        self._observations = {}
+        self._decisions = deque(maxlen=log_size)
+        self._lock = threading.Lock()
+
+    def preference(self, tokens):
+        """Backends in order of preference for a transcript of this many tokens."""
+        if tokens <= self.short_tokens:
+            return ['bart', 'llm', 'mistral', 'fallback']
+        if tokens >= self.long_tokens:
+            return ['mistral', 'llm', 'bart', 'fallback']
+        return ['llm', 'bart', 'mistral', 'fallback']
+
+    def estimate(self, backend, tokens, resident=True, queue_depth=0, concurrency=1):
+        """Estimated seconds until a result: queued work ahead of us, cold load, then the call itself."""
+        with self._lock:
+            rate = self._rates.get(backend, PRIOR_SECONDS_PER_1K['bart'])
+        run = rate * max(tokens / 1000.0, MIN_BILLED_1K)
+        wait = queue_depth * run / max(concurrency, 1)
+        load = 0.0 if resident else COLD_LOAD_SECONDS.get(backend, 0.0)
+        return wait + load + run
+
+    def choose(self, tokens, candidates, latency_budget=None):
+        """
+        candidates: {backend: {'available', 'resident', 'queue_depth', 'concurrency'}}
+        latency_budget: seconds left before the request's deadline (None: the default budget; 0: no deadline)
+        Returns the decision dict (backend, reason, estimates) and records it.
+        """
+        budget = self.latency_budget if latency_budget is None else latency_budget
+        budget = budget if budget and budget > 0 else None
+        estimates = {
+            name: round(self.estimate(name, tokens, info.get('resident', True), info.get('queue_depth', 0), info.get('concurrency', 1)), 2)
+            for name, info in candidates.items() if info.get('available')
+        }
+        order = [b for b in self.preference(tokens) if b in estimates]
+        backend = next((b for b in order if budget is None or estimates[b] <= budget), None)
+        if backend is not None:
+            skipped = order[:order.index(backend)]
+            reason = "preferred" if not skipped else f"over budget: {', '.join(skipped)}"
+        else:
+            backend = min(estimates, key=estimates.get) if estimates else 'fallback'
+            reason = "nothing fits the budget; fastest"
+        decision = {
+            'time': time.time(),
+            'tokens': tokens,
+            'latency_budget': budget,
+            'backend': backend,
+            'reason': reason,
+            'estimates': estimates,
+            'resident': {n: bool(i.get('resident')) for n, i in candidates.items() if i.get('available')},
+            'queue_depth': {n: i.get('queue_depth', 0) for n, i in candidates.items() if i.get('available')}
+        }
+        with self._lock:
+            self._decisions.append(decision)
+        print(f"[Router] {tokens} tokens, budget {f'{budget:.0f}s' if budget else 'none'} -> {backend} ({reason}; estimates {estimates})")
+        return decision
+
+    def observe(self, backend, tokens, seconds):
+        """Fold an observed call (excluding cache hits) into the latency estimate for backend."""
+        rate = seconds / max(tokens / 1000.0, MIN_BILLED_1K)
+        with self._lock:
+            previous = self._rates.get(backend, rate)
+            self._rates[backend] = (1 - self.smoothing) * previous + self.smoothing * rate
+            self._observations[backend] = self._observations.get(backend, 0) + 1
+
+    def recent_decisions(self, limit=50):
+        with self._lock:
+            return list(self._decisions)[-limit:]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'short_tokens': self.short_tokens,
+                'long_tokens': self.long_tokens,
+                'latency_budget': self.latency_budget,
+                'seconds_per_1k_tokens': {k: round(v, 3) for k, v in self._rates.items()},
+                'observations': dict(self._observations),
+                'decisions': len(self._decisions)
+            }
+
+
+# Shared instance for the whole process
+backend_router = BackendRouter()
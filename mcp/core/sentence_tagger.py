@@ -0,0 +1,261 @@
+"""
+Sentence segmentation and keyword tagging shared by the rule-based extractors.
+- split_sentences: splits on sentence-ending punctuation followed by whitespace and on line breaks,
+  so decimals, versions ("v1.2"), URLs, initials and common abbreviations stay inside one sentence;
+  the one segmenter of mcp.core (chunking and the extractive summarizer use it with keep_periods)
+- SentenceTagger: the terms of every requested category (action, risk, follow-up, ...) form one
+  compiled alternation, scanned once over the whole lower-cased text; each match reports every category
+  whose terms match there (including terms overlapping it), hits are mapped to sentences by offset,
+  and only the sentences a caller asks for are materialized
+- Matching keeps the substring, case-insensitive semantics of the `any(k in line.lower() ...)` loops
+  it replaces; categories may also be given as regular expressions
+"""
+import bisect
+import functools
+import re
+
+ACTION_KEYWORDS = ('fix', 'complete', 'implement', 'create', 'update', 'assign', 'test', 'review', 'prepare', 'set up', 'ensure')
+# Explicit references to tasks; extractors working on model output also accept these
+TASK_KEYWORDS = ('action item', 'task')
+RISK_KEYWORDS = ('delay', 'delayed', 'blocked', 'pending', 'cannot', 'error')
+FOLLOWUP_PATTERNS = (
+    r"follow[- ]?up meeting",
+    r"schedule (another|a) meeting",
+    r"need to (meet|discuss) again",
+    r"set up (a|another) meeting",
+    r"next meeting",
+    r"reconvene",
+    r"continue discussion"
+)
+
+# A period ends a sentence unless it closes an initial or a common abbreviation; '!' and '?' always do.
+# Only punctuation followed by whitespace (or the end) counts, so "3.5" and "v1.2" are never split.
+# Every branch starts at a boundary character, so the lookbehinds only run at candidate boundaries;
+# the whitespace after a boundary (a line break after a period, say) belongs to it.
+_SENTENCE_END = re.compile(
+    r"[.!?\n](?:"
+    r"(?<=\.)(?<!\b[A-Za-z]\.)(?<!\bMr\.)(?<!\bMs\.)(?<!\bDr\.)(?<!\bMrs\.)(?<!\bvs\.)(?<!\be\.g\.)(?<!\bi\.e\.)\.*(?=\s|$)"
+    r"|(?<=[!?])[!?]*(?=\s|$)"
+    r"|(?<=\n)"
+    r")\s*"
+)
+
+
+def _segments(text, keep_periods=False):
+    """(starts, ends) offsets of the raw sentence segments of text (unstripped, possibly blank)."""
+    kept = "!?." if keep_periods else "!?"
+    starts, ends = [0], []
+    for m in _SENTENCE_END.finditer(text):
+        ends.append(m.end() if text[m.start()] in kept else m.start())
+        starts.append(m.end())
+    ends.append(len(text))
+    return starts, ends
+
+
+def split_sentences(text, keep_periods=False):
+    """
+    Non-empty sentences of text, stripped; '!' and '?' are kept, terminating periods only with
+    keep_periods (for callers that rejoin the sentences, e.g. chunking).
+    """
+    starts, ends = _segments(text, keep_periods)
+    return [s for s in (text[a:b].strip() for a, b in zip(starts, ends)) if s]
+
+
+_REGEX_META = set(".^$*+?{}[]()|\\")
+
+
+def _lead(pattern):
+    """Literal text every match of a regular expression starts with ('' when it cannot be told)."""
+    depth, in_class, i = 0, False, 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == '\\':
+            i += 1
+        elif in_class:
+            in_class = ch != ']'
+        elif ch == '[':
+            in_class = True
+        elif ch in '()':
+            depth += 1 if ch == '(' else -1
+        elif ch == '|' and depth == 0:
+            return ''
+        i += 1
+    lead = []
+    for ch in pattern:
+        if ch in _REGEX_META:
+            # A quantifier makes the character before it optional
+            if ch in '?*{' and lead:
+                lead.pop()
+            break
+        lead.append(ch)
+    return ''.join(lead)
+
+
+def _overlaps(tail, lead):
+    """True if a term starting with lead can start where the text tail starts."""
+    return tail.startswith(lead) or lead.startswith(tail)
+
+
+def _trie_alternatives(literals):
+    """
+    Top-level alternatives of a regular expression matching literals ({literal: marker group name})
+    with shared prefixes factored out; the longest literal at a position wins, and the name of the
+    empty group after it (match.lastgroup) tells which one matched.
+    """
+    trie = {}
+    for literal, marker in literals.items():
+        node = trie
+        for ch in literal:
+            node = node.setdefault(ch, {})
+        node[''] = marker
+
+    def alternatives(node):
+        alts = [re.escape(ch) + branch(node[ch]) for ch in sorted(node) if ch]
+        if '' in node:
+            alts.append(f"(?P<{node['']}>)")
+        return alts
+
+    def branch(node):
+        alts = alternatives(node)
+        return alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+
+    return alternatives(trie)
+
+
+class _Automaton:
+    def __init__(self, keywords, patterns, flags):
+        """
+        One compiled alternation over every term of the given categories ({category: terms}), each
+        term followed by an empty marker group naming it. Patterns come first and literals share a
+        prefix trie; every alternative starts with a literal character when the patterns do, so the
+        regex engine skips ahead to candidate positions without trying the alternation.
+        """
+        literal_categories = {}
+        for name, terms in keywords.items():
+            for t in terms:
+                literal_categories.setdefault(t, set()).add(name)
+        self._literal_terms = [(u, frozenset(names), re.compile(re.escape(u), flags))
+                               for u, names in literal_categories.items()]
+        self._pattern_terms = []  # (literal lead, categories, compiled pattern)
+        self._pattern_categories = {}
+        alternatives = []
+        for j, (name, pattern) in enumerate((n, p) for n, terms in patterns.items() for p in terms):
+            marker = f"_p{j}"
+            self._pattern_categories[marker] = frozenset((name,))
+            self._pattern_terms.append((_lead(pattern).lower(), frozenset((name,)), re.compile(pattern, flags)))
+            alternatives.append(f"(?:{pattern})(?P<{marker}>)")
+        literals = {u: f"_k{j}" for j, u in enumerate(literal_categories)}
+        self._plans = {literals[u]: self._plan(u) for u in literal_categories}
+        self.regex = re.compile("|".join(alternatives + _trie_alternatives(literals)), flags)
+        self._pattern_plan = functools.lru_cache(maxsize=1024)(self._plan)
+
+    def _plan(self, text, own=frozenset(), first=1):
+        """
+        (categories, checks) for a match of text: own plus the categories of the literals inside it,
+        and an (offset, categories, compiled term) check for every term of another category that may
+        start inside it and run past its end. At offset 0 only a pattern's match needs checks, since
+        patterns are tried first and a longer literal would have won.
+        """
+        found = own.union(*(names for _, names, term in self._literal_terms if term.search(text)))
+        lowered = text.lower()
+        checks = []
+        for k in range(first, len(text)):
+            tail = lowered[k:]
+            checks += [(k, names, term) for u, names, term in self._literal_terms
+                       if names - found and len(u) > len(tail) and u.startswith(tail)]
+            checks += [(k, names, term) for lead, names, term in self._pattern_terms
+                       if names - found and _overlaps(tail, lead)]
+        return found, tuple(checks)
+
+    def tags(self, haystack, starts):
+        """
+        {segment index: categories found in it} in one pass over haystack, segments given by their
+        start offsets; overlapping terms are all reported.
+        """
+        plans = self._plans
+        tags = {}
+        for m in self.regex.finditer(haystack):
+            start, marker = m.start(), m.lastgroup
+            if marker in plans:
+                found, checks = plans[marker]
+            else:
+                found, checks = self._pattern_plan(m.group(), self._pattern_categories[marker], 0)
+            for k, names, term in checks:
+                if not names <= found and term.match(haystack, start + k):
+                    found = found | names
+            i = bisect.bisect_right(starts, start) - 1
+            if i in tags:
+                tags[i] |= found
+            else:
+                tags[i] = set(found)
+        return tags
+
+
+class SentenceTagger:
+    def __init__(self, keywords=None, patterns=None):
+        """
+        keywords: {category: literal keywords}; patterns: {category: regular expressions}.
+        A sentence gets a category when it contains any of that category's terms.
+        """
+        self._keywords = {name: tuple(t.lower() for t in terms) for name, terms in (keywords or {}).items()}
+        self._patterns = {name: tuple(terms) for name, terms in (patterns or {}).items()}
+        self.categories = tuple(dict.fromkeys((*self._keywords, *self._patterns)))
+        # Without upper-case letters (which includes escapes like \S or \W) a pattern matches
+        # lower-cased text exactly as it matches the original with IGNORECASE
+        self._lowerable = {name for name in self.categories
+                           if all(t == t.lower() for t in self._patterns.get(name, ()))}
+        self._automata = {}
+
+    def _automaton(self, categories, lowered):
+        key = (categories, lowered)
+        if key not in self._automata:
+            self._automata[key] = _Automaton(
+                {name: self._keywords[name] for name in categories if name in self._keywords},
+                {name: self._patterns[name] for name in categories if name in self._patterns},
+                0 if lowered else re.IGNORECASE
+            )
+        return self._automata[key]
+
+    def _scanner(self, text, categories):
+        """(automaton, haystack) for categories; haystack offsets are those of text."""
+        categories = tuple(categories or self.categories)
+        # Terms are matched case-sensitively against the lower-cased text, which is much faster than
+        # IGNORECASE; the IGNORECASE form covers texts whose lower-casing changes their length
+        lowered = text.lower()
+        if len(lowered) == len(text) and self._lowerable.issuperset(categories):
+            return self._automaton(categories, True), lowered
+        return self._automaton(categories, False), text
+
+    def _tags(self, text, categories, starts):
+        """{segment index: categories} of the segments containing a match."""
+        automaton, haystack = self._scanner(text, categories)
+        return automaton.tags(haystack, starts)
+
+    def tag(self, text, categories=None):
+        """[(sentence, {categories})] for every sentence in text, in order."""
+        starts, ends = _segments(text)
+        tags = self._tags(text, categories, starts)
+        tagged = ((text[starts[i]:ends[i]].strip(), tags.get(i) or set()) for i in range(len(starts)))
+        return [(sentence, found) for sentence, found in tagged if sentence]
+
+    def select(self, text, *categories, min_words=0):
+        """Sentences of text tagged with any of categories (and at least min_words words), in order."""
+        starts, ends = _segments(text)
+        selected = []
+        for i in sorted(self._tags(text, categories, starts)):
+            sentence = text[starts[i]:ends[i]].strip()
+            if sentence and (not min_words or len(sentence.split()) >= min_words):
+                selected.append(sentence)
+        return selected
+
+    def matches(self, text, *categories):
+        """True if text contains a term of any of categories (no segmentation)."""
+        automaton, haystack = self._scanner(text, categories)
+        return automaton.regex.search(haystack) is not None
+
+
+# Shared instance for the whole process
+meeting_tagger = SentenceTagger(
+    keywords={'action': ACTION_KEYWORDS, 'task': TASK_KEYWORDS, 'risk': RISK_KEYWORDS},
+    patterns={'followup': FOLLOWUP_PATTERNS}
+)
@@ -0,0 +1,79 @@
+"""
+Single-flight coalescing of identical concurrent work.
+- The first caller for a key (the leader) runs the computation; callers arriving while it is in
+  flight wait for the same result instead of running the model again
+- Works across threads and event loops: the shared handle is a concurrent.futures.Future,
+  awaited with asyncio.wrap_future by async callers
+- Keys are dropped as soon as the computation finishes; later calls are served by the summary cache
+"""
+import asyncio
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.coalesced = 0
+
+    def join(self, key):
+        """Returns (is_leader, future). A leader must finish the key with resolve() or fail()."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return False, future
+            future = Future()
+            self._calls[key] = future
+            self.leaders += 1
+            return True, future
+
+    def resolve(self, key, result):
+        with self._lock:
+            future = self._calls.pop(key, None)
+        if future is not None:
+            future.set_result(result)
+
+    def fail(self, key, error):
+        with self._lock:
+            future = self._calls.pop(key, None)
+        if future is not None:
+            future.set_exception(error)
+
+    def do(self, key, fn, *args, **kwargs):
+        """Blocking: run fn once per concurrent key and share its result (or exception)."""
+        leader, future = self.join(key)
+        if not leader:
+            print(f"[SingleFlight] Waiting on in-flight computation ({str(key)[:12]})")
+            return future.result()
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            self.fail(key, e)
+            raise
+        self.resolve(key, result)
+        return result
+
+    async def do_async(self, key, coro_fn, *args, **kwargs):
+        """Async variant: coro_fn(*args, **kwargs) is awaited by the leader only."""
+        leader, future = self.join(key)
+        if not leader:
+            print(f"[SingleFlight] Waiting on in-flight computation ({str(key)[:12]})")
+            return await asyncio.wrap_future(future)
+        try:
+            result = await coro_fn(*args, **kwargs)
+        except BaseException as e:
+            self.fail(key, e)
+            raise
+        self.resolve(key, result)
+        return result
+
+    def stats(self):
+        with self._lock:
+            return {'in_flight': len(self._calls), 'leaders': self.leaders, 'coalesced': self.coalesced}
+
+
+# Shared instance for the whole process
+single_flight = SingleFlight()
@@ -0,0 +1,43 @@
+"""
+Shared spaCy pipeline, loaded on first use.
+- spaCy and the model are imported only when text is first parsed, so importing the task
+  extraction modules stays cheap; every caller in the process shares one loaded pipeline
+- Components nothing here uses are excluded at load time; each caller runs only the components
+  its profile needs (disabled per call, so callers never interfere with each other)
+- pipe() batches texts through nlp.pipe and can fan out to worker processes for bulk jobs
+"""
+import functools
+import os
+
+# Never used by the extractors; not loaded at all
+EXCLUDED_COMPONENTS = ("lemmatizer",)
+# Components each extractor needs; everything else is skipped for its calls
+PROFILES = {
+    'entities': ("tok2vec", "ner"),
+    'tasks': ("tok2vec", "tagger", "parser", "attribute_ruler", "ner")
+}
+
+
+@functools.lru_cache(maxsize=None)
+def get_nlp(model=None):
+    import spacy
+    model = model or os.environ.get("SPACY_MODEL", "en_core_web_sm")
+    print(f"[spaCy] Loading pipeline '{model}'")
+    return spacy.load(model, exclude=list(EXCLUDED_COMPONENTS))
+
+
+def pipe(texts, profile=None, batch_size=None, n_process=None):
+    """
+    Docs for texts, in order, parsed in batches of batch_size (SPACY_BATCH_SIZE env, 64).
+    profile: a PROFILES key; components outside it are disabled for this call.
+    n_process: worker processes (SPACY_N_PROCESS env, 1); worth it only for many documents.
+    """
+    nlp = get_nlp()
+    keep = PROFILES.get(profile)
+    disable = [name for name in nlp.pipe_names if keep and name not in keep]
+    return nlp.pipe(
+        texts,
+        batch_size=batch_size or int(os.environ.get("SPACY_BATCH_SIZE", "64")),
+        n_process=n_process or int(os.environ.get("SPACY_N_PROCESS", "1")),
+        disable=disable
+    )
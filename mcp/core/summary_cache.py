@@ -0,0 +1,161 @@
+"""
+Content-addressed summary cache.
+- Key: hash of the normalized transcript, summarization mode, prompt template and model revision
+- Tier 1: in-memory LRU (SUMMARY_CACHE_MEMORY_ENTRIES entries)
+- Tier 2: JSON files under mcp/data/summary_cache, evicted oldest-first above SUMMARY_CACHE_MAX_MB
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from mcp.core.context_handler import DATA_DIR
+
+MODEL_REVISION_FILES = ('config.json', 'generation_config.json')
+WEIGHT_FILE_SUFFIXES = ('.safetensors', '.bin', '.pt', '.pth', '.onnx')
+
+
+def normalize_transcript(transcript):
+    """Collapse whitespace so re-fetched copies of the same meeting hash identically."""
+    return ' '.join((transcript or '').split())
+
+
+def model_revision(model_path):
+    """
+    Cheap revision id for a local model directory: a hash of its config/weight file
+    names, sizes and mtimes. Re-training or swapping weights changes it.
+    """
+    if not model_path or not os.path.exists(model_path):
+        return str(model_path)
+    h = hashlib.sha1()
+    for root, _, files in sorted(os.walk(model_path)):
+        for name in sorted(files):
+            if name in MODEL_REVISION_FILES or name.endswith(WEIGHT_FILE_SUFFIXES):
+                st = os.stat(os.path.join(root, name))
+                h.update(f"{os.path.relpath(os.path.join(root, name), model_path)}:{st.st_size}:{int(st.st_mtime)}".encode('utf-8'))
+    return h.hexdigest()
+
+
+class SummaryCache:
+    def __init__(self, cache_dir=None, max_memory_entries=None, max_disk_bytes=None):
+        self.cache_dir = cache_dir or os.path.join(DATA_DIR, 'summary_cache')
+        self.max_memory_entries = max_memory_entries if max_memory_entries is not None else int(os.environ.get("SUMMARY_CACHE_MEMORY_ENTRIES", "256"))
+        self.max_disk_bytes = max_disk_bytes if max_disk_bytes is not None else int(float(os.environ.get("SUMMARY_CACHE_MAX_MB", "256")) * 1024 * 1024)
+        self._memory = OrderedDict()
+        self._disk_index = None  # key -> (size, last_access), built lazily from cache_dir
+        self._lock = threading.RLock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(transcript, mode, prompt_template='', model_revision=''):
+        h = hashlib.sha256()
+        for part in (normalize_transcript(transcript), mode or '', prompt_template or '', model_revision or ''):
+            h.update(part.encode('utf-8'))
+            h.update(b'\0')
+        return h.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f'{key}.json')
+
+    def _load_disk_index(self):
+        if self._disk_index is not None:
+            return
+        self._disk_index = {}
+        os.makedirs(self.cache_dir, exist_ok=True)
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.json'):
+                st = os.stat(os.path.join(self.cache_dir, name))
+                self._disk_index[name[:-len('.json')]] = (st.st_size, st.st_mtime)
+
+    def get(self, key):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return self._memory[key]
+            self._load_disk_index()
+            if key in self._disk_index:
+                try:
+                    with open(self._path(key), 'r', encoding='utf-8') as f:
+                        value = json.load(f)['value']
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"[SummaryCache] Dropping unreadable entry {key}: {e}")
+                    self._disk_index.pop(key, None)
+                else:
+                    now = time.time()
+                    os.utime(self._path(key), (now, now))
+                    self._disk_index[key] = (self._disk_index[key][0], now)
+                    self.disk_hits += 1
+                    self._remember(key, value)
+                    return value
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        with self._lock:
+            self._remember(key, value)
+            self._load_disk_index()
+            path = self._path(key)
+            tmp_path = f'{path}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'value': value, 'created_at': time.time()}, f)
+            os.replace(tmp_path, path)
+            self._disk_index[key] = (os.path.getsize(path), time.time())
+            self.stores += 1
+            self._evict_disk()
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self):
+        total = sum(size for size, _ in self._disk_index.values())
+        for key, (size, _) in sorted(self._disk_index.items(), key=lambda kv: kv[1][1]):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+            del self._disk_index[key]
+            total -= size
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._load_disk_index()
+            for key in list(self._disk_index):
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+            self._disk_index = {}
+
+    def stats(self):
+        with self._lock:
+            self._load_disk_index()
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                'stores': self.stores,
+                'evictions': self.evictions,
+                'memory_entries': len(self._memory),
+                'disk_entries': len(self._disk_index),
+                'disk_bytes': sum(size for size, _ in self._disk_index.values())
+            }
+
+
+# Shared instance for the whole process
+summary_cache = SummaryCache()
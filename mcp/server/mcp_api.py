@@ -1,10 +1,23 @@
 # MCP API for summarization (mcep_api.py)
+import asyncio
+import json
 from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from mcp.core.mcp import MCPHost
+from mcp.core.model_registry import model_registry
+from mcp.core.prefix_cache import prefix_kv_cache
+from mcp.core.summary_cache import summary_cache
+from mcp.core.inference_executor import inference_executor
+from mcp.core.llm_client import llm_client
+from mcp.core.jira_client import jira_clients
+from mcp.core.single_flight import single_flight
+from mcp.core.router import backend_router
 from mcp.tools.summarization_tool import SummarizationTool
 from mcp.agents.orchestrator_agent import OrchestratorAgent
+from mcp.agents.summarization_agent import SummarizationAgent
+from mcp.agents.rolling_summarizer import RollingSummarySession
 
 
 app = FastAPI()
@@ -17,30 +30,94 @@ orchestrator = OrchestratorAgent()
 class TranscriptIn(BaseModel):
     transcript: str
     meeting_id: str = "ui_session"
+    mode: str = None
+    latency_budget: float = None  # seconds; steers the 'auto' router
+
+class IncrementalIn(BaseModel):
+    meeting_id: str
+    segment: str = None      # newly appended text
+    transcript: str = None   # or the full re-fetched transcript; only its unseen suffix is processed
+    mode: str = None
+    final: bool = False
 
 class OrchestratorIn(BaseModel):
     query: str
     user: str
     date: str = None
     permissions: list = None
+    mode: str = None
+    latency_budget: float = None
 
 
 @app.post("/mcp/summarize")
 async def summarize(transcript_in: TranscriptIn):
     session_id = mcp_host.create_session(agent_id="ui_agent")
-    params = {"transcript": transcript_in.transcript, "meeting_id": transcript_in.meeting_id}
+    params = {"transcript": transcript_in.transcript, "meeting_id": transcript_in.meeting_id, "latency_budget": transcript_in.latency_budget}
+    if transcript_in.mode:
+        params["mode"] = transcript_in.mode
     result = await mcp_host.execute_tool(session_id, tool_id="summarization", parameters=params)
     mcp_host.end_session(session_id)
     return result
 
+@app.post("/mcp/summarize/stream")
+async def summarize_stream(transcript_in: TranscriptIn):
+    """Server-Sent Events: 'token' events while generating, then one 'summary' event with the full result."""
+    agent = SummarizationAgent(mode=transcript_in.mode or summ_tool.mode)
+
+    def events():
+        # Sync generator: Starlette iterates it in a worker thread, off the event loop
+        try:
+            for event in agent.stream_summary(transcript_in.meeting_id, transcript_in.transcript, latency_budget=transcript_in.latency_budget):
+                if 'token' in event:
+                    yield f"data: {json.dumps({'token': event['token']})}\n\n"
+                else:
+                    yield f"event: summary\ndata: {json.dumps(event['result'])}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+@app.post("/mcp/summarize/incremental")
+async def summarize_incremental(incremental_in: IncrementalIn):
+    """Rolling summary for a growing transcript: only new complete chunks are summarized."""
+    def update():
+        session = RollingSummarySession(incremental_in.meeting_id, mode=incremental_in.mode)
+        if incremental_in.transcript is not None:
+            return session.sync(incremental_in.transcript, final=incremental_in.final)
+        return session.append(incremental_in.segment or "", final=incremental_in.final)
+    return await asyncio.to_thread(update)
+
 # New endpoint for orchestrator agent
 @app.post("/mcp/orchestrate")
 async def orchestrate(orchestrator_in: OrchestratorIn):
-    # Call the orchestrator agent's handle_query method
-    result = orchestrator.handle_query(
+    # Call the orchestrator agent's handle_query method (blocking: calendar I/O + model calls)
+    result = await asyncio.to_thread(
+        orchestrator.handle_query,
         query=orchestrator_in.query,
         user=orchestrator_in.user,
         date=orchestrator_in.date,
-        permissions=orchestrator_in.permissions
+        permissions=orchestrator_in.permissions,
+        mode=orchestrator_in.mode,
+        latency_budget=orchestrator_in.latency_budget
     )
     return result
+
+@app.get("/mcp/router/decisions")
+async def router_decisions(limit: int = 50):
+    # Audit log of 'auto' routing decisions, with the estimates each was based on
+    return dict(backend_router.stats(), recent=backend_router.recent_decisions(limit))
+
+@app.get("/mcp/models/stats")
+async def model_stats():
+    # Load/hit/eviction counters and resident bytes of the shared model registry
+    return dict(model_registry.stats(), prefix_cache=prefix_kv_cache.stats())
+
+@app.get("/mcp/cache/stats")
+async def cache_stats():
+    # Hit/miss counters and size of the two-tier summary cache
+    return dict(summary_cache.stats(), single_flight=single_flight.stats())
+
+@app.get("/health")
+async def health():
+    # Never touches the models, so it stays responsive while inference is queued
+    return {"status": "ok", "inference": inference_executor.stats(), "llm": llm_client.stats(), "jira": jira_clients.stats()}
@@ -0,0 +1,72 @@
+import pytest
+
+from mcp.core.chunking import TranscriptChunker, count_tokens, split_turns
+
+TRANSCRIPT = "\n".join(
+    f"{speaker}: We reviewed item {i} of the release. The rollout to region {i} is planned for next week. "
+    f"Please confirm the owner of task {i}."
+    for i, speaker in enumerate(["Alice", "Bob", "Chen", "Dana"] * 5)
+)
+
+
+def test_chunks_fit_the_budget_and_keep_all_text():
+    chunker = TranscriptChunker(max_tokens=60)
+    chunks = list(chunker.chunks(TRANSCRIPT))
+    assert len(chunks) > 1
+    assert all(count_tokens(None, c) <= 60 for c in chunks)
+    assert " ".join(" ".join(chunks).split()) == " ".join(TRANSCRIPT.split())
+
+
+def test_chunks_start_on_speaker_turns_when_turns_fit():
+    chunks = list(TranscriptChunker(max_tokens=60).chunks(TRANSCRIPT))
+    assert all(c.split(":")[0] in ("Alice", "Bob", "Chen", "Dana") for c in chunks)
+
+
+def test_long_turns_are_cut_on_sentences():
+    turn = "Alice: " + " ".join(f"Sentence number {i} is here." for i in range(40))
+    chunks = list(TranscriptChunker(max_tokens=20).chunks(turn))
+    assert all(count_tokens(None, c) <= 20 for c in chunks)
+    assert all(c.endswith(".") for c in chunks)
+
+
+def test_overlap_repeats_trailing_units():
+    short_turns = "\n".join(f"Alice: note {i} for the team." for i in range(12))
+    chunks = list(TranscriptChunker(max_tokens=24, overlap_tokens=8).chunks(short_turns))
+    assert len(chunks) > 1
+    assert all(chunks[i].splitlines()[-1] == chunks[i + 1].splitlines()[0] for i in range(len(chunks) - 1))
+
+
+def test_split_turns_groups_continuation_lines():
+    assert split_turns("Alice: one\ncontinued\nBob: two") == ["Alice: one\ncontinued", "Bob: two"]
+
+
+def test_budget_must_be_positive():
+    with pytest.raises(ValueError):
+        TranscriptChunker(max_tokens=0)
+
+
+GIANT_SENTENCE = "Alice: " + " ".join(f"interoperability{i}" for i in range(400))
+
+
+def test_one_giant_sentence_is_split_within_the_budget():
+    chunks = list(TranscriptChunker(max_tokens=50).chunks(GIANT_SENTENCE))
+    assert len(chunks) > 1
+    assert all(count_tokens(None, c) <= 50 for c in chunks)
+    assert " ".join(chunks).split() == GIANT_SENTENCE.split()
+
+
+class WordTokenizer:
+    """One token per word; decoding adds a trailing marker token, so windows re-tokenize longer."""
+
+    def __call__(self, text, add_special_tokens=False):
+        return {'input_ids': text.split()}
+
+    def decode(self, ids, skip_special_tokens=True):
+        return " ".join(ids) + " ~"
+
+
+def test_emit_splits_a_single_unit_over_budget():
+    chunker = TranscriptChunker(WordTokenizer(), max_tokens=10)
+    pieces = list(chunker._emit([("\n", GIANT_SENTENCE, 1)]))
+    assert all(count_tokens(chunker.tokenizer, p) <= 10 for p in pieces)
+    assert [w for p in pieces for w in p.split() if w != "~"] == GIANT_SENTENCE.split()
@@ -0,0 +1,98 @@
+import json
+
+from mcp.core.constrained_decoding import JSONSchemaLogitsProcessor, SchemaMatcher, SUMMARY_SCHEMA
+
+SMALL_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "summary": {"type": "array", "maxItems": 2, "items": {"type": "string", "maxLength": 5}}
+    }
+}
+
+
+def test_accepts_a_complete_summary_document():
+    matcher = SchemaMatcher(SUMMARY_SCHEMA)
+    doc = {
+        "summary": ["Ship v1.2", "Q3 looks fine"],
+        "decisions": [],
+        "action_items": [{"task": "Fix login", "description": "Reset \"tokens\"\n", "owner": "Alice", "deadline": "Fri"}],
+        "risks": []
+    }
+    state = matcher.advance(matcher.initial_state, json.dumps(doc, indent=1))
+    assert SchemaMatcher.is_complete(state)
+
+
+def test_rejects_documents_outside_the_schema():
+    matcher = SchemaMatcher(SUMMARY_SCHEMA)
+    start = matcher.initial_state
+    # Properties are required, in schema order
+    assert matcher.advance(start, '{"decisions"') is None
+    assert matcher.advance(start, '{"summary": [1') is None
+    assert matcher.advance(start, 'Sure! {') is None
+
+
+def test_enforces_max_items_and_max_length():
+    matcher = SchemaMatcher(SMALL_SCHEMA)
+    start = matcher.initial_state
+    assert SchemaMatcher.is_complete(matcher.advance(start, '{"summary": ["abcde", "\\u00e9"]}'))
+    assert matcher.advance(start, '{"summary": ["abcdef"') is None
+    assert matcher.advance(start, '{"summary": ["a", "b", "c"') is None
+
+
+def test_string_budget_counts_remaining_characters():
+    matcher = SchemaMatcher(SMALL_SCHEMA)
+    inside = matcher.advance(matcher.initial_state, '{"summary": ["ab')
+    assert SchemaMatcher.string_budget(inside) == 3
+    assert not SchemaMatcher.is_complete(inside)
+    assert SchemaMatcher.string_budget(matcher.advance(matcher.initial_state, '{"summary": [')) is None
+
+
+class CharTokenizer:
+    """Tiny vocabulary: every printable character plus a few words; id 0 is EOS."""
+    eos_token_id = 0
+    all_special_ids = [0]
+
+    def __init__(self):
+        self.surfaces = [''] + [chr(c) for c in range(32, 127)] + ['\n', 'meeting ', 'release ', '"],']
+
+    def __len__(self):
+        return len(self.surfaces)
+
+    def encode(self, text, add_special_tokens=False):
+        return [self.surfaces.index(c) for c in text]
+
+    def decode(self, ids):
+        return ''.join(self.surfaces[i] for i in ids)
+
+    def batch_decode(self, rows):
+        return [self.decode(row) for row in rows]
+
+
+def verbose_model(processor, tokenizer, max_new_tokens, remaining_known=True):
+    """Greedy stand-in that keeps writing: longest words, then new items, never closing by choice."""
+    matcher = processor.matcher
+    state = matcher.initial_state
+    for step in range(max_new_tokens):
+        ids, budget = processor.row_allowed(state, max_new_tokens - step if remaining_known else None)
+        if budget:
+            ids = ids + [i for i in processor.index.plain_ids if len(tokenizer.surfaces[i]) <= budget]
+        if ids == [tokenizer.eos_token_id]:
+            break
+        choices = [i for i in ids if tokenizer.surfaces[i] not in ' \n']
+        best = max(choices, key=lambda i: (tokenizer.surfaces[i] == ',', len(tokenizer.surfaces[i]), tokenizer.surfaces[i] not in '"]}'))
+        state = matcher.advance(state, tokenizer.surfaces[best])
+    return state
+
+
+def test_document_is_closed_before_the_token_limit():
+    tokenizer = CharTokenizer()
+    processor = JSONSchemaLogitsProcessor(tokenizer, SUMMARY_SCHEMA, max_new_tokens=300)
+    assert not SchemaMatcher.is_complete(verbose_model(processor, tokenizer, 300, remaining_known=False))
+    assert SchemaMatcher.is_complete(verbose_model(processor, tokenizer, 300))
+
+
+def test_closing_text_completes_any_prefix():
+    matcher = SchemaMatcher(SUMMARY_SCHEMA)
+    for prefix in ('', '{"summary": ["Ship', '{"summary": ["a\\', '{"summary": ["\\u00', '{"summary": [], "decisions": [{"decision": "x", "rea'):
+        state = matcher.advance(matcher.initial_state, prefix)
+        assert SchemaMatcher.is_complete(matcher.advance(state, matcher.closing_text(state)))
@@ -0,0 +1,38 @@
+from mcp.core.dedup import MinHashLSH, dedupe_records, dedupe_texts, jaccard, shingles
+
+
+def test_clusters_near_duplicates_only():
+    texts = [
+        "Alice will fix the login bug before Friday",
+        "Bob prepares the migration plan",
+        "Alice will fix the login bug before Friday.",
+        "The vendor integration is blocked",
+    ]
+    assert MinHashLSH(threshold=0.5).cluster(texts) == [[0, 2], [1], [3]]
+
+
+def test_candidates_are_confirmed_by_exact_jaccard():
+    a, b = shingles("prepare the release notes"), shingles("prepare the release notes today")
+    assert 0.5 < jaccard(a, b) < 1.0
+    assert MinHashLSH(threshold=0.99).cluster(["prepare the release notes", "prepare the release notes today"]) == [[0], [1]]
+
+
+def test_dedupe_texts_keeps_longest_in_first_occurrence_order():
+    texts = ["Ship the release", "Review the budget", "Ship the release!", "", "Review the budget now"]
+    assert dedupe_texts(texts, threshold=0.5) == ["Ship the release!", "Review the budget now"]
+
+
+def test_dedupe_records_merges_owners_and_keeps_one_description():
+    items = [
+        {'task': "Fix the login bug", 'description': "Tokens expire early", 'owner': "Alice"},
+        {'task': "Fix the login bug", 'description': "Tokens expire too early on mobile", 'owner': "Bob"},
+        {'task': "Write the Q3 report", 'owner': "Chen"},
+    ]
+    merged = dedupe_records(items, 'task', threshold=0.5)
+    assert merged[0] == {'task': "Fix the login bug", 'description': "Tokens expire too early on mobile", 'owner': "Alice, Bob"}
+    assert merged[1] == items[2]
+
+
+def test_dedupe_records_keeps_string_members_of_mixed_clusters():
+    items = [{'task': "Fix the login bug", 'owner': "Alice"}, "Fix the login bug today!"]
+    assert dedupe_records(items, 'task', threshold=0.5) == [{'task': "Fix the login bug today!", 'owner': "Alice"}]
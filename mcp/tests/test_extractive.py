@@ -0,0 +1,38 @@
+import pytest
+
+import mcp.core.extractive as extractive
+from mcp.core.chunking import count_tokens
+from mcp.core.extractive import extractive_filter, extractive_summary
+
+TRANSCRIPT = "\n".join(
+    f"{speaker}: Item {i} is on track. The release of module {i} needs a final review by Friday."
+    for i, speaker in enumerate(["Alice", "Bob", "Chen", "Dana"] * 4)
+)
+
+
+def by_length(sentences):
+    # Stand-in for TextRank: longer sentences are more central
+    return [len(s) for s in sentences]
+
+
+def test_filtered_text_fits_the_budget_including_speaker_labels(monkeypatch):
+    monkeypatch.setattr(extractive, "textrank_scores", by_length)
+    filtered, report = extractive_filter(TRANSCRIPT, 60)
+    assert count_tokens(None, filtered) == report['output_tokens'] <= 60
+    assert 0 < report['sentences_kept'] < report['sentences_total']
+    lines = filtered.splitlines()
+    assert all(line.split(":")[0] in ("Alice", "Bob", "Chen", "Dana") for line in lines)
+    # Transcript order is kept
+    assert [int(line.split("module ")[1].split()[0]) for line in lines] == sorted(int(line.split("module ")[1].split()[0]) for line in lines)
+
+
+def test_text_within_budget_is_returned_unchanged():
+    filtered, report = extractive_filter(TRANSCRIPT, 10_000)
+    assert filtered == TRANSCRIPT
+    assert report['compression_ratio'] == 1.0
+
+
+def test_textrank_prefers_sentences_that_share_content():
+    pytest.importorskip("numpy")
+    text = "The budget review is Friday. Lunch was nice. The budget review needs the Q3 numbers. Budget numbers for the review are late."
+    assert "Lunch was nice." not in extractive_summary(text, max_sentences=2)
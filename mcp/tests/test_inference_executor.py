@@ -0,0 +1,43 @@
+import asyncio
+import threading
+
+import pytest
+
+from mcp.core.inference_executor import InferenceBusyError, InferenceExecutor
+
+
+def test_full_queue_rejects_instead_of_piling_up():
+    executor = InferenceExecutor(max_workers=1, max_queue=1)
+    release = threading.Event()
+    running = executor.submit(release.wait, 5)
+    queued = executor.submit(lambda: "queued")
+    with pytest.raises(InferenceBusyError):
+        executor.submit(lambda: "rejected")
+    assert executor.stats()['rejected'] == 1
+    release.set()
+    assert running.result(5) is True
+    assert queued.result(5) == "queued"
+    assert executor.submit(lambda: "accepted").result(5) == "accepted"
+    assert executor.stats()['completed'] == 3
+
+
+def test_nested_calls_run_inline_on_the_worker():
+    executor = InferenceExecutor(max_workers=1, max_queue=0)
+
+    def outer():
+        # With one worker and no queue, a nested submit would deadlock or be rejected
+        return executor.call(lambda: threading.current_thread().name), threading.current_thread().name
+
+    inner_thread, outer_thread = executor.call(outer)
+    assert inner_thread == outer_thread
+    assert outer_thread.startswith("inference")
+    assert not executor.in_worker()
+
+
+def test_async_run_awaits_the_pool():
+    executor = InferenceExecutor(max_workers=2, max_queue=0)
+
+    async def main():
+        return await asyncio.gather(*(executor.run(lambda n=n: n * 2) for n in range(2)))
+
+    assert asyncio.run(main()) == [0, 2]
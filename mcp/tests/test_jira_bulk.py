@@ -0,0 +1,65 @@
+from types import SimpleNamespace
+
+import mcp.core.jira_bulk as jira_bulk
+from mcp.core.jira_bulk import create_issues_bulk
+from mcp.core.jira_client import JiraClientProvider
+from scripts.fake_jira import FakeJira
+
+
+class FakeJiraClient:
+    """jira.JIRA.create_issues over the shared FakeJira, mapping its issue/bulk response the way the jira package does."""
+
+    def __init__(self, fake=None, fail_with=None):
+        self.fake = fake or FakeJira()
+        self.fail_with = fail_with
+        self.calls = []
+
+    def create_issues(self, field_list, prefetch=True):
+        self.calls.append((len(field_list), prefetch))
+        if self.fail_with is not None:
+            raise self.fail_with
+        _, body = self.fake.create_bulk([{'fields': f} for f in field_list], "http://fake")
+        errors = {e['failedElementNumber']: e['elementErrors']['errors'] for e in body['errors']}
+        issues = iter(body['issues'])
+        outcomes = []
+        for index, fields in enumerate(field_list):
+            if index in errors:
+                outcomes.append({'status': 'Error', 'issue': None, 'error': errors[index], 'input_fields': fields})
+            else:
+                outcomes.append({'status': 'Success', 'issue': SimpleNamespace(**next(issues)), 'error': None, 'input_fields': fields})
+        return outcomes
+
+
+def test_one_request_per_chunk_with_results_in_input_order():
+    jira = FakeJiraClient()
+    fields = [{'summary': str(i) if i != 3 else ''} for i in range(7)]
+    results = create_issues_bulk(jira, fields, chunk_size=3)
+    assert jira.calls == [(3, False), (3, False), (1, False)]
+    assert [r['key'] for r in results] == ["PROJ-1", "PROJ-2", "PROJ-3", None, "PROJ-4", "PROJ-5", "PROJ-6"]
+    assert results[3]['error'] == "summary: You must specify a summary of the issue."
+
+
+def test_failed_chunk_marks_each_of_its_items():
+    jira = FakeJiraClient(fail_with=ConnectionError("connection reset"))
+    results = create_issues_bulk(jira, [{'summary': "a"}, {'summary': "b"}], chunk_size=50)
+    assert results == [{'key': None, 'error': "connection reset"}] * 2
+
+
+def test_only_connection_failures_drop_the_shared_client(monkeypatch):
+    provider = JiraClientProvider(health_check_seconds=60)
+    monkeypatch.setattr(jira_bulk, "jira_clients", provider)
+    jira = FakeJiraClient(fail_with=OSError("attachment could not be read"))
+    provider._client = jira
+    assert create_issues_bulk(jira, [{'summary': "a"}])[0]['error'] == "attachment could not be read"
+    assert provider.stats()['connected']
+    jira.fail_with = ConnectionError("connection refused")
+    create_issues_bulk(jira, [{'summary': "a"}])
+    assert not provider.stats()['connected'] and provider.stats()['reconnects'] == 1
+
+
+def test_chunk_size_defaults_to_jira_limit(monkeypatch):
+    monkeypatch.setenv("JIRA_BULK_MAX_ISSUES", "2")
+    jira = FakeJiraClient()
+    create_issues_bulk(jira, [{'summary': str(i)} for i in range(5)])
+    assert [n for n, _ in jira.calls] == [2, 2, 1]
+    assert create_issues_bulk(FakeJiraClient(), []) == []
@@ -0,0 +1,77 @@
+from types import SimpleNamespace
+
+import mcp.core.jira_client as jira_client
+from mcp.core.jira_client import JiraClientProvider, is_connection_error
+
+
+class FakeClient:
+    def __init__(self, provider, healthy=True):
+        self.provider = provider
+        self.healthy = healthy
+        self.lock_free_during_check = None
+
+    def myself(self):
+        # The provider's lock must not be held across the round-trip
+        self.lock_free_during_check = self.provider._lock.acquire(blocking=False)
+        if self.lock_free_during_check:
+            self.provider._lock.release()
+        if not self.healthy:
+            raise ConnectionError("connection reset")
+        return {'name': "fake"}
+
+
+def provider_with_clock(monkeypatch, connect=None):
+    clock = [1000.0]
+    monkeypatch.setattr(jira_client, "time", SimpleNamespace(monotonic=lambda: clock[0]))
+    provider = JiraClientProvider(health_check_seconds=60)
+    clients = []
+
+    def fake_connect():
+        provider.connects += 1
+        clients.append(FakeClient(provider))
+        return clients[-1]
+
+    monkeypatch.setattr(provider, "_connect", connect or fake_connect)
+    return provider, clients, clock
+
+
+def test_one_client_is_reused_until_it_is_invalidated(monkeypatch):
+    provider, clients, _ = provider_with_clock(monkeypatch)
+    first = provider.get()
+    assert provider.get() is first and provider.stats()['connects'] == 1
+    # A stale reference does not drop the current client
+    provider.invalidate(object(), "old client")
+    assert provider.get() is first
+    provider.invalidate(first, "connection reset")
+    assert provider.get() is clients[1]
+    assert provider.stats()['connects'] == 2 and provider.stats()['reconnects'] == 1
+
+
+def test_idle_client_is_health_checked_outside_the_lock(monkeypatch):
+    provider, clients, clock = provider_with_clock(monkeypatch)
+    first = provider.get()
+    clock[0] += 30
+    assert provider.get() is first and provider.stats()['health_checks'] == 0
+    clock[0] += 61
+    assert provider.get() is first and provider.stats()['health_checks'] == 1
+    assert first.lock_free_during_check
+    first.healthy = False
+    clock[0] += 61
+    assert provider.get() is clients[1]
+    assert provider.stats()['reconnects'] == 1 and provider.stats()['health_checks'] == 2
+
+
+def test_missing_configuration_is_retried_once_per_interval(monkeypatch):
+    attempts = []
+    provider, _, clock = provider_with_clock(monkeypatch, connect=lambda: attempts.append(1))
+    assert provider.get() is None and provider.get() is None
+    assert len(attempts) == 1
+    clock[0] += 61
+    provider.get()
+    assert len(attempts) == 2
+
+
+def test_connection_errors_are_told_apart_from_other_failures():
+    assert is_connection_error(ConnectionResetError("reset"))
+    assert not is_connection_error(OSError("attachment could not be read"))
+    assert not is_connection_error(ValueError("bad field"))
@@ -0,0 +1,26 @@
+from mcp.core.json_stream import IncrementalJSONScanner
+
+
+def test_captures_first_object_fed_in_pieces():
+    scanner = IncrementalJSONScanner()
+    pieces = ['Here you go:\n```json\n{"summary": ["a', ' {b}"], "n": {"x"', ': 1}}', '\n```\n{"second": 1}']
+    closed = [scanner.feed(p) for p in pieces]
+    assert closed == [False, False, True, True]
+    assert scanner.parsed() == {"summary": ["a {b}"], "n": {"x": 1}}
+
+
+def test_braces_and_escaped_quotes_inside_strings_do_not_close():
+    scanner = IncrementalJSONScanner()
+    scanner.feed('{"text": "a \\" } still open')
+    assert not scanner.closed
+    scanner.feed('"}')
+    assert scanner.parsed() == {"text": 'a " } still open'}
+
+
+def test_unclosed_or_invalid_object_parses_to_none():
+    unclosed = IncrementalJSONScanner()
+    unclosed.feed('{"summary": [')
+    assert not unclosed.closed and unclosed.parsed() is None
+    invalid = IncrementalJSONScanner()
+    invalid.feed("{'single': quotes}")
+    assert invalid.closed and invalid.parsed() is None
@@ -0,0 +1,29 @@
+import mcp.agents.mistral_summarizer as mistral
+from mcp.agents.mistral_summarizer import parse_mistral_output
+
+TRUNCATED = '```json\n{"summary": ["Release moves to Friday", "Alice owns the migr'
+
+
+def test_truncated_json_is_not_used_as_a_bullet():
+    assert parse_mistral_output(TRUNCATED) == ([], [], [], [])
+
+
+def test_plain_bullets_still_parse_without_json():
+    summaries, _, _, _ = parse_mistral_output("Notes:\n- Release moves to Friday\n- Alice owns the migration")
+    assert summaries == ["- Release moves to Friday", "- Alice owns the migration"]
+
+
+class WordTokenizer:
+    eos_token_id = 0
+
+    def __call__(self, texts):
+        return {'input_ids': [t.split() for t in texts]}
+
+
+def test_summary_text_never_holds_a_cut_off_chunk(monkeypatch):
+    outputs = iter([[TRUNCATED], ['{"summary": ["Bob updates the docs"], "decisions": [], "action_items": [], "risks": []}']])
+    monkeypatch.setattr(mistral, "chunk_transcript", lambda tokenizer, transcript: iter(["first part", "second part"]))
+    monkeypatch.setattr(mistral, "_generate_batch", lambda tokenizer, model, prompts, deadline=None: next(outputs))
+    transcript = "Alice: the release moves to Friday and I will own the migration. Bob: I will update the docs."
+    result = mistral.summarize_with_mistral(WordTokenizer(), None, transcript, "m1", max_batch_size=1)
+    assert result['summary_text'] == ["Bob updates the docs"]
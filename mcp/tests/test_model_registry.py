@@ -0,0 +1,89 @@
+import threading
+import time
+
+import pytest
+
+import mcp.core.model_registry as model_registry
+from mcp.core.model_registry import ModelRegistry, seq2seq_backend
+
+
+class FakeTensor:
+    def __init__(self, nbytes):
+        self.nbytes = nbytes
+
+    def numel(self):
+        return self.nbytes
+
+    def element_size(self):
+        return 1
+
+
+class FakeModel:
+    def __init__(self, nbytes):
+        self.weights = {'weight': FakeTensor(nbytes)}
+
+    def state_dict(self):
+        return self.weights
+
+
+def loader(name, nbytes=100, calls=None):
+    def load():
+        if calls is not None:
+            calls.append(name)
+        return f"tok-{name}", FakeModel(nbytes)
+    return load
+
+
+def test_least_recently_used_model_is_evicted_over_budget():
+    registry = ModelRegistry(budget_bytes=250)
+    registry.get("a", loader("a"))
+    registry.get("b", loader("b"))
+    registry.get("a", loader("a"))  # touch: b is now least recently used
+    registry.get("c", loader("c"))
+    assert registry.is_resident("a") and registry.is_resident("c")
+    assert not registry.is_resident("b")
+    assert registry.stats()['evictions'] == 1
+    assert registry.resident_bytes == 200
+
+
+def test_concurrent_callers_share_one_load_and_locks_are_pruned():
+    registry = ModelRegistry(budget_bytes=0)
+    calls = []
+    started = threading.Event()
+
+    def slow_load():
+        started.set()
+        time.sleep(0.05)
+        return loader("a", calls=calls)()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("a", slow_load))) for _ in range(4)]
+    threads[0].start()
+    started.wait(5)
+    for t in threads[1:]:
+        t.start()
+    for t in threads:
+        t.join(5)
+    assert calls == ["a"]
+    assert len({id(model) for _, model in results}) == 1
+    assert registry._load_locks == {}
+
+
+def test_failed_load_releases_its_lock():
+    registry = ModelRegistry(budget_bytes=0)
+
+    def broken():
+        raise OSError("weights missing")
+
+    with pytest.raises(OSError):
+        registry.get("a", broken)
+    assert registry._load_locks == {}
+    assert registry.get("a", loader("a"))[0] == "tok-a"
+
+
+def test_onnx_resolves_to_the_backend_that_actually_loads(monkeypatch):
+    monkeypatch.setattr(model_registry, "onnx_runtime_available", lambda: False)
+    assert seq2seq_backend("onnx") == "int8"
+    assert seq2seq_backend("torch") == "torch"
+    monkeypatch.setattr(model_registry, "onnx_runtime_available", lambda: True)
+    assert seq2seq_backend("onnx") == "onnx"
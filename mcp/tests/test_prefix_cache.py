@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+
+import mcp.core.prefix_cache as prefix_cache
+from mcp.core.prefix_cache import _fresh_controls, _prefix_layout, generate_with_prefix
+
+
+class Controls(list):
+    """Stands in for LogitsProcessorList / StoppingCriteriaList."""
+
+
+class Stateful:
+    def __init__(self, generation=0):
+        self.generation = generation
+
+    def fresh(self):
+        return Stateful(self.generation + 1)
+
+
+def test_prefix_stays_at_position_zero_with_pads_before_each_suffix():
+    input_ids, attention_mask, width = _prefix_layout([1, 2], [[1, 2, 7], [1, 2, 8, 9, 10]], pad_id=0)
+    assert width == 3
+    assert input_ids == [[1, 2, 0, 0, 7], [1, 2, 8, 9, 10]]
+    assert attention_mask == [[1, 1, 0, 0, 1], [1, 1, 1, 1, 1]]
+
+
+def test_fresh_controls_replaces_only_stateful_items():
+    stateless = object()
+    kwargs = {'logits_processor': Controls([Stateful()]), 'stopping_criteria': Controls([stateless, Stateful()]), 'num_beams': 4}
+    fresh = _fresh_controls(kwargs)
+    assert type(fresh['logits_processor']) is Controls
+    assert fresh['logits_processor'][0].generation == 1
+    assert fresh['stopping_criteria'][0] is stateless
+    assert fresh['stopping_criteria'][1].generation == 1
+    assert fresh['num_beams'] == 4
+    # The caller's lists are left alone
+    assert kwargs['logits_processor'][0].generation == 0
+
+
+class FakeTensor:
+    def __init__(self, rows, width):
+        self.shape = (rows, width)
+
+    def to(self, device):
+        return self
+
+
+class FakeTokenizer:
+    pad_token = "<pad>"
+    padding_side = "right"
+
+    def __call__(self, prompts, **kwargs):
+        self.padding_side_seen = self.padding_side
+        return {'input_ids': FakeTensor(len(prompts), 5), 'attention_mask': FakeTensor(len(prompts), 5)}
+
+
+class FakeModel:
+    def parameters(self):
+        return iter([SimpleNamespace(device="cpu")])
+
+    def generate(self, input_ids, attention_mask=None, **kwargs):
+        self.kwargs = kwargs
+        return "output"
+
+
+def test_failed_cached_attempt_regenerates_left_padded_with_fresh_controls(monkeypatch):
+    def broken(*args):
+        raise RuntimeError("cache layout mismatch")
+
+    monkeypatch.setattr(prefix_cache, "_generate_with_cached_prefix", broken)
+    tokenizer, model = FakeTokenizer(), FakeModel()
+    streamer = SimpleNamespace(next_tokens_are_prompt=False)
+    used = Stateful()
+    assert generate_with_prefix(tokenizer, model, "prefix", ["prefix a"], logits_processor=Controls([used]), streamer=streamer) == "output"
+    assert model.kwargs['logits_processor'][0] is not used
+    assert model.kwargs['logits_processor'][0].generation == 1
+    assert streamer.next_tokens_are_prompt
+    assert tokenizer.padding_side_seen == "left"
+    assert tokenizer.padding_side == "right"
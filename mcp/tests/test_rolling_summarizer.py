@@ -0,0 +1,64 @@
+import json
+import threading
+import time
+
+import mcp.agents.rolling_summarizer as rolling
+from mcp.agents.rolling_summarizer import RollingSummarySession
+
+
+class MemoryContext:
+    """Stands in for ContextHandler; state round-trips through JSON like the files do."""
+
+    def __init__(self):
+        self.sessions = {}
+        self.summaries = {}
+        self._lock = threading.Lock()
+
+    def get_session(self, meeting_id):
+        with self._lock:
+            raw = self.sessions.get(meeting_id)
+        return json.loads(raw) if raw else None
+
+    def save_session(self, meeting_id, state):
+        with self._lock:
+            self.sessions[meeting_id] = json.dumps(state)
+
+    def delete_session(self, meeting_id):
+        with self._lock:
+            self.sessions.pop(meeting_id, None)
+
+    def save_summary(self, meeting_id, summary_obj):
+        self.summaries[meeting_id] = summary_obj
+
+
+def fake_summarize(self, chunk):
+    time.sleep(0.002)  # widen the window between load and save
+    return {'summary': [chunk], 'action_items': []}
+
+
+def test_concurrent_appends_and_finalize_keep_every_segment(monkeypatch):
+    monkeypatch.setattr(rolling, "SummarizationAgent", lambda mode: None)
+    monkeypatch.setattr(RollingSummarySession, "_summarize_chunk", fake_summarize)
+    monkeypatch.setattr(RollingSummarySession, "_tokenizer_and_budget", lambda self: (None, 40))
+    context = MemoryContext()
+    segments = [[f"Speaker{t}: update {t}-{i} is done.\n" for i in range(5)] for t in range(6)]
+
+    def writer(own):
+        for segment in own:
+            # One session object per request, as the incremental endpoint creates them
+            RollingSummarySession("m1", mode="llm", context=context).append(segment)
+
+    threads = [threading.Thread(target=writer, args=(own,)) for own in segments]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(10)
+    result = RollingSummarySession("m1", mode="llm", context=context).append("", final=True)
+
+    state = context.get_session("m1")
+    committed = " ".join(s for part in state['chunks'] for s in part['summary'])
+    assert state['seen_chars'] == sum(len(s) for own in segments for s in own)
+    assert state['tail'] == ''
+    assert all(f"update {t}-{i} is done." in committed for t in range(6) for i in range(5))
+    assert result['pending_chars'] == 0
+    assert result['chunks_summarized'] == len(state['chunks'])
@@ -0,0 +1,71 @@
+from mcp.core.deadline import Deadline
+from mcp.core.router import BackendRouter
+
+ALL = {
+    'bart': {'available': True, 'resident': True},
+    'llm': {'available': True, 'resident': True},
+    'mistral': {'available': True, 'resident': True},
+    'fallback': {'available': True, 'resident': True},
+}
+
+
+def router(**kwargs):
+    return BackendRouter(short_tokens=1500, long_tokens=6000, latency_budget=120, **kwargs)
+
+
+def test_prefers_backends_by_transcript_size():
+    r = router()
+    assert r.choose(500, ALL)['backend'] == 'bart'
+    assert r.choose(3000, ALL)['backend'] == 'llm'
+    assert r.choose(6000, ALL)['backend'] == 'mistral'
+
+
+def test_skips_backends_that_do_not_fit_the_budget():
+    r = router()
+    # 15 s per 1k tokens plus a cold load: far over 120 s
+    cold = dict(ALL, mistral={'available': True, 'resident': False})
+    decision = r.choose(8000, cold)
+    assert decision['backend'] == 'llm'
+    assert decision['reason'] == "over budget: mistral"
+    assert r.choose(8000, ALL, latency_budget=30)['backend'] == 'llm'
+
+
+def test_no_budget_means_no_deadline():
+    r = router()
+    cold = dict(ALL, mistral={'available': True, 'resident': False})
+    assert r.choose(8000, cold, latency_budget=0)['backend'] == 'mistral'
+
+
+def test_fastest_wins_when_nothing_fits():
+    decision = router().choose(8000, ALL, latency_budget=0.001)
+    assert decision['backend'] == 'fallback'
+    assert decision['reason'] == "nothing fits the budget; fastest"
+
+
+def test_unavailable_backends_are_never_chosen():
+    only_bart = dict(ALL, llm={'available': False}, mistral={'available': False}, fallback={'available': False})
+    assert router().choose(8000, only_bart)['backend'] == 'bart'
+
+
+def test_queue_depth_and_observations_move_estimates():
+    r = router()
+    idle = r.estimate('bart', 2000)
+    assert r.estimate('bart', 2000, queue_depth=2, concurrency=1) == idle * 3
+    r.observe('bart', 2000, 40.0)
+    assert r.estimate('bart', 2000) > idle
+    assert r.stats()['observations'] == {'bart': 1}
+
+
+def test_decisions_are_logged():
+    r = router(log_size=2)
+    for tokens in (100, 200, 300):
+        r.choose(tokens, ALL)
+    assert [d['tokens'] for d in r.recent_decisions()] == [200, 300]
+
+
+def test_deadlines_apply_only_when_set(monkeypatch):
+    monkeypatch.delenv("SUMMARY_DEADLINE_SECONDS", raising=False)
+    assert Deadline.from_budget(None) is None
+    assert Deadline.from_budget(30).seconds == 30
+    monkeypatch.setenv("SUMMARY_DEADLINE_SECONDS", "45")
+    assert Deadline.from_budget(None).seconds == 45
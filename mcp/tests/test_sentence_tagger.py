@@ -0,0 +1,50 @@
+from mcp.core.sentence_tagger import SentenceTagger, _lead, meeting_tagger, split_sentences
+
+
+def test_split_keeps_decimals_versions_and_abbreviations_together():
+    text = "Mr. Smith shipped v1.2 today. Latency fell to 3.5 seconds!\nIs the dashboard ready?"
+    assert split_sentences(text) == ["Mr. Smith shipped v1.2 today", "Latency fell to 3.5 seconds!", "Is the dashboard ready?"]
+
+
+def test_keep_periods_preserves_terminators():
+    assert split_sentences("First one. Second one.", keep_periods=True) == ["First one.", "Second one."]
+
+
+def test_select_returns_tagged_sentences_in_order():
+    text = "Alice will FIX the login bug. Lunch was great. Bob to prepare the plan. The release is blocked."
+    assert meeting_tagger.select(text, 'action') == ["Alice will FIX the login bug", "Bob to prepare the plan"]
+    assert meeting_tagger.select(text, 'action', 'risk') == ["Alice will FIX the login bug", "Bob to prepare the plan", "The release is blocked"]
+    assert meeting_tagger.select(text, 'action', 'risk', min_words=6) == ["Alice will FIX the login bug"]
+
+
+def test_tag_reports_every_category_of_a_sentence():
+    tagged = meeting_tagger.tag("We must fix the delayed build. Let's set up a follow-up meeting.")
+    assert tagged[0] == ("We must fix the delayed build", {'action', 'risk'})
+    assert 'followup' in tagged[1][1]
+
+
+def test_terms_sharing_a_start_or_overlapping_all_count():
+    # 'set up' (action) and 'set up a meeting' (follow-up) start at the same offset
+    assert meeting_tagger.tag("Please set up a meeting.") == [("Please set up a meeting", {'action', 'followup'})]
+    tagger = SentenceTagger(keywords={'a': ('complete',), 'b': ('error', 'let')}, patterns={'c': (r"ter+o",)})
+    # 'let' sits inside 'complete'; 'error' and 'terro' start inside it and run past its end
+    assert tagger.tag("Completerror. Complete.") == [("Completerror", {'a', 'b', 'c'}), ("Complete", {'a', 'b'})]
+    assert tagger.tag("İ completerror")[0][1] == {'a', 'b', 'c'}
+
+
+def test_pattern_leads():
+    assert _lead(r"follow[- ]?up meeting") == "follow"
+    assert _lead(r"schedule (another|a) meeting") == "schedule "
+    assert _lead(r"colou?r") == "colo"
+    assert _lead(r"fix|repair") == ""
+
+
+def test_matches_without_segmentation():
+    assert meeting_tagger.matches("we should Reconvene on Monday", 'followup')
+    assert not meeting_tagger.matches("all good", 'risk', 'followup')
+
+
+def test_texts_whose_lowercase_changes_length_still_match():
+    tagger = SentenceTagger(keywords={'action': ('review',)})
+    # 'İ'.lower() is two characters long, so offsets fall back to the case-insensitive scan
+    assert tagger.select("İstanbul office. Please REVIEW the doc.", 'action') == ["Please REVIEW the doc"]
@@ -0,0 +1,66 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from mcp.core.single_flight import SingleFlight
+
+
+def test_concurrent_callers_share_one_computation():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "summary"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("k", compute)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(flight.do("k", compute))) for _ in range(3)]
+    for t in followers:
+        t.start()
+    for _ in range(500):
+        if flight.stats()['coalesced'] == 3:
+            break
+        time.sleep(0.01)
+    release.set()
+    for t in [leader] + followers:
+        t.join(5)
+    assert results == ["summary"] * 4
+    assert len(calls) == 1
+    assert flight.stats() == {'in_flight': 0, 'leaders': 1, 'coalesced': 3}
+
+
+def test_errors_reach_followers_and_the_key_is_released():
+    flight = SingleFlight()
+    leader, future = flight.join("k")
+    assert leader
+    follower, shared = flight.join("k")
+    assert not follower and shared is future
+    flight.fail("k", RuntimeError("model failed"))
+    with pytest.raises(RuntimeError):
+        shared.result(1)
+    assert flight.do("k", lambda: "retry") == "retry"
+
+
+def test_async_followers_await_the_leader():
+    flight = SingleFlight()
+    calls = []
+
+    async def compute(value):
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return value
+
+    async def main():
+        return await asyncio.gather(*(flight.do_async("k", compute, "v") for _ in range(5)))
+
+    assert asyncio.run(main()) == ["v"] * 5
+    assert calls == ["v"]
@@ -0,0 +1,45 @@
+from types import SimpleNamespace
+
+from mcp.core import spacy_pipeline
+from mcp.tools import nlp_task_extraction
+from mcp.tools.nlp_task_extraction import extract_tasks_bulk
+
+
+class FakeNLP:
+    pipe_names = ["tok2vec", "tagger", "parser", "attribute_ruler", "ner", "textcat"]
+
+    def __init__(self):
+        self.calls = []
+
+    def pipe(self, texts, **kwargs):
+        self.calls.append(kwargs)
+        return (SimpleNamespace(text=t, sents=[]) for t in texts)
+
+
+def test_profile_disables_components_it_does_not_need(monkeypatch):
+    nlp = FakeNLP()
+    monkeypatch.setattr(spacy_pipeline, "get_nlp", lambda: nlp)
+    monkeypatch.setenv("SPACY_BATCH_SIZE", "16")
+    list(spacy_pipeline.pipe(["a"], profile="entities"))
+    list(spacy_pipeline.pipe(["a"], profile="tasks", batch_size=4, n_process=2))
+    list(spacy_pipeline.pipe(["a"]))
+    assert nlp.calls[0] == {'batch_size': 16, 'n_process': 1, 'disable': ["tagger", "parser", "attribute_ruler", "textcat"]}
+    assert nlp.calls[1] == {'batch_size': 4, 'n_process': 2, 'disable': ["textcat"]}
+    assert nlp.calls[2]['disable'] == []
+
+
+def test_bulk_extraction_fans_out_only_for_many_transcripts(monkeypatch):
+    calls = []
+
+    def fake_pipe(texts, profile=None, batch_size=None, n_process=None):
+        calls.append((profile, n_process))
+        return (SimpleNamespace(sents=[]) for _ in texts)
+
+    monkeypatch.setattr(spacy_pipeline, "pipe", fake_pipe)
+    monkeypatch.setattr(nlp_task_extraction.os, "cpu_count", lambda: 4)
+    per_process = nlp_task_extraction.BULK_MIN_PER_PROCESS
+    assert extract_tasks_bulk(["t"] * 3) == [[]] * 3
+    extract_tasks_bulk(["t"] * (per_process * 2))
+    extract_tasks_bulk(["t"] * (per_process * 10))
+    extract_tasks_bulk(["t"] * 3, n_process=3)
+    assert calls == [("tasks", 1), ("tasks", 2), ("tasks", 4), ("tasks", 3)]
@@ -0,0 +1,151 @@
+import asyncio
+
+import pytest
+
+import mcp.agents.summarization_agent as agent_module
+from mcp.core.summary_cache import SummaryCache
+
+TRANSCRIPT = "Alice: We will ship the release on Friday.\nBob: I will update the docs."
+
+
+class FakeContext:
+    def __init__(self):
+        self.saved = {}
+
+    def save_summary(self, meeting_id, summary_obj):
+        self.saved[meeting_id] = summary_obj
+
+
+@pytest.fixture
+def agent(monkeypatch, tmp_path):
+    model_dir = tmp_path / "bart"
+    model_dir.mkdir()
+    (model_dir / "config.json").write_text("{}")
+    monkeypatch.setattr(agent_module, "ContextHandler", FakeContext)
+    monkeypatch.setattr(agent_module, "summary_cache", SummaryCache(cache_dir=str(tmp_path / "cache")))
+    monkeypatch.setattr(agent_module, "resolve_bart_model_path", lambda: str(model_dir))
+    monkeypatch.setattr(agent_module, "get_bart_model", lambda: ("tokenizer", "model"))
+    calls = []
+
+    def fake_bart(tokenizer, model, transcript, meeting_id, deadline=None, **kwargs):
+        calls.append(meeting_id)
+        return {'meeting_id': meeting_id, 'summary_text': "Release ships Friday.", 'degraded': fake_bart.degraded}
+
+    fake_bart.degraded = False
+    monkeypatch.setattr(agent_module, "summarize_with_bart", fake_bart)
+    return agent_module.SummarizationAgent(mode="bart"), calls, fake_bart, model_dir
+
+
+def run(agent, meeting_id):
+    return asyncio.run(agent.summarize(meeting_id, TRANSCRIPT, save=False))
+
+
+def test_repeat_requests_hit_the_cache_until_the_model_revision_changes(agent):
+    summarizer, calls, _, model_dir = agent
+    run(summarizer, "m1")
+    assert run(summarizer, "m2")['meeting_id'] == "m2"
+    assert calls == ["m1"]
+    (model_dir / "config.json").write_text('{"retrained": true}')
+    run(summarizer, "m3")
+    assert calls == ["m1", "m3"]
+
+
+def test_prompt_template_is_part_of_the_key(agent, monkeypatch):
+    summarizer = agent[0]
+    prompts = []
+
+    async def fake_chat(prompt, max_tokens=300, timeout=None):
+        prompts.append(prompt)
+        return "summary"
+
+    monkeypatch.setattr(agent_module.llm_client, "chat", fake_chat)
+    summarizer.mode = "llm"
+    run(summarizer, "m1")
+    run(summarizer, "m2")
+    assert len(prompts) == 1
+    monkeypatch.setattr(agent_module, "LLM_SUMMARY_PROMPT", "Summarize briefly:\n")
+    run(summarizer, "m3")
+    assert len(prompts) == 2
+
+
+def test_degraded_results_are_never_stored(agent):
+    summarizer, calls, fake_bart, _ = agent
+    fake_bart.degraded = True
+    assert run(summarizer, "m1")['degraded']
+    assert agent_module.summary_cache.stats()['stores'] == 0
+    fake_bart.degraded = False
+    assert not run(summarizer, "m2").get('degraded')
+    assert calls == ["m1", "m2"]
+
+
+def test_unavailable_llm_degrades_instead_of_echoing_the_transcript(agent, monkeypatch):
+    summarizer = agent[0]
+
+    async def exhausted(prompt, max_tokens=300, timeout=None):
+        raise agent_module.LLMUnavailableError("LLM request failed after 6 attempt(s): 429")
+
+    monkeypatch.setattr(agent_module.llm_client, "chat", exhausted)
+    summarizer.mode = "llm"
+    result = run(summarizer, "m1")
+    assert result['degraded'] and result['served_by'] == "extractive"
+    assert result['degraded_reason'].startswith("LLM unavailable")
+    assert result['summary_text'] != TRANSCRIPT[:300]
+    assert agent_module.summary_cache.stats()['stores'] == 0
+
+
+def test_protocol_returns_the_degradation_with_the_summary(agent):
+    summarizer, _, fake_bart, _ = agent
+    fake_bart.degraded = True
+    deadline = agent_module.Deadline(60)
+    summary, degradation = summarizer.summarize_protocol(["Alice: We will ship on Friday."], mode="bart", deadline=deadline)
+    assert summary == "Release ships Friday."
+    assert degradation['degraded_from'] == "bart"
+    fake_bart.degraded = False
+    assert summarizer.summarize_protocol(["Alice: We will ship on Friday."], mode="bart") == ("Release ships Friday.", None)
+
+
+@pytest.fixture
+def mistral(agent, monkeypatch):
+    summarizer, _, _, model_dir = agent
+    monkeypatch.setattr(agent_module, "resolve_mistral_model_path", lambda: str(model_dir))
+    monkeypatch.setattr(agent_module, "get_mistral_model", lambda: ("tokenizer", "model"))
+    calls = []
+    joint = {'summary_text': ["Release ships Friday."], 'action_items': [{'task': "Update the docs", 'owner': "Bob"}]}
+
+    def fake_mistral(tokenizer, model, transcript, meeting_id, deadline=None, chunks=None):
+        calls.append(("beam", meeting_id))
+        return dict(joint, meeting_id=meeting_id)
+
+    def fake_stream(tokenizer, model, transcript, meeting_id, deadline=None):
+        calls.append(("stream", meeting_id))
+        yield {'token': "Release"}
+        yield {'result': dict(joint, meeting_id=meeting_id)}
+
+    monkeypatch.setattr(agent_module, "summarize_with_mistral", fake_mistral)
+    monkeypatch.setattr(agent_module, "stream_with_mistral", fake_stream)
+    summarizer.mode = "mistral"
+    return summarizer, calls
+
+
+def test_streamed_mistral_is_kept_apart_from_beam_search_results(mistral):
+    summarizer, calls = mistral
+    events = list(summarizer.stream_summary("m1", TRANSCRIPT))
+    assert events[-1]['result']['action_items']
+    # summarize() decodes with beam search; the greedy stream does not stand in for it
+    run(summarizer, "m2")
+    assert calls == [("stream", "m1"), ("beam", "m2")]
+    # A later stream is served the (better) beam-search result
+    assert list(summarizer.stream_summary("m3", TRANSCRIPT))[-1]['result']['meeting_id'] == "m3"
+    assert len(calls) == 2
+
+
+def test_task_extraction_reuses_a_streamed_or_orchestrated_pass(mistral):
+    from mcp.tools.llm_task_extraction import extract_tasks_jira_format
+    summarizer, calls = mistral
+    list(summarizer.stream_summary("m1", TRANSCRIPT))
+    tasks = extract_tasks_jira_format(TRANSCRIPT, meeting_id="m1")
+    assert tasks == [{'Summary': "Update the docs", 'Description': "Update the docs", 'Assignee': "Bob", 'Due Date': None}]
+    chunks = ["Alice: We will ship the release on Friday.", "Bob: I will update the docs."]
+    summarizer.summarize_protocol(chunks, mode="mistral", source_transcript="\n".join(chunks) + "\n")
+    assert extract_tasks_jira_format("\n".join(chunks) + "\n")[0]['Assignee'] == "Bob"
+    assert calls == [("stream", "m1"), ("beam", "meeting")]
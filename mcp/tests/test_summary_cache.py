@@ -0,0 +1,38 @@
+from mcp.core.summary_cache import SummaryCache
+
+
+def test_key_ignores_whitespace_but_not_mode_or_revision():
+    key = SummaryCache.make_key("Alice: hi\n\nBob:  hello", "bart", "", "rev1")
+    assert key == SummaryCache.make_key("Alice: hi Bob: hello", "bart", "", "rev1")
+    assert key != SummaryCache.make_key("Alice: hi Bob: hello", "mistral", "", "rev1")
+    assert key != SummaryCache.make_key("Alice: hi Bob: hello", "bart", "", "rev2")
+
+
+def test_disk_tier_survives_a_new_instance(tmp_path):
+    cache = SummaryCache(cache_dir=str(tmp_path), max_memory_entries=4)
+    cache.set("k", {'summary_text': "s"})
+    fresh = SummaryCache(cache_dir=str(tmp_path), max_memory_entries=4)
+    assert fresh.get("k") == {'summary_text': "s"}
+    assert fresh.stats()['disk_hits'] == 1
+    assert fresh.get("k") == {'summary_text': "s"}
+    assert fresh.stats()['memory_hits'] == 1
+
+
+def test_memory_tier_is_lru_bounded(tmp_path):
+    cache = SummaryCache(cache_dir=str(tmp_path), max_memory_entries=2)
+    for key in ("a", "b", "c"):
+        cache.set(key, key)
+    assert cache.stats()['memory_entries'] == 2
+    assert cache.get("missing") is None
+    assert cache.stats()['misses'] == 1
+
+
+def test_disk_tier_evicts_oldest_above_budget(tmp_path):
+    cache = SummaryCache(cache_dir=str(tmp_path), max_memory_entries=0, max_disk_bytes=200)
+    for i in range(5):
+        cache.set(f"k{i}", "x" * 60)
+    stats = cache.stats()
+    assert stats['disk_bytes'] <= 200
+    assert stats['evictions'] > 0
+    assert cache.get("k4") == "x" * 60
+    assert cache.get("k0") is None
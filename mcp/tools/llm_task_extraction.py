@@ -1,71 +1,56 @@
 """
 LLM-based Task Extraction Tool for MCP
-Outputs tasks in Jira issue format using a local BART model.
+Outputs tasks in Jira issue format from the joint Mistral summarization pass.
+- One generation (mistral_summarizer.PROMPT_TEMPLATE) yields the summary, decisions, risks and
+  Jira-ready action items together; tasks are mapped from its action items
+- The pass goes through SummarizationAgent, so it is cached and coalesced: a summary from the
+  orchestrator, summarize() or a streamed summary of the same transcript is reused, and TaskTool and
+  LLMTaskManagerAgent share one run of the model per transcript
 """
+import asyncio
 
+from mcp.agents.summarization_agent import SummarizationAgent
+from mcp.core.sentence_tagger import meeting_tagger
 
 
-# Use Mistral for LLM-based task extraction
-from mcp.agents.mistral_summarizer import summarize_with_mistral
-from mcp.agents.summarization_agent import get_mistral_model
+def jira_fields(item):
+    """One action item of the joint summary as Jira fields: Summary, Description, Assignee, Due Date."""
+    if not isinstance(item, dict):
+        return {'Summary': str(item), 'Description': str(item), 'Assignee': None, 'Due Date': None}
+    summary = item.get('task') or item.get('Summary') or ''
+    return {
+        'Summary': summary,
+        'Description': item.get('description') or item.get('Description') or summary,
+        'Assignee': item.get('owner') or item.get('Assignee') or None,
+        'Due Date': item.get('deadline') or item.get('Due Date') or None
+    }
 
 
-def extract_tasks_jira_format(transcript, session_action_items=None):
+async def extract_tasks_jira_format_async(transcript, session_action_items=None, meeting_id="jira_task_extraction", latency_budget=None):
     """
     If session_action_items is provided and non-empty, use them directly.
-    Otherwise, run Mistral extraction as before.
+    Otherwise map the action items of the (cached) joint Mistral pass to Jira fields.
     """
     if session_action_items and isinstance(session_action_items, list) and len(session_action_items) > 0:
         print("[DEBUG] Using action_items from session, skipping Mistral extraction.")
         return session_action_items
-    mistral_tokenizer, mistral_model = get_mistral_model()
-    # Use a prompt tailored for Jira task extraction
-    prompt = (
-        "Extract up to 3 action items or tasks from the following meeting transcript. "
-        "For each, output in Jira issue format as strictly as possible, one after another, with each field on its own line.\n"
-        "- Summary: <short summary>\n"
-        "- Description: <detailed description>\n"
-        "- Assignee: <person, if mentioned>\n"
-        "- Due Date: <date, if mentioned>\n"
-        "Transcript:\n"
-        f"{transcript}\n"
-        "Tasks:"
-    )
-    # Use the same chunking and summarization logic as summarize_with_mistral, but for this prompt
-    result = summarize_with_mistral(mistral_tokenizer, mistral_model, prompt, meeting_id="jira_task_extraction")
-    # Try to parse action items from the result (reuse action_items if present, else parse from summary_text)
-    action_items = result.get("action_items", [])
-    if not action_items:
-        # Fallback: try to parse from summary_text if model didn't return action_items
-        def parse_tasks(text):
-            tasks = []
-            current_task = {}
-            for line in text if isinstance(text, list) else text.splitlines():
-                line = line.strip()
-                if line.startswith('- Summary:'):
-                    if current_task:
-                        tasks.append(current_task)
-                        current_task = {}
-                    current_task['Summary'] = line[len('- Summary:'):].strip()
-                elif line.startswith('- Description:'):
-                    current_task['Description'] = line[len('- Description:'):].strip()
-                elif line.startswith('- Assignee:'):
-                    current_task['Assignee'] = line[len('- Assignee:'):].strip()
-                elif line.startswith('- Due Date:'):
-                    current_task['Due Date'] = line[len('- Due Date:'):].strip()
-            if current_task:
-                tasks.append(current_task)
-            return tasks
-        action_items = parse_tasks(result.get("summary_text", []))
+    agent = SummarizationAgent(mode="mistral")
+    summary_obj = agent.cached_joint_summary(transcript)
+    if summary_obj is None:
+        summary_obj = await agent.summarize(meeting_id, transcript, latency_budget=latency_budget, save=False)
+    action_items = [jira_fields(a) for a in summary_obj.get("action_items") or []]
     # Final fallback: if still empty, try to extract from transcript
     if not action_items:
-        print("[DEBUG][LLM Task Extraction] No action items found in model output or summary, extracting from transcript as fallback.")
-        lines = [l.strip() for l in transcript.replace('\n', '. ').split('.') if l.strip()]
-        action_keywords = ['fix', 'complete', 'implement', 'create', 'update', 'assign', 'test', 'review', 'prepare', 'set up', 'ensure', 'action item', 'task']
-        action_items = [l for l in lines if any(k in l.lower() for k in action_keywords)]
+        print("[DEBUG][LLM Task Extraction] No action items found in model output, extracting from transcript as fallback.")
+        action_items = meeting_tagger.select(transcript, 'action', 'task')
         print(f"[DEBUG][LLM Task Extraction] Fallback extracted action_items from transcript: {action_items}")
     return action_items
 
+
+def extract_tasks_jira_format(transcript, session_action_items=None, meeting_id="jira_task_extraction", latency_budget=None):
+    """Blocking variant of extract_tasks_jira_format_async for sync callers."""
+    return asyncio.run(extract_tasks_jira_format_async(transcript, session_action_items, meeting_id, latency_budget))
+
 if __name__ == "__main__":
     transcript = "Your transcript text here..."
-    print(extract_tasks_jira_format(transcript))
\ No newline at end of file
+    print(extract_tasks_jira_format(transcript))
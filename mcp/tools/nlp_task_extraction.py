@@ -1,26 +1,43 @@
-import spacy
 from typing import List, Dict
+import os
 import re
 import datetime
 
-# Load spaCy English model (make sure to install: python -m spacy download en_core_web_sm)
-nlp = spacy.load("en_core_web_sm")
+from mcp.core import spacy_pipeline
+
+# spaCy English model is loaded on first use (make sure to install: python -m spacy download en_core_web_sm)
+
+ACTION_KEYWORDS = ["action", "todo", "task", "assign", "complete", "finish", "follow up", "review", "update", "send", "schedule", "prepare", "submit", "finalize", "share", "remind"]
+# Below this many transcripts, worker start-up costs more than it saves
+BULK_MIN_PER_PROCESS = 8
 
 def extract_tasks_nlp(transcript: str) -> List[Dict]:
     """
     Extract action items from a transcript using classical NLP (spaCy).
     Returns a list of dicts in Jira-style format: {title, owner, due, description}
     """
+    return _tasks_from_doc(next(iter(spacy_pipeline.pipe([transcript], profile="tasks"))))
+
+def extract_tasks_bulk(transcripts: List[str], n_process: int = None, batch_size: int = None) -> List[List[Dict]]:
+    """
+    extract_tasks_nlp over many transcripts (e.g. a week of meetings) in one batched nlp.pipe pass.
+    n_process: worker processes; by default one per BULK_MIN_PER_PROCESS transcripts, up to the CPU count.
+    """
+    transcripts = list(transcripts)
+    if n_process is None:
+        n_process = max(1, min(os.cpu_count() or 1, len(transcripts) // BULK_MIN_PER_PROCESS))
+    docs = spacy_pipeline.pipe(transcripts, profile="tasks", batch_size=batch_size, n_process=n_process)
+    return [_tasks_from_doc(doc) for doc in docs]
+
+def _tasks_from_doc(doc) -> List[Dict]:
     tasks = []
-    doc = nlp(transcript)
     for sent in doc.sents:
         # Heuristic: look for imperative verbs or sentences with action keywords
         sent_text = sent.text.strip()
         if not sent_text:
             continue
         # Simple action keyword/verb check
-        action_keywords = ["action", "todo", "task", "assign", "complete", "finish", "follow up", "review", "update", "send", "schedule", "prepare", "submit", "finalize", "share", "remind"]
-        if any(kw in sent_text.lower() for kw in action_keywords) or sent.root.tag_ == "VB":
+        if any(kw in sent_text.lower() for kw in ACTION_KEYWORDS) or sent.root.tag_ == "VB":
             # Try to extract owner (named entity or pronoun)
             owner = None
             for ent in sent.ents:
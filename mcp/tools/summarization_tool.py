@@ -1,5 +1,6 @@
 from mcp.core.mcp import MCPTool, MCPToolType
 from mcp.agents.summarization_agent import SummarizationAgent
+from mcp.core.sentence_tagger import meeting_tagger
 import asyncio
 
 class SummarizationTool(MCPTool):
@@ -11,7 +12,7 @@ class SummarizationTool(MCPTool):
             description="Summarizes meeting transcripts into concise bullet points and action items.",
             api_endpoint="/mcp/summarize",
             auth_required=False,
-            parameters={"transcript": "str", "mode": "str"}
+            parameters={"transcript": "str", "mode": "str", "latency_budget": "float"}
         )
         self.mode = mode
         self.agent = SummarizationAgent(mode=mode)
@@ -23,7 +24,7 @@ class SummarizationTool(MCPTool):
         if mode != self.mode:
             self.agent = SummarizationAgent(mode=mode)
             self.mode = mode
-        summary_obj = await self.agent.summarize(meeting_id, transcript)
+        summary_obj = await self.agent.summarize(meeting_id, transcript, latency_budget=params.get("latency_budget"))
         # Fallback: If action_items is missing or empty, try to extract from summary_text
         if not summary_obj.get('action_items'):
             print("[DEBUG][SummarizationTool] No action_items in summary_obj, attempting fallback extraction from summary_text.")
@@ -32,8 +33,7 @@ class SummarizationTool(MCPTool):
                 lines = [summary_text]
             else:
                 lines = summary_text
-            action_keywords = ['fix', 'complete', 'implement', 'create', 'update', 'assign', 'test', 'review', 'prepare', 'set up', 'ensure', 'action item', 'task']
-            fallback_action_items = [l for l in lines if any(k in l.lower() for k in action_keywords)]
+            fallback_action_items = [l for l in lines if meeting_tagger.matches(l, 'action', 'task')]
             summary_obj['action_items'] = fallback_action_items
             print(f"[DEBUG][SummarizationTool] Fallback extracted action_items: {fallback_action_items}")
         return {
@@ -1,5 +1,5 @@
 from mcp.core.mcp import MCPTool, MCPToolType
-from mcp.tools.llm_task_extraction import extract_tasks_jira_format
+from mcp.tools.llm_task_extraction import extract_tasks_jira_format_async
 from mcp.tools.nlp_task_extraction import extract_tasks_nlp
 
 class TaskTool(MCPTool):
@@ -11,14 +11,14 @@ class TaskTool(MCPTool):
             description="Extracts tasks from meeting transcripts using LLM or NLP.",
             api_endpoint="/mcp/task",
             auth_required=False,
-            parameters={"transcript": "str", "method": "str"}
+            parameters={"transcript": "str", "method": "str", "meeting_id": "str"}
         )
 
     async def execute(self, params):
         transcript = params.get("transcript", "")
         method = params.get("method", "llm")
         if method == "llm":
-            tasks = extract_tasks_jira_format(transcript)
+            tasks = await extract_tasks_jira_format_async(transcript, meeting_id=params.get("meeting_id", "jira_task_extraction"))
         else:
             tasks = extract_tasks_nlp(transcript)
         return {"status": "success", "tasks": tasks}
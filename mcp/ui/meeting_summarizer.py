@@ -4,6 +4,7 @@ Summarization logic for MCP Streamlit App
 from mcp.core.mcp import MCPHost
 
 from mcp.tools.summarization_tool import SummarizationTool
+from mcp.agents.summarization_agent import SummarizationAgent
 from mcp.tools.mcp_calendar_tool import get_calendar_transcripts
 from mcp.tools.llm_task_extraction import extract_tasks_jira_format
 from mcp.tools.nlp_task_extraction import extract_tasks_nlp
@@ -13,6 +14,9 @@ from mcp.tools.calendar_tool import CalendarTool
 from mcp.tools.task_tool import TaskTool
 from mcp.tools.followup_tool import FollowupTool
 
+# Modes whose output can be rendered token by token
+STREAMING_MODES = ("llm", "mistral")
+
 def summarize_meeting(transcript, meeting_id, mode="auto"):
     mcp_host = MCPHost()
     # Register all relevant tools
@@ -30,3 +34,20 @@ def summarize_meeting(transcript, meeting_id, mode="auto"):
     result = asyncio.run(mcp_host.execute_tool(session_id, tool_id="summarization", parameters=params))
     mcp_host.end_session(session_id)
     return result
+
+def stream_meeting_summary(transcript, meeting_id, mode, result_holder):
+    """
+    Token generator for st.write_stream. When the stream ends, the same shape that
+    summarize_meeting returns ({'status', 'summary', 'action_items'}) is stored in result_holder['result'].
+    """
+    agent = SummarizationAgent(mode=mode)
+    for event in agent.stream_summary(meeting_id, transcript):
+        if 'token' in event:
+            yield event['token']
+        else:
+            summary_obj = event['result']
+            result_holder['result'] = {
+                "status": "success",
+                "summary": summary_obj.get("summary_text", summary_obj),
+                "action_items": summary_obj.get("action_items", [])
+            }
@@ -1,31 +1,25 @@
 """
 Task extraction logic (rule-based + spaCy NER) for MCP Streamlit App
 """
-import spacy
+from mcp.core.sentence_tagger import SentenceTagger
+from mcp.core.spacy_pipeline import pipe
 
-nlp = spacy.load("en_core_web_sm")
+# Stricter keywords and minimum length
+KEYWORDS = [
+    'fix', 'complete', 'implement', 'create', 'update', 'assign', 'test', 'review',
+    'submit', 'send', 'finalize', 'schedule', 'prepare', 'organize', 'resolve', 'follow up',
+    'investigate', 'analyze', 'plan', 'report', 'document', 'deploy', 'release', 'approve',
+    'check', 'remind', 'contact', 'arrange', 'discuss', 'share', 'provide', 'finish',
+    'deliver', 'coordinate', 'monitor', 'track', 'evaluate', 'confirm', 'notify',
+    'inform', 'respond', 'attend', 'present'
+]
+_tagger = SentenceTagger(keywords={'action': KEYWORDS})
 
 def extract_action_items(text):
-    # Stricter keywords and minimum length
-    KEYWORDS = [
-        'fix', 'complete', 'implement', 'create', 'update', 'assign', 'test', 'review',
-        'submit', 'send', 'finalize', 'schedule', 'prepare', 'organize', 'resolve', 'follow up', 
-        'investigate', 'analyze', 'plan', 'report', 'document', 'deploy', 'release', 'approve', 
-        'check', 'remind', 'contact', 'arrange', 'discuss', 'share', 'provide', 'finish', 
-        'deliver', 'coordinate', 'monitor', 'track', 'evaluate', 'confirm', 'notify', 
-        'inform', 'respond', 'attend', 'present', 'update', 'assign', 'review', 'test', 
-        'implement', 'fix', 'complete', 'create'
-    ]
-    lines = [l.strip() for l in text.split('.') if l.strip()]
-    actions = []
-    for l in lines:
-        # Must contain a keyword and be at least 6 words
-        if any(k in l.lower() for k in KEYWORDS) and len(l.split()) >= 6:
-            actions.append(l)
-    return actions
+    # Must contain a keyword and be at least 6 words
+    return _tagger.select(text, 'action', min_words=6)
 
-def extract_task_details(sentence):
-    doc = nlp(sentence)
+def _details_from_doc(sentence, doc):
     owners = [ent.text for ent in doc.ents if ent.label_ == "PERSON"]
     deadlines = [ent.text for ent in doc.ents if ent.label_ == "DATE"]
     return {
@@ -34,11 +28,10 @@ def extract_task_details(sentence):
         "deadlines": deadlines
     }
 
+def extract_task_details(sentence):
+    return _details_from_doc(sentence, next(iter(pipe([sentence], profile="entities"))))
+
 def extract_tasks_from_transcript(transcript):
     action_items = extract_action_items(transcript)
-    tasks_extracted = []
-    for a in action_items:
-        details = extract_task_details(a)
-        if details:
-            tasks_extracted.append(details)
-    return tasks_extracted
+    # All action sentences go through the NER-only pipeline in one batched pass
+    return [_details_from_doc(a, doc) for a, doc in zip(action_items, pipe(action_items, profile="entities"))]
@@ -1,6 +1,6 @@
 
 import streamlit as st
-from mcp.ui.meeting_summarizer import summarize_meeting
+from mcp.ui.meeting_summarizer import summarize_meeting, stream_meeting_summary, STREAMING_MODES
 from mcp.agents.llm_task_manager_agent import LLMTaskManagerAgent
 from mcp.tools.nlp_task_extraction import extract_tasks_nlp
 from mcp.tools.llm_task_extraction import extract_tasks_jira_format
@@ -138,7 +138,14 @@ if user_input:
         ai_message(f"Summarizing with mode '{st.session_state.summarization_mode}'. Please wait...")
         try:
             print("[DEBUG] Calling summarize_meeting with transcript:", st.session_state.transcript)
-            result = summarize_meeting(st.session_state.transcript, st.session_state.meeting_id, mode=st.session_state.summarization_mode)
+            if st.session_state.summarization_mode in STREAMING_MODES:
+                # Render tokens as they are generated instead of waiting for the whole summary
+                holder = {}
+                with st.chat_message("ai"):
+                    st.write_stream(stream_meeting_summary(st.session_state.transcript, st.session_state.meeting_id, st.session_state.summarization_mode, holder))
+                result = holder.get("result", {})
+            else:
+                result = summarize_meeting(st.session_state.transcript, st.session_state.meeting_id, mode=st.session_state.summarization_mode)
             print("[DEBUG] summarize_meeting result:", result)
             st.session_state.summary = result.get("summary_text", "")
             # Display only summary and action items in chat
@@ -190,7 +197,8 @@ if user_input:
         ai_message(f"Extracting tasks using '{st.session_state.task_extraction_method}'. Please wait...")
         try:
             if st.session_state.task_extraction_method == "LLM (Jira format)":
-                tasks = extract_tasks_jira_format(st.session_state.transcript)
+                # Reuses the cached joint summary pass (streamed or not) when the meeting was summarized with Mistral
+                tasks = extract_tasks_jira_format(st.session_state.transcript, meeting_id=st.session_state.meeting_id)
             else:
                 tasks = extract_tasks_nlp(st.session_state.transcript)
             st.session_state.tasks = tasks
@@ -0,0 +1,341 @@
+"""
+End-to-end summarization benchmark: speed against quality, per mode and transcript size.
+Drives SummarizationAgent over transcript / gold-summary pairs (mcp/data/transcripts and
+mcp/data/summaries as written by extract_and_clean_transcripts.py, or --pair transcript:summary.json)
+and records for every transcript: wall time, tokens/sec, peak RSS, ROUGE-1/2/L against the gold
+summary and action-item precision/recall. Runs are aggregated per (mode, size bucket).
+
+- Each mode runs in its own process, so peak RSS belongs to that mode alone
+- The summary cache and saved summaries go to scratch directories, so every run is cold
+  and the gold summaries are left untouched
+- 'llm' runs against a local OpenAI-compatible stand-in unless --llm-base-url is given
+- Output is JSON; --baseline compares against a previous output and exits non-zero on regressions
+
+Usage: PYTHONPATH=. python scripts/benchmark_summarization.py --modes bart fallback --output bench.json
+"""
+import argparse
+import asyncio
+import glob
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from mcp.core.chunking import count_tokens
+from mcp.core.context_handler import DATA_DIR
+from mcp.core.json_stream import IncrementalJSONScanner
+from mcp.core.metrics import item_precision_recall, rouge_scores
+
+MODES = ("bart", "mistral", "llm", "fallback")
+DEFAULT_BUCKETS = (1000, 2000, 4000)
+# Lower is better for these aggregate fields; higher is better for the rest that are compared
+COMPARED = {'wall_seconds_p50': 'lower', 'peak_rss_mb': 'lower', 'rougeL': 'higher', 'action_recall': 'higher'}
+
+
+# -- data -------------------------------------------------------------------------------------
+
+def find_pairs(transcripts_dir, summaries_dir):
+    """[(transcript_path, gold_summary_path)] using the naming of extract_and_clean_transcripts.py."""
+    pairs = []
+    for path in sorted(glob.glob(os.path.join(transcripts_dir, '*.txt'))):
+        name = os.path.basename(path)
+        if "_transcript_" in name:
+            summary_name = name.replace("_transcript_", "_summary_").replace(".txt", ".json")
+        else:
+            summary_name = os.path.splitext(name)[0] + ".json"
+        summary_path = os.path.join(summaries_dir, summary_name)
+        if os.path.exists(summary_path):
+            pairs.append((path, summary_path))
+    return pairs
+
+
+def bucket_label(tokens, edges):
+    low = 0
+    for edge in edges:
+        if tokens <= edge:
+            return f"{low + 1}-{edge}" if low else f"<={edge}"
+        low = edge
+    return f">{low}"
+
+
+def _item_text(item):
+    if isinstance(item, dict):
+        return item.get('task') or item.get('summary') or item.get('description') or ''
+    return str(item)
+
+
+def gold_parts(gold):
+    summary = gold.get('summary', '')
+    if isinstance(summary, list):
+        summary = "\n".join(str(s) for s in summary)
+    return summary, [_item_text(a) for a in gold.get('action_items', [])]
+
+
+def predicted_parts(summary_obj):
+    """(summary text, action item texts) from any backend's summary object."""
+    summary = summary_obj.get('summary_text', '')
+    actions = summary_obj.get('action_items', [])
+    if isinstance(summary, str) and '{' in summary:
+        # 'llm' returns the model's JSON as text
+        scanner = IncrementalJSONScanner()
+        scanner.feed(summary)
+        parsed = scanner.parsed()
+        if isinstance(parsed, dict):
+            summary, actions = parsed.get('summary', summary), parsed.get('action_items', actions)
+    if isinstance(summary, list):
+        summary = "\n".join(str(s) for s in summary)
+    return str(summary), [_item_text(a) for a in actions or []]
+
+
+# -- measurement ------------------------------------------------------------------------------
+
+def peak_rss_mb():
+    """Process high-water RSS (ru_maxrss is KiB on Linux, bytes on macOS)."""
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class _StandInLLM(BaseHTTPRequestHandler):
+    """OpenAI-compatible /chat/completions answering with an extractive JSON summary."""
+    delay = 0.2
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        prompt = body.get('messages', [{}])[-1].get('content', '')
+        sentences = [s.strip() for s in re.split(r"(?<=[.!?])\s+", prompt.split("TRANSCRIPT", 1)[-1].lstrip(": \n")) if len(s.split()) > 3]
+        actions = [s for s in sentences if re.search(r"\b(will|need to|should|assign|by (monday|friday|tomorrow))\b", s, re.I)]
+        content = json.dumps({'summary': sentences[:5], 'action_items': [{'task': a} for a in actions[:10]]})
+        time.sleep(self.delay)
+        payload = json.dumps({
+            'id': 'standin', 'object': 'chat.completion', 'created': int(time.time()), 'model': body.get('model', ''),
+            'choices': [{'index': 0, 'finish_reason': 'stop', 'message': {'role': 'assistant', 'content': content}}],
+            'usage': {'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0}
+        }).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stand_in_llm(delay):
+    _StandInLLM.delay = delay
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _StandInLLM)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+def run_mode(mode, pairs, edges, warmup, match_threshold):
+    """Runs in the worker process: one record per transcript for this mode."""
+    from mcp.core.summary_cache import summary_cache
+    # Cold runs only: never read (or pollute) the shared on-disk cache
+    summary_cache.cache_dir = tempfile.mkdtemp(prefix="bench_cache_")
+    from mcp.agents.summarization_agent import SummarizationAgent
+    if mode == "llm":
+        # Set before the agent exists: credentials.json only fills variables that are unset
+        os.environ['OPENAI_API_KEY'] = os.environ.get('BENCH_LLM_API_KEY', 'stand-in')
+    agent = SummarizationAgent(mode=mode)
+    # Keep benchmark outputs out of mcp/data/summaries, where the gold summaries live
+    agent.context.summaries_dir = tempfile.mkdtemp(prefix="bench_summaries_")
+    if warmup and pairs:
+        with open(pairs[0][0], 'r', encoding='utf-8') as f:
+            asyncio.run(agent.summarize("bench-warmup", f.read()))
+        summary_cache.clear()  # scratch directory only
+    records = []
+    for transcript_path, gold_path in pairs:
+        with open(transcript_path, 'r', encoding='utf-8') as f:
+            transcript = f.read()
+        with open(gold_path, 'r', encoding='utf-8') as f:
+            gold = json.load(f)
+        input_tokens = count_tokens(None, transcript)
+        record = {
+            'mode': mode,
+            'transcript': os.path.basename(transcript_path),
+            'bucket': bucket_label(input_tokens, edges),
+            'input_tokens': input_tokens
+        }
+        start = time.perf_counter()
+        try:
+            summary_obj = asyncio.run(agent.summarize(f"bench-{os.path.basename(transcript_path)}", transcript))
+        except Exception as e:
+            record.update({'error': f"{type(e).__name__}: {e}", 'wall_seconds': time.perf_counter() - start, 'peak_rss_mb': peak_rss_mb()})
+            records.append(record)
+            continue
+        wall = time.perf_counter() - start
+        gold_summary, gold_actions = gold_parts(gold)
+        summary, actions = predicted_parts(summary_obj)
+        output_tokens = count_tokens(None, summary) + sum(count_tokens(None, a) for a in actions)
+        action_pr = item_precision_recall(gold_actions, actions, match_threshold)
+        record.update({
+            'wall_seconds': wall,
+            'output_tokens': output_tokens,
+            'input_tokens_per_sec': input_tokens / wall if wall else 0.0,
+            'output_tokens_per_sec': output_tokens / wall if wall else 0.0,
+            'peak_rss_mb': peak_rss_mb(),
+            **rouge_scores(gold_summary, summary),
+            'action_precision': action_pr['precision'],
+            'action_recall': action_pr['recall']
+        })
+        records.append(record)
+        print(f"[Benchmark] {mode} {record['transcript']}: {wall:.2f}s rougeL={record['rougeL']:.3f}", file=sys.stderr)
+    return records
+
+
+# -- aggregation / comparison -----------------------------------------------------------------
+
+def _percentile(values, q):
+    values = sorted(values)
+    if not values:
+        return None
+    index = min(len(values) - 1, max(0, int(round(q * (len(values) - 1)))))
+    return values[index]
+
+
+def _mean(values):
+    return sum(values) / len(values) if values else None
+
+
+def aggregate(records):
+    groups = {}
+    for r in records:
+        groups.setdefault((r['mode'], r['bucket']), []).append(r)
+        groups.setdefault((r['mode'], 'all'), []).append(r)
+    out = []
+    for (mode, bucket), group in sorted(groups.items()):
+        ok = [r for r in group if 'error' not in r]
+        walls = [r['wall_seconds'] for r in ok]
+        row = {
+            'mode': mode,
+            'bucket': bucket,
+            'runs': len(group),
+            'errors': len(group) - len(ok),
+            'wall_seconds_mean': _mean(walls),
+            'wall_seconds_p50': _percentile(walls, 0.5),
+            'wall_seconds_p95': _percentile(walls, 0.95),
+            'input_tokens_per_sec': _mean([r['input_tokens_per_sec'] for r in ok]),
+            'output_tokens_per_sec': _mean([r['output_tokens_per_sec'] for r in ok]),
+            'peak_rss_mb': max((r['peak_rss_mb'] for r in group), default=None)
+        }
+        for field in ('rouge1', 'rouge2', 'rougeL', 'action_precision', 'action_recall'):
+            row[field] = _mean([r[field] for r in ok])
+        out.append(row)
+    return out
+
+
+def compare(aggregates, baseline, max_regression):
+    """Relative regressions of COMPARED fields beyond max_regression, per (mode, bucket)."""
+    previous = {(a['mode'], a['bucket']): a for a in baseline.get('aggregates', [])}
+    regressions = []
+    for row in aggregates:
+        old = previous.get((row['mode'], row['bucket']))
+        if not old:
+            continue
+        for field, better in COMPARED.items():
+            new_value, old_value = row.get(field), old.get(field)
+            if new_value is None or not old_value:
+                continue
+            change = (new_value - old_value) / old_value
+            if (change if better == 'lower' else -change) > max_regression:
+                regressions.append({
+                    'mode': row['mode'], 'bucket': row['bucket'], 'field': field,
+                    'baseline': old_value, 'current': new_value, 'change': change
+                })
+    return regressions
+
+
+# -- entry points -----------------------------------------------------------------------------
+
+def worker_main(args):
+    with open(args.worker_input, 'r', encoding='utf-8') as f:
+        job = json.load(f)
+    records = run_mode(job['mode'], job['pairs'], job['edges'], job['warmup'], job['match_threshold'])
+    with open(args.worker_output, 'w', encoding='utf-8') as f:
+        json.dump(records, f)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--transcripts-dir", default=os.path.join(DATA_DIR, 'transcripts'))
+    parser.add_argument("--summaries-dir", default=os.path.join(DATA_DIR, 'summaries'))
+    parser.add_argument("--pair", action="append", default=[], metavar="TRANSCRIPT:SUMMARY_JSON",
+                        help="explicit transcript / gold summary pair (repeatable), e.g. t.txt:Meeting_05_summary.json")
+    parser.add_argument("--limit", type=int, default=0, help="use at most this many pairs (0: all)")
+    parser.add_argument("--buckets", default=",".join(str(b) for b in DEFAULT_BUCKETS),
+                        help="input-token bucket edges (approximate tokens, same for every mode)")
+    parser.add_argument("--no-warmup", action="store_true", help="include model loading in the first run")
+    parser.add_argument("--match-threshold", type=float, default=0.5, help="ROUGE-L for an action item to match gold")
+    parser.add_argument("--llm-base-url", help="OpenAI-compatible endpoint for 'llm' (default: local stand-in)")
+    parser.add_argument("--llm-delay", type=float, default=0.2, help="stand-in response latency in seconds")
+    parser.add_argument("--output", help="write the JSON report here (default: stdout)")
+    parser.add_argument("--baseline", help="previous JSON report to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.1, help="allowed relative regression per field")
+    parser.add_argument("--worker-input", help=argparse.SUPPRESS)
+    parser.add_argument("--worker-output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker_input:
+        return worker_main(args)
+
+    pairs = [tuple(p.rsplit(":", 1)) for p in args.pair] or find_pairs(args.transcripts_dir, args.summaries_dir)
+    if args.limit:
+        pairs = pairs[:args.limit]
+    if not pairs:
+        print("No transcript / gold summary pairs found.")
+        return 2
+    edges = sorted(int(b) for b in args.buckets.split(",") if b.strip())
+
+    records = []
+    for mode in args.modes:
+        env = dict(os.environ)
+        if mode == "llm":
+            env['LLM_BASE_URL'] = args.llm_base_url or start_stand_in_llm(args.llm_delay)
+        with tempfile.TemporaryDirectory(prefix="bench_") as tmp:
+            job_path, out_path = os.path.join(tmp, 'job.json'), os.path.join(tmp, 'records.json')
+            with open(job_path, 'w', encoding='utf-8') as f:
+                json.dump({'mode': mode, 'pairs': pairs, 'edges': edges, 'warmup': not args.no_warmup,
+                           'match_threshold': args.match_threshold}, f)
+            print(f"[Benchmark] Running mode '{mode}' on {len(pairs)} transcript(s)", file=sys.stderr)
+            # Agent debug output goes to stderr so stdout stays machine-readable
+            proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--worker-input", job_path, "--worker-output", out_path],
+                                  env=env, stdout=sys.stderr)
+            if proc.returncode != 0 or not os.path.exists(out_path):
+                records.append({'mode': mode, 'transcript': None, 'bucket': 'all', 'error': f"worker exited with {proc.returncode}"})
+                continue
+            with open(out_path, 'r', encoding='utf-8') as f:
+                records.extend(json.load(f))
+
+    report = {
+        'created_at': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'python': sys.version.split()[0],
+        'modes': args.modes,
+        'bucket_edges': edges,
+        'records': records,
+        'aggregates': aggregate([r for r in records if r.get('transcript')])
+    }
+    status = 0
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            report['regressions'] = compare(report['aggregates'], json.load(f), args.max_regression)
+        status = 1 if report['regressions'] else 0
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+        print(f"[Benchmark] Report written to {args.output}", file=sys.stderr)
+    else:
+        print(text)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""
+Parity check for the alternate BART backends.
+Summarizes sample transcripts with the PyTorch model and with BART_BACKEND-style 'int8' or 'onnx',
+then reports ROUGE-L agreement and latency. Exits non-zero if agreement is below --min-rouge-l.
+
+Usage: PYTHONPATH=. python scripts/check_bart_parity.py --backend int8 [transcript.txt ...]
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+
+from mcp.core.context_handler import DATA_DIR
+from mcp.core.model_registry import load_seq2seq, seq2seq_backend
+from mcp.agents.bart_summarizer import parity_check
+from mcp.agents.summarization_agent import resolve_bart_model_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("transcripts", nargs="*", help="transcript .txt files (default: mcp/data/transcripts/*.txt)")
+    parser.add_argument("--backend", choices=("int8", "onnx"), default="int8")
+    parser.add_argument("--min-rouge-l", type=float, default=0.9)
+    parser.add_argument("--limit", type=int, default=5)
+    args = parser.parse_args()
+
+    paths = args.transcripts or sorted(glob.glob(os.path.join(DATA_DIR, 'transcripts', '*.txt')))[:args.limit]
+    transcripts = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            transcripts.append(f.read())
+    if not transcripts:
+        print("No transcripts found.")
+        return 2
+
+    backend = seq2seq_backend(args.backend)
+    if backend != args.backend:
+        # Comparing the fallback would report its numbers under the requested backend's name
+        print(f"Backend '{args.backend}' is not available here (it would load as '{backend}').")
+        return 2
+    model_path = resolve_bart_model_path()
+    tokenizer, reference = load_seq2seq(model_path, "torch")
+    _, candidate = load_seq2seq(model_path, backend)
+    report = parity_check(tokenizer, reference, candidate, transcripts, args.min_rouge_l)
+    report['backend'] = backend
+    print(json.dumps(report, indent=2))
+    return 0 if report['passed'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,189 @@
+"""
+Local fake Jira for exercising the Jira paths without a real server.
+Serves the REST endpoints the agents use (serverInfo, myself, issue, issue/bulk, search) from memory
+and counts every request, so round-trips per meeting can be checked.
+
+- Items with an empty summary or an assignee listed in --unknown-user are rejected per item, the way
+  Jira reports bulk errors (failedElementNumber + elementErrors)
+- issue/bulk requests above --max-bulk issues are refused with 400, like Jira's server-side limit
+
+Usage:
+  PYTHONPATH=. python scripts/fake_jira.py serve --port 8089       # then JIRA_URL=http://127.0.0.1:8089
+  PYTHONPATH=. python scripts/fake_jira.py check --tasks 120       # bulk-create against it and verify
+"""
+import argparse
+import json
+import math
+import re
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeJira:
+    def __init__(self, max_bulk=50, unknown_users=(), project="PROJ"):
+        self.max_bulk = max_bulk
+        self.unknown_users = set(unknown_users)
+        self.project = project
+        self.issues = {}
+        self.requests = {}
+        self._next = 1
+        self._lock = threading.Lock()
+
+    def count(self, method, path):
+        # Collapse issue keys so per-issue GETs are counted together
+        route = f"{method} {re.sub(r'/issue/[A-Z]+-[0-9]+', '/issue/{key}', path.split('?')[0])}"
+        with self._lock:
+            self.requests[route] = self.requests.get(route, 0) + 1
+
+    def validate(self, fields):
+        errors = {}
+        if not str(fields.get('summary') or '').strip():
+            errors['summary'] = "You must specify a summary of the issue."
+        assignee = (fields.get('assignee') or {}).get('name')
+        if assignee in self.unknown_users:
+            errors['assignee'] = f"User '{assignee}' does not exist."
+        return errors
+
+    def create(self, fields, base_url):
+        with self._lock:
+            key = f"{self.project}-{self._next}"
+            issue_id = str(10000 + self._next)
+            self._next += 1
+            self.issues[key] = {'id': issue_id, 'key': key, 'fields': dict(fields)}
+        return {'id': issue_id, 'key': key, 'self': f"{base_url}/rest/api/2/issue/{issue_id}"}
+
+    def create_bulk(self, updates, base_url):
+        """(status, body) for POST issue/bulk."""
+        if len(updates) > self.max_bulk:
+            return 400, {'errorMessages': [f"Bulk create is limited to {self.max_bulk} issues"], 'errors': {}}
+        issues, errors = [], []
+        for index, update in enumerate(updates):
+            fields = update.get('fields', {})
+            element_errors = self.validate(fields)
+            if element_errors:
+                errors.append({'status': 400, 'failedElementNumber': index,
+                               'elementErrors': {'errorMessages': [], 'errors': element_errors}})
+            else:
+                issues.append(self.create(fields, base_url))
+        return (201 if issues else 400), {'issues': issues, 'errors': errors}
+
+    def stats(self):
+        with self._lock:
+            return {'issues': len(self.issues), 'requests': dict(self.requests)}
+
+
+def _handler(fake):
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self, status, body):
+            payload = json.dumps(body).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _base_url(self):
+            return f"http://{self.headers.get('Host', '127.0.0.1')}"
+
+        def do_GET(self):
+            fake.count("GET", self.path)
+            path = self.path.split('?')[0]
+            if path.endswith('/serverInfo'):
+                return self._reply(200, {'baseUrl': self._base_url(), 'version': '9.4.0', 'versionNumbers': [9, 4, 0],
+                                         'deploymentType': 'Server', 'serverTitle': 'Fake Jira'})
+            if path.endswith('/myself'):
+                return self._reply(200, {'name': 'fake', 'displayName': 'Fake User', 'active': True})
+            if '/search' in path:
+                return self._reply(200, {'startAt': 0, 'maxResults': 50, 'total': 0, 'issues': []})
+            m = re.search(r'/issue/([A-Z]+-[0-9]+)$', path)
+            if m and m.group(1) in fake.issues:
+                issue = fake.issues[m.group(1)]
+                return self._reply(200, dict(issue, self=f"{self._base_url()}/rest/api/2/issue/{issue['id']}"))
+            return self._reply(404, {'errorMessages': [f"Not found: {path}"], 'errors': {}})
+
+        def do_POST(self):
+            fake.count("POST", self.path)
+            body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            path = self.path.split('?')[0]
+            if path.endswith('/issue/bulk'):
+                return self._reply(*fake.create_bulk(body.get('issueUpdates', []), self._base_url()))
+            if path.endswith('/issue'):
+                errors = fake.validate(body.get('fields', {}))
+                if errors:
+                    return self._reply(400, {'errorMessages': [], 'errors': errors})
+                return self._reply(201, fake.create(body.get('fields', {}), self._base_url()))
+            if '/search' in path:
+                return self._reply(200, {'startAt': 0, 'maxResults': 50, 'total': 0, 'issues': []})
+            return self._reply(404, {'errorMessages': [f"Not found: {path}"], 'errors': {}})
+
+        def log_message(self, *args):
+            pass
+    return Handler
+
+
+def start_fake_jira(fake, port=0):
+    """Serve fake in a daemon thread; returns (server, base_url)."""
+    server = ThreadingHTTPServer(('127.0.0.1', port), _handler(fake))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def check(tasks, max_bulk, chunk_size):
+    """Bulk-create tasks against a fresh fake; verifies round-trips and per-item error mapping."""
+    from jira import JIRA
+    from mcp.core.jira_bulk import create_issues_bulk
+    fake = FakeJira(max_bulk=max_bulk, unknown_users={"ghost"})
+    server, url = start_fake_jira(fake)
+    client = JIRA(server=url, basic_auth=("fake", "token"))
+    fields = []
+    for i in range(tasks):
+        item = {'project': {'key': fake.project}, 'summary': f"Task {i}", 'issuetype': {'name': 'Task'}}
+        if i % 7 == 3:
+            item['assignee'] = {'name': 'ghost'}  # rejected per item
+        fields.append(item)
+    before = sum(n for route, n in fake.stats()['requests'].items() if '/issue' in route)
+    results = create_issues_bulk(client, fields, chunk_size=chunk_size)
+    server.shutdown()
+    stats = fake.stats()
+    issue_requests = sum(n for route, n in stats['requests'].items() if '/issue' in route) - before
+    expected_requests = math.ceil(tasks / min(max_bulk, chunk_size or max_bulk)) if tasks else 0
+    mismatched = [i for i, r in enumerate(results) if bool(r['error']) != (i % 7 == 3)]
+    report = {
+        'tasks': tasks,
+        'created': sum(1 for r in results if r['key']),
+        'rejected': sum(1 for r in results if r['error']),
+        'issue_requests': issue_requests,
+        'expected_requests': expected_requests,
+        'mismatched_items': mismatched,
+        'requests': stats['requests']
+    }
+    print(json.dumps(report, indent=2))
+    return 0 if len(results) == tasks and not mismatched and issue_requests == expected_requests else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=("serve", "check"))
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--max-bulk", type=int, default=50, help="issues accepted per issue/bulk request")
+    parser.add_argument("--unknown-user", action="append", default=[], help="assignee to reject (repeatable)")
+    parser.add_argument("--tasks", type=int, default=10, help="check: issues to create")
+    parser.add_argument("--chunk-size", type=int, default=None, help="check: client chunk size (default JIRA_BULK_MAX_ISSUES)")
+    args = parser.parse_args()
+
+    if args.command == "check":
+        return check(args.tasks, args.max_bulk, args.chunk_size)
+    fake = FakeJira(max_bulk=args.max_bulk, unknown_users=args.unknown_user)
+    server, url = start_fake_jira(fake, args.port)
+    print(f"[FakeJira] Serving on {url} (JIRA_URL={url}); Ctrl+C prints request counts")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(json.dumps(fake.stats(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
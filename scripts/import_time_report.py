@@ -0,0 +1,94 @@
+"""
+Import-time report for the service entry points.
+Imports each module in a fresh interpreter with `python -X importtime`, then reports its total
+import time, the top-level packages that spent it (self time), and which heavy packages (torch,
+transformers, spaCy, ...) were loaded. Exits non-zero if a module loads a package it must not,
+e.g. a Jira-only worker pulling in torch.
+
+Usage: PYTHONPATH=. python scripts/import_time_report.py [module ...] [--forbid mcp.agents.task_manager_agent=torch,spacy]
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+DEFAULT_MODULES = (
+    "mcp.server.mcp_api",
+    "mcp.agents.orchestrator_agent",
+    "mcp.agents.summarization_agent",
+    "mcp.agents.task_manager_agent",
+    "mcp.agents.llm_task_manager_agent",
+    "mcp.tools.nlp_task_extraction",
+    "mcp.ui.meeting_summarizer"
+)
+HEAVY_PACKAGES = ("torch", "transformers", "optimum", "onnxruntime", "spacy", "numpy", "openai", "jira",
+                  "googleapiclient", "google.oauth2", "streamlit", "pandas")
+
+
+def measure(module, forbidden=()):
+    """{'module', 'ok', 'total_ms', 'packages': {top-level: self ms}, 'heavy': [...], 'forbidden': [...]}."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          capture_output=True, text=True)
+    packages = {}
+    loaded = set()
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative, name = line[len("import time:"):].split("|", 2)
+        name = name.strip()
+        loaded.add(name)
+        # Self time summed per top-level package attributes time to the package that spent it
+        top = name.split(".")[0]
+        packages[top] = packages.get(top, 0) + int(self_us)
+        if name == module:
+            total_us = int(cumulative)
+    heavy = sorted(p for p in HEAVY_PACKAGES if p in loaded)
+    forbidden_loaded = sorted(p for p in forbidden if p in loaded)
+    return {
+        'module': module,
+        'ok': proc.returncode == 0,
+        'error': proc.stderr.strip().splitlines()[-1] if proc.returncode else None,
+        'total_ms': round(total_us / 1000, 1),
+        'packages': {k: round(v / 1000, 1) for k, v in sorted(packages.items(), key=lambda kv: -kv[1])},
+        'heavy': heavy,
+        'forbidden': forbidden_loaded
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", default=list(DEFAULT_MODULES))
+    parser.add_argument("--top", type=int, default=10, help="slowest top-level packages to show per module")
+    parser.add_argument("--forbid", action="append", default=[], metavar="MODULE=PKG[,PKG]",
+                        help="fail if MODULE imports any of the given packages (repeatable)")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    forbidden = {}
+    for rule in args.forbid:
+        module, _, pkgs = rule.partition("=")
+        forbidden[module] = {p.strip() for p in pkgs.split(",") if p.strip()}
+    reports = [measure(m, forbidden.get(m, ())) for m in dict.fromkeys(list(args.modules) + list(forbidden))]
+    violations = [{'module': r['module'], 'imports': r['forbidden']} for r in reports if r['forbidden']]
+    for report in reports:
+        report['packages'] = dict(list(report['packages'].items())[:args.top])
+
+    if args.json:
+        print(json.dumps({'modules': reports, 'violations': violations}, indent=2))
+    else:
+        for report in reports:
+            status = f"{report['total_ms']:>9.1f} ms" if report['ok'] else "   FAILED  "
+            print(f"{status}  {report['module']}  heavy: {', '.join(report['heavy']) or '-'}")
+            if not report['ok']:
+                print(f"             {report['error']}")
+            for name, ms in report['packages'].items():
+                print(f"             {ms:>9.1f} ms  {name}")
+        for v in violations:
+            print(f"[ImportTime] {v['module']} imports forbidden package(s): {', '.join(v['imports'])}")
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())